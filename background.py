@@ -0,0 +1,697 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from PyQt5 import sip
+from PyQt5.QtCore import Qt, QSize, QRect, QPoint, QThread, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage, QColor, QPainter, QGuiApplication
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Default memory cap for scaled background variants (bytes)
+DEFAULT_CACHE_LIMIT = 256 * 1024 * 1024
+
+# Memory cap for precomposed lock window frames (bytes)
+DEFAULT_FRAME_CACHE_LIMIT = 128 * 1024 * 1024
+
+# Blurred desktop: seconds a screen snapshot is reused across locks, and the
+# per-monitor time allowed for downscaling and blurring it
+DESKTOP_CACHE_TTL = 30.0
+DESKTOP_BLUR_BUDGET = 0.15
+BLUR_PASSES = 3  # Three box blurs approximate a Gaussian
+WORK_WIDTH = 480  # Width the desktop is blurred at
+SCANLINE_WORK_WIDTH = 192  # Pure Python is much slower, so use fewer pixels
+
+
+def pixmap_bytes(pixmap):
+    """Estimate the memory held by a pixmap in bytes."""
+    if pixmap is None or pixmap.isNull():
+        return 0
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+def physical_size(size, dpr=1.0):
+    """Return the size in device pixels of a logical size on a screen with ratio dpr."""
+    if not isinstance(size, QSize):
+        size = QSize(*size)
+    return QSize(round(size.width() * dpr), round(size.height() * dpr))
+
+
+def scale_image(image, size, fit=False):
+    """Scale image to fill size (cropping nothing, overflowing one side), or to fit inside it."""
+    mode = Qt.KeepAspectRatio if fit else Qt.KeepAspectRatioByExpanding
+    return image.scaled(size, mode, Qt.SmoothTransformation)
+
+
+class BackgroundCache:
+    """Process-wide cache of decoded images and their scaled variants.
+
+    Used for backgrounds and avatars. The decoded source image is keyed by
+    (path, mtime) so an edited file is picked up again, and scaled variants
+    are kept per (size, device pixel ratio). Sources and variants share the
+    memory cap and are evicted in LRU order. Variants are scaled to the
+    screen's physical pixels, so they are sharp at 200% and no larger than
+    needed at 100%. A file that can't be decoded is not tried again until
+    its mtime changes.
+
+    prepare() may be called from a worker thread to scale a variant ahead
+    of time; get_scaled() must be called on the GUI thread, as it makes the
+    QPixmap.
+    """
+    def __init__(self, max_bytes=DEFAULT_CACHE_LIMIT):
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._sources = OrderedDict()  # path -> (mtime, QImage)
+        self._scaled = OrderedDict()  # (path, mtime, width, height, dpr, fit) -> QPixmap
+        self._prepared = OrderedDict()  # Same keys -> QImage scaled off the GUI thread
+        self._decoding = {}  # path -> Lock, so parallel jobs decode each file once
+        self._failed = {}  # path -> mtime of a version that couldn't be decoded
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prepared_hits = 0
+
+    def _source_key(self, path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    def get_source(self, path):
+        """Return the decoded image for path, decoding it only when it changed."""
+        mtime = self._source_key(path)
+        if mtime is None:
+            return None, None
+
+        with self._lock:
+            cached = self._sources.get(path)
+            if cached and cached[0] == mtime:
+                self._sources.move_to_end(path)
+                return mtime, cached[1]
+            if self._failed.get(path) == mtime:
+                return mtime, None
+            decoding = self._decoding.setdefault(path, threading.Lock())
+
+        # Decode without holding the cache lock, so a slow file doesn't stall
+        # other lookups; a second thread wanting the same file waits for it
+        with decoding:
+            with self._lock:
+                cached = self._sources.get(path)
+                if cached and cached[0] == mtime:
+                    return mtime, cached[1]
+                if self._failed.get(path) == mtime:
+                    return mtime, None
+
+            image = QImage(path)
+            with self._lock:
+                if self._decoding.get(path) is decoding:
+                    del self._decoding[path]
+                if image.isNull():
+                    self._failed[path] = mtime
+                    return mtime, None
+                self._failed.pop(path, None)
+                # Drop the older version of the file and variants scaled from it
+                self._evict_path(path, keep=mtime)
+                self._sources[path] = (mtime, image)
+                self._bytes += image.sizeInBytes()
+                self._trim()
+                return mtime, image
+
+    def _variant_key(self, path, size, dpr, fit):
+        # Keyed on the file's mtime, so a cached variant is found without decoding
+        if not path:
+            return None
+        if not isinstance(size, QSize):
+            size = QSize(*size)
+        if size.isEmpty():
+            return None
+        mtime = self._source_key(path)
+        if mtime is None:
+            return None
+        target = physical_size(size, dpr)
+        return (path, mtime, target.width(), target.height(), dpr, fit)
+
+    def _scale(self, key):
+        mtime, source = self.get_source(key[0])
+        if source is None or mtime != key[1]:
+            return None
+        return scale_image(source, QSize(key[2], key[3]), key[5])
+
+    def prepare(self, path, size, dpr=1.0, fit=False):
+        """Scale a variant ahead of time. Safe to call off the GUI thread.
+
+        Returns True if the variant is ready (now or already), False if the
+        file can't be used.
+        """
+        key = self._variant_key(path, size, dpr, fit)
+        if key is None:
+            return False
+        with self._lock:
+            if key in self._scaled or key in self._prepared:
+                return True
+
+        image = self._scale(key)
+        if image is None:
+            return False
+        with self._lock:
+            if key not in self._scaled and key not in self._prepared:
+                self._prepared[key] = image
+                self._bytes += image.sizeInBytes()
+                self._trim()
+        return True
+
+    def has_variant(self, path, size, dpr=1.0, fit=False):
+        """Return True if the variant is already scaled, without decoding anything."""
+        key = self._variant_key(path, size, dpr, fit)
+        if key is None:
+            return False
+        with self._lock:
+            return key in self._scaled or key in self._prepared
+
+    def get_scaled(self, path, size, dpr=1.0, fit=False):
+        """Return the image at path scaled to fill (or fit) size, or None if unusable.
+
+        size is in logical pixels; the pixmap has dpr physical pixels per
+        logical pixel.
+        """
+        key = self._variant_key(path, size, dpr, fit)
+        if key is None:
+            return None
+
+        with self._lock:
+            pixmap = self._scaled.get(key)
+            if pixmap is not None:
+                self._scaled.move_to_end(key)
+                self.hits += 1
+                return pixmap
+            image = self._prepared.pop(key, None)
+            if image is not None:
+                self._bytes -= image.sizeInBytes()
+                self.prepared_hits += 1
+            else:
+                self.misses += 1
+
+        if image is None:
+            image = self._scale(key)
+            if image is None:
+                return None
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+
+        with self._lock:
+            self._scaled[key] = pixmap
+            self._bytes += pixmap_bytes(pixmap)
+            self._trim()
+        return pixmap
+
+    def _trim(self):
+        # Evict prepared images that were never used first, then decoded
+        # sources, which are only needed to scale new variants, then least
+        # recently used variants, always keeping the most recent entries
+        while self._bytes > self.max_bytes and self._prepared:
+            _, image = self._prepared.popitem(last=False)
+            self._bytes -= image.sizeInBytes()
+        while self._bytes > self.max_bytes and len(self._sources) > 1:
+            _, (_, image) = self._sources.popitem(last=False)
+            self._bytes -= image.sizeInBytes()
+        while self._bytes > self.max_bytes and len(self._scaled) > 1:
+            _, pixmap = self._scaled.popitem(last=False)
+            self._bytes -= pixmap_bytes(pixmap)
+
+    def _evict_path(self, path, keep=None):
+        # Variants of the keep mtime are still current and stay
+        cached = self._sources.pop(path, None)
+        if cached:
+            self._bytes -= cached[1].sizeInBytes()
+        for key in [k for k in self._scaled if k[0] == path and k[1] != keep]:
+            self._bytes -= pixmap_bytes(self._scaled.pop(key))
+        for key in [k for k in self._prepared if k[0] == path and k[1] != keep]:
+            self._bytes -= self._prepared.pop(key).sizeInBytes()
+
+    def invalidate(self, path=None):
+        """Forget cached data for path, or everything if no path is given."""
+        with self._lock:
+            if path is None:
+                self._failed.clear()
+                self._sources.clear()
+                self._scaled.clear()
+                self._prepared.clear()
+                self._bytes = 0
+            else:
+                self._failed.pop(path, None)
+                self._evict_path(path)
+
+    def stats(self):
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "prepared_hits": self.prepared_hits,
+                "sources": len(self._sources),
+                "failed": len(self._failed),
+                "variants": len(self._scaled),
+                "prepared": len(self._prepared),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class AssetPreparer(QThread):
+    """Scales backgrounds and avatars into the cache on a worker thread.
+
+    Each job is (path, logical size, device pixel ratio, fit). Run it ahead
+    of a lock so the lock windows find their pixmaps already scaled; a
+    window that gets there first simply scales the variant itself.
+    """
+    # Threads still running, kept referenced until they finish so that an
+    # owner going away doesn't destroy a running thread
+    active = set()
+
+    def __init__(self, jobs, cache=None):
+        super().__init__()
+        self.finished.connect(self.on_finished)
+        self.jobs = list(jobs)
+        self.cache = cache
+        self.stopping = threading.Event()
+        self.prepared = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    def run(self):
+        cache = self.cache or background_cache
+        start = time.perf_counter()
+        for path, size, dpr, fit in self.jobs:
+            if self.stopping.is_set():
+                break
+            try:
+                ok = cache.prepare(path, size, dpr, fit)
+            except Exception as e:
+                print(f"Error preparing {path}: {e}")
+                ok = False
+            if ok:
+                self.prepared += 1
+            else:
+                self.failed += 1
+        self.seconds = time.perf_counter() - start
+
+    def start(self, priority=QThread.InheritPriority):
+        AssetPreparer.active.add(self)
+        super().start(priority)
+
+    def on_finished(self):
+        # Qt deletes the thread once it has fully exited, so dropping the
+        # Python reference can't destroy it while still running
+        sip.transferto(self, None)
+        self.deleteLater()
+        AssetPreparer.active.discard(self)
+
+    def stop(self):
+        """Skip the remaining jobs without waiting; the thread cleans itself up."""
+        self.stopping.set()
+
+
+class _PoolTask(QRunnable):
+    def __init__(self, owner, key, func, args):
+        super().__init__()
+        self.owner = owner
+        self.key = key
+        self.func = func
+        self.args = args
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            print(f"Error preparing asset {self.key}: {e}")
+            result = None
+        self.owner.done.emit(self.key, result)
+
+
+class AssetPool(QObject):
+    """Runs asset jobs in parallel on a thread pool.
+
+    Each job's result is delivered by the done signal on the thread that
+    owns the pool (the GUI thread), in the order jobs finish. Jobs must
+    only use thread-safe types such as QImage; a failed job reports None.
+    """
+    done = pyqtSignal(object, object)  # key, result
+
+    def __init__(self, max_threads=None):
+        super().__init__()
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.submitted = 0
+        self.completed = 0
+        self.done.connect(self.on_done)
+
+    def submit(self, key, func, *args):
+        self.submitted += 1
+        self.pool.start(_PoolTask(self, key, func, args))
+
+    def on_done(self, key, result):
+        self.completed += 1
+
+    def wait(self, msecs=-1):
+        """Block until every submitted job has finished."""
+        return self.pool.waitForDone(msecs)
+
+    def stats(self):
+        return {
+            "threads": self.pool.maxThreadCount(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+        }
+
+
+class FrameCache:
+    """Precomposed lock window frames, shared by windows and reused across locks.
+
+    Frames are keyed by everything that went into them (size, device pixel
+    ratio, background and static widget content), so identical monitors
+    share one pixmap and the next lock skips painting it again. Kept in LRU
+    order until the memory cap is reached.
+    """
+    def __init__(self, max_bytes=DEFAULT_FRAME_CACHE_LIMIT):
+        self.max_bytes = max_bytes
+        self._frames = OrderedDict()  # key -> QPixmap
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return the frame stored under key, or None."""
+        pixmap = self._frames.get(key)
+        if pixmap is None:
+            self.misses += 1
+            return None
+        self._frames.move_to_end(key)
+        self.hits += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        old = self._frames.pop(key, None)
+        if old is not None:
+            self._bytes -= pixmap_bytes(old)
+        self._frames[key] = pixmap
+        self._bytes += pixmap_bytes(pixmap)
+        # Evict least recently used frames, always keeping the newest
+        while self._bytes > self.max_bytes and len(self._frames) > 1:
+            _, evicted = self._frames.popitem(last=False)
+            self._bytes -= pixmap_bytes(evicted)
+
+    def clear(self):
+        self._frames.clear()
+        self._bytes = 0
+
+    def stats(self):
+        """Return cache statistics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "frames": len(self._frames),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _box_blur_line(values, radius):
+    """Box-blur one line of channel values, clamping at the edges."""
+    size = 2 * radius + 1
+    padded = [values[0]] * radius + list(values) + [values[-1]] * radius
+    total = sum(padded[:size])
+    out = bytearray(len(values))
+    last = len(padded) - size
+    for i in range(len(values)):
+        out[i] = total // size
+        if i < last:
+            total += padded[i + size] - padded[i]
+    return out
+
+
+def _box_blur_scanlines(image, radius):
+    """One horizontal and one vertical box-blur pass over a Format_RGB32 QImage."""
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    bits = image.constBits()
+    bits.setsize(stride * height)
+    data = bytearray(bits.asstring())
+
+    for y in range(height):
+        row = y * stride
+        for channel in range(3):  # Leave alpha alone
+            start = row + channel
+            end = start + width * 4
+            data[start:end:4] = _box_blur_line(data[start:end:4], radius)
+    for x in range(width):
+        for channel in range(3):
+            start = x * 4 + channel
+            end = start + height * stride
+            data[start:end:stride] = _box_blur_line(data[start:end:stride], radius)
+
+    return QImage(bytes(data), width, height, stride, QImage.Format_RGB32).copy()
+
+
+def _box_blur_axis(pixels, radius, axis):
+    size = 2 * radius + 1
+    pad = [(0, 0)] * pixels.ndim
+    pad[axis] = (radius + 1, radius)
+    sums = np.cumsum(np.pad(pixels, pad, mode="edge"), axis=axis, dtype=np.int32)
+    count = pixels.shape[axis]
+    upper = np.take(sums, np.arange(size, size + count), axis=axis)
+    lower = np.take(sums, np.arange(count), axis=axis)
+    return (upper - lower) // size
+
+
+def _box_blur_numpy(image, radius):
+    """One horizontal and one vertical box-blur pass over a Format_RGB32 QImage."""
+    width, height, stride = image.width(), image.height(), image.bytesPerLine()
+    bits = image.constBits()
+    bits.setsize(stride * height)
+    pixels = np.frombuffer(bits, np.uint8).reshape(height, stride // 4, 4)[:, :width, :3]
+    blurred = _box_blur_axis(_box_blur_axis(pixels, radius, 1), radius, 0)
+
+    out = np.full((height, width, 4), 255, np.uint8)
+    out[:, :, :3] = blurred
+    return QImage(out.tobytes(), width, height, width * 4, QImage.Format_RGB32).copy()
+
+
+def blur_engine():
+    """Return the fastest available blur implementation name."""
+    return "numpy" if np is not None else "scanline"
+
+
+def blur_source(image, engine=None):
+    """Return image reduced to the width blur_image() works at, unblurred."""
+    # Blur at a reduced resolution; the fallback gets fewer pixels to visit
+    work_width = WORK_WIDTH if (engine or blur_engine()) == "numpy" else SCANLINE_WORK_WIDTH
+    small = image.convertToFormat(QImage.Format_RGB32)
+    if small.width() > work_width:
+        small = small.scaledToWidth(work_width, Qt.SmoothTransformation)
+    return small
+
+
+def blur_image(image, blur, budget=DESKTOP_BLUR_BUDGET, engine=None, clock=time.perf_counter):
+    """Downscale and blur image, stopping early when the time budget runs out.
+
+    Three box-blur passes approximate a Gaussian; the first always runs and
+    later passes are skipped if the budget is spent. Returns the small
+    blurred image (to be scaled up when composed) and timing details.
+    """
+    engine = engine or blur_engine()
+    start = clock()
+    deadline = start + budget
+
+    small = blur_source(image, engine)
+    radius = max(1, round(blur * small.width() / 320))
+
+    passes = 0
+    if blur > 0:
+        blur_pass = _box_blur_numpy if engine == "numpy" else _box_blur_scanlines
+        while passes < BLUR_PASSES and (passes == 0 or clock() < deadline):
+            small = blur_pass(small, radius)
+            passes += 1
+
+    elapsed = clock() - start
+    return small, {
+        "engine": engine,
+        "passes": passes,
+        "radius": radius,
+        "work_size": (small.width(), small.height()),
+        "blur_ms": elapsed * 1e3,
+        "within_budget": elapsed <= budget,
+    }
+
+
+def blur_snapshot(image, blur, budget=DESKTOP_BLUR_BUDGET):
+    """Blur a screen grab for DesktopBlur.store().
+
+    Returns (small, info, source), where source is the reduced grab before
+    blurring, kept so another blur strength doesn't need a new grab.
+    """
+    source = blur_source(image)
+    small, info = blur_image(source, blur, budget)
+    return small, info, source
+
+
+def compose_background(small, size, opacity=100, color="#000000", dpr=1.0):
+    """Scale the blurred image up to size over color at the given opacity (percent).
+
+    size is in logical pixels; the pixmap is made at dpr times that.
+    """
+    target = physical_size(size, dpr)
+    pixmap = QPixmap(target)
+    pixmap.fill(QColor(color))
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    painter.setOpacity(opacity / 100.0)
+    painter.drawImage(QRect(QPoint(0, 0), target), small)
+    painter.end()
+    pixmap.setDevicePixelRatio(dpr)
+    return pixmap
+
+
+def grab_screen(geometry):
+    """Capture the screen showing geometry as a QImage, or None if it can't be grabbed."""
+    screen = QGuiApplication.screenAt(geometry.center()) or QGuiApplication.primaryScreen()
+    if screen is None:
+        return None
+    image = screen.grabWindow(0).toImage()
+    return None if image.isNull() else image
+
+
+class DesktopBlur:
+    """Blurred snapshots of each screen for the "Blur Current Desktop" background.
+
+    Snapshots are kept per screen geometry and reused by locks within
+    ``ttl`` seconds. The small blurred image is kept alongside the composed
+    pixmaps, so a new window size or opacity only needs the cheap compose,
+    and so is the reduced grab before blurring, so a new blur strength
+    needs no new grab.
+    """
+    def __init__(self, ttl=DESKTOP_CACHE_TTL, budget=DESKTOP_BLUR_BUDGET,
+                 grab=grab_screen, clock=time.monotonic):
+        self.ttl = ttl
+        self.budget = budget
+        self.grab = grab
+        self.clock = clock
+        self._entries = {}  # (x, y, width, height) -> entry dict
+        self.grabs = 0
+        self.hits = 0
+        self.last_run = None
+
+    def _key(self, geometry):
+        return (geometry.x(), geometry.y(), geometry.width(), geometry.height())
+
+    def refresh(self, geometries, settings, force=False):
+        """Grab and blur every screen whose snapshot is missing, stale or blurred differently.
+
+        Call this before the lock windows cover the screens.
+        """
+        blur = settings.get("bg_blur", 5)
+        for geometry, image, grab_ms in self.grab_stale(geometries, settings, force):
+            small, info, source = blur_snapshot(image, blur, self.budget)
+            self.store(geometry, blur, small, info, grab_ms, source)
+
+    def grab_stale(self, geometries, settings, force=False):
+        """Grab every screen whose snapshot needs renewing, without blurring it.
+
+        Returns (geometry, image, grab_ms) for each screen grabbed, so the
+        blur can run elsewhere (e.g. on a thread pool) and be handed to
+        store(). Call this before the lock windows cover the screens.
+        """
+        blur = settings.get("bg_blur", 5)
+        grabbed = []
+        for geometry in geometries:
+            entry = self._entries.get(self._key(geometry))
+            if (force or entry is None or entry["blur"] != blur
+                    or self.clock() - entry["time"] > self.ttl):
+                start = time.perf_counter()
+                image = self.grab(geometry)
+                grab_ms = (time.perf_counter() - start) * 1e3
+                if image is None:
+                    self._entries.pop(self._key(geometry), None)
+                else:
+                    grabbed.append((geometry, image, grab_ms))
+            else:
+                self.hits += 1
+        return grabbed
+
+    def store(self, geometry, blur, small, info, grab_ms=0.0, source=None):
+        """Keep a blurred snapshot made by blur_snapshot() for the screen at geometry."""
+        info["grab_ms"] = grab_ms
+        self.grabs += 1
+        self.last_run = info
+        entry = {"time": self.clock(), "blur": blur, "small": small, "source": source,
+                 "composed": {}}
+        self._entries[self._key(geometry)] = entry
+        return entry
+
+    def has_snapshot(self, geometry, settings):
+        """Return True if get() has a snapshot blurred to the current strength."""
+        entry = self._entries.get(self._key(geometry))
+        return entry is not None and entry["blur"] == settings.get("bg_blur", 5)
+
+    def _reblur(self, geometry, entry, blur):
+        # Blur the kept source again, keeping the snapshot's age
+        small, info = blur_image(entry["source"], blur, self.budget)
+        info["grab_ms"] = 0.0
+        self.last_run = info
+        entry = dict(entry, blur=blur, small=small, composed={})
+        self._entries[self._key(geometry)] = entry
+        return entry
+
+    def get(self, geometry, size, settings, dpr=1.0):
+        """Return the blurred desktop for the screen at geometry, composed at size and dpr.
+
+        An existing snapshot is used whatever its age, and the screen is
+        never grabbed here, since by now it may be covered by a lock window;
+        call refresh() first to renew old snapshots. Returns None if there
+        is no snapshot for the screen.
+        """
+        if not isinstance(size, QSize):
+            size = QSize(*size)
+        if size.isEmpty():
+            return None
+
+        blur = settings.get("bg_blur", 5)
+        entry = self._entries.get(self._key(geometry))
+        if entry is None:
+            return None
+        if entry["blur"] != blur:
+            if entry["source"] is None:
+                return None
+            entry = self._reblur(geometry, entry, blur)
+
+        opacity = settings.get("bg_opacity", 100)
+        color = settings.get("bg_color", "#000000")
+        key = (size.width(), size.height(), dpr, opacity, color)
+        pixmap = entry["composed"].get(key)
+        if pixmap is None:
+            pixmap = compose_background(entry["small"], size, opacity, color, dpr)
+            entry["composed"][key] = pixmap
+        return pixmap
+
+    def invalidate(self):
+        """Forget every snapshot."""
+        self._entries.clear()
+
+    def stats(self):
+        """Return cache statistics and details of the last blur."""
+        composed = [pixmap for entry in self._entries.values() for pixmap in entry["composed"].values()]
+        return {
+            "screens": len(self._entries),
+            "grabs": self.grabs,
+            "hits": self.hits,
+            "bytes": sum(pixmap_bytes(pixmap) for pixmap in composed),
+            "last_run": self.last_run,
+        }
+
+
+# Shared instance used by all lock windows
+background_cache = BackgroundCache()
+desktop_blur = DesktopBlur()
+frame_cache = FrameCache()
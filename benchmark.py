@@ -0,0 +1,885 @@
+"""Micro-benchmarks for performance-sensitive code paths.
+
+Run ``python benchmark.py`` to run every benchmark, or name the ones to run.
+Results are printed as JSON.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import inspect
+import argparse
+import platform
+
+
+def _time_per_call(func, number):
+    """Return the mean seconds per call of func over number calls."""
+    timer = timeit.Timer(func)
+    # Best of three runs to reduce scheduler noise
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def _qt_app():
+    """Return the QApplication, creating one on the offscreen platform if needed."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _rss_kb():
+    """Current resident set size of this process in KiB, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _drain_events(app):
+    """Run pending events, including deferred deletes, so widget counts are settled."""
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    app.processEvents()
+
+
+def _monitor_layout(monitors, width=1920, height=1080):
+    """Geometries for a simulated row of monitors."""
+    from PyQt5.QtCore import QRect
+    return [QRect(i * width, 0, width, height) for i in range(monitors)]
+
+
+def bench_lock_cycles(cycles=200, monitors=3):
+    """Lock/unlock latency, RSS and leaked widgets across settings permutations.
+
+    Deferred deletes are run after every cycle, as the event loop would, so
+    the RSS figures show memory still held once each cycle has been cleaned up.
+    """
+    import itertools
+    import tempfile
+    app = _qt_app()
+    from PyQt5.QtGui import QImage, QColor
+    from screenlocker import ScreenLocker
+    from utils import default_settings, hash_password
+
+    geometries = _monitor_layout(monitors)
+    tmp = tempfile.TemporaryDirectory()
+    image_path = os.path.join(tmp.name, "background.png")
+    image = QImage(3840, 2160, QImage.Format_RGB32)
+    image.fill(QColor("#336699"))
+    image.save(image_path)
+    # Cheap to verify, since the hash cost isn't what is being measured
+    password = hash_password("benchmark", "pbkdf2-sha256", {"i": 1000})
+
+    results = {"cycles": cycles, "monitors": monitors, "runs": []}
+    for background, clock, locked_by_password in itertools.product(
+            ("color", "image"), (True, False), (True, False)):
+        settings = default_settings()
+        settings.update({
+            "bg_image": image_path if background == "image" else "",
+            "enable_clock": clock,
+            "enable_password": locked_by_password,
+            "password": password if locked_by_password else "",
+        })
+        locker = ScreenLocker(settings, screen_geometries=lambda: geometries)
+
+        # One warm-up cycle so one-off caches don't count as leaks
+        locker.lock_screen()
+        locker.unlock_screen()
+        _drain_events(app)
+        widgets_before = len(app.allWidgets())
+        rss_before = _rss_kb()
+
+        lock_times, unlock_times, rss = [], [], []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            locker.lock_screen()
+            app.processEvents()
+            lock_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            locker.unlock_screen()
+            app.processEvents()
+            unlock_times.append(time.perf_counter() - start)
+            _drain_events(app)
+            rss.append(_rss_kb())
+
+        results["runs"].append({
+            "background": background,
+            "clock": clock,
+            "password": locked_by_password,
+            "lock_p50_ms": _percentile(lock_times, 0.5) * 1e3,
+            "lock_p99_ms": _percentile(lock_times, 0.99) * 1e3,
+            "unlock_p50_ms": _percentile(unlock_times, 0.5) * 1e3,
+            "unlock_p99_ms": _percentile(unlock_times, 0.99) * 1e3,
+            "leaked_widgets": len(app.allWidgets()) - widgets_before,
+            "diagnostics": locker.diagnostics(),
+            "peak_rss_kb": max(rss) if rss_before is not None else None,
+            "rss_growth_kb": rss[-1] - rss_before if rss_before is not None else None,
+        })
+        locker.deleteLater()
+        _drain_events(app)
+
+    tmp.cleanup()
+    return results
+
+
+def bench_low_power(monitors=3):
+    """Wakeups avoided by low-power mode and the latency of waking it with input.
+
+    Time is simulated: the clock service and power monitor read a fake
+    monotonic clock, so ten minutes of blanked displays take no real time.
+    """
+    app = _qt_app()
+    from PyQt5.QtCore import Qt, QEvent
+    from PyQt5.QtGui import QKeyEvent
+    from screenlocker import ScreenLocker
+    from utils import default_settings, FakePowerProvider
+
+    now = [0.0]
+    fake_clock = lambda: now[0]
+    geometries = _monitor_layout(monitors)
+    provider = FakePowerProvider()
+    locker = ScreenLocker(default_settings(), screen_geometries=lambda: geometries,
+                          power_provider=provider)
+    locker.clock.clock = fake_clock
+    locker.power.clock = fake_clock
+
+    locker.lock_screen()
+    app.processEvents()
+
+    # Displays blank for ten minutes, then a key press wakes them
+    provider.set_state(blanked=True)
+    locker.power.sample()
+    now[0] += 600
+    suspended_timers = locker.diagnostics()["active_timers"]
+    start = time.perf_counter()
+    app.sendEvent(locker.lock_screens[0], QKeyEvent(QEvent.KeyPress, Qt.Key_Shift, Qt.NoModifier))
+    wake_latency = time.perf_counter() - start
+    woke = locker.clock.is_active()
+
+    # Ten minutes on battery with the displays on
+    provider.set_state(battery=True, blanked=False)
+    now[0] += locker.power.INPUT_GRACE
+    locker.power.sample()
+    now[0] += 600
+    throttled_mode = locker.power.mode
+
+    locker.unlock_screen()
+    stats = locker.power_stats()
+    locker.deleteLater()
+    _drain_events(app)
+
+    # Turning low-power mode on while locked takes effect straight away
+    settings = dict(default_settings(), low_power_mode=False)
+    locker = ScreenLocker(settings, screen_geometries=lambda: geometries,
+                          power_provider=FakePowerProvider(blanked=True))
+    locker.lock_screen()
+    app.processEvents()
+    locker.apply_settings(dict(settings, low_power_mode=True))
+    enabled_while_locked = locker.power.mode
+    locker.unlock_screen()
+    locker.deleteLater()
+    _drain_events(app)
+
+    return {
+        "monitors": monitors,
+        "active_timers_suspended": suspended_timers,
+        "woke_on_input": woke,
+        "wake_latency_ms": wake_latency * 1e3,
+        "battery_mode": throttled_mode,
+        "enabled_while_locked_mode": enabled_while_locked,
+        "power": stats,
+    }
+
+
+def bench_screen_hotplug(cycles=50, monitors=3):
+    """Monitor hotplug while locked: diff-updating windows versus a full unlock/relock."""
+    app = _qt_app()
+    from screenlocker import ScreenLocker
+    from utils import default_settings
+
+    full = _monitor_layout(monitors)
+    layouts = [full, full[:-1], _monitor_layout(monitors, 2560, 1440)]
+    current = [full]
+    locker = ScreenLocker(default_settings(), screen_geometries=lambda: current[0])
+    locker.lock_screen()
+    app.processEvents()
+
+    diff_times, relock_times, changes = [], [], []
+    for i in range(cycles):
+        current[0] = layouts[(i + 1) % len(layouts)]
+        start = time.perf_counter()
+        changes.append(locker.sync_lock_screens(current[0]))
+        app.processEvents()
+        diff_times.append(time.perf_counter() - start)
+
+    for i in range(cycles):
+        current[0] = layouts[(i + 1) % len(layouts)]
+        start = time.perf_counter()
+        locker.unlock_screen()
+        locker.lock_screen()
+        app.processEvents()
+        relock_times.append(time.perf_counter() - start)
+
+    locker.unlock_screen()
+    locker.deleteLater()
+    _drain_events(app)
+
+    return {
+        "cycles": cycles,
+        "monitors": monitors,
+        "diff_p50_ms": _percentile(diff_times, 0.5) * 1e3,
+        "diff_p99_ms": _percentile(diff_times, 0.99) * 1e3,
+        "relock_p50_ms": _percentile(relock_times, 0.5) * 1e3,
+        "relock_p99_ms": _percentile(relock_times, 0.99) * 1e3,
+        "windows_created": sum(change["created"] for change in changes),
+        "windows_moved": sum(change["moved"] for change in changes),
+        "windows_removed": sum(change["removed"] for change in changes),
+    }
+
+
+def _synthetic_desktop(width=1920, height=1080, seed=0):
+    """A busy test image: a gradient with scattered high-contrast rectangles."""
+    import random
+    from PyQt5.QtCore import QRect
+    from PyQt5.QtGui import QImage, QColor, QPainter, QLinearGradient
+
+    image = QImage(width, height, QImage.Format_RGB32)
+    painter = QPainter(image)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, QColor("#204080"))
+    gradient.setColorAt(1, QColor("#e0a030"))
+    painter.fillRect(image.rect(), gradient)
+    rng = random.Random(seed)
+    for _ in range(400):
+        painter.fillRect(QRect(rng.randrange(width), rng.randrange(height),
+                               rng.randrange(8, 200), rng.randrange(8, 120)),
+                         QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter.end()
+    return image
+
+
+def bench_desktop_blur(monitors=3, number=5):
+    """Blurred-desktop pipeline per monitor on synthetic screen grabs, per blur engine."""
+    app = _qt_app()
+    from PyQt5.QtCore import QSize
+    from background import (DesktopBlur, DESKTOP_BLUR_BUDGET, blur_image, compose_background,
+                            np)
+    from utils import default_settings
+
+    settings = default_settings()
+    settings.update({"bg_type": "Blur Current Desktop", "bg_blur": 10, "bg_opacity": 80})
+    images = [_synthetic_desktop(seed=i) for i in range(monitors)]
+    size = QSize(1920, 1080)
+
+    results = {"monitors": monitors, "budget_ms": DESKTOP_BLUR_BUDGET * 1e3, "engines": {}}
+    for engine in (["numpy"] if np is not None else []) + ["scanline"]:
+        blur_times, total_times, passes = [], [], []
+        for _ in range(number):
+            for image in images:
+                start = time.perf_counter()
+                small, info = blur_image(image, settings["bg_blur"], engine=engine)
+                blur_times.append(time.perf_counter() - start)
+                compose_background(small, size, settings["bg_opacity"], settings["bg_color"])
+                total_times.append(time.perf_counter() - start)
+                passes.append(info["passes"])
+        results["engines"][engine] = {
+            "blur_p50_ms": _percentile(blur_times, 0.5) * 1e3,
+            "blur_max_ms": max(blur_times) * 1e3,
+            "total_p50_ms": _percentile(total_times, 0.5) * 1e3,
+            "min_passes": min(passes),
+            "work_size": info["work_size"],
+        }
+
+    # A second lock within the cache window does no grabbing or blurring
+    geometries = _monitor_layout(monitors)
+    cache = DesktopBlur(grab=lambda geometry: images[geometry.x() // 1920])
+    timings = []
+    for _ in range(2):
+        start = time.perf_counter()
+        cache.refresh(geometries, settings)
+        for geometry in geometries:
+            cache.get(geometry, size, settings)
+        timings.append(time.perf_counter() - start)
+    results["first_lock_ms"] = timings[0] * 1e3
+    results["cached_lock_ms"] = timings[1] * 1e3
+
+    # A new blur strength while locked re-blurs the kept source without grabbing
+    grabs = cache.grabs
+    start = time.perf_counter()
+    for geometry in geometries:
+        cache.get(geometry, size, dict(settings, bg_blur=20))
+    results["reblur_ms"] = (time.perf_counter() - start) * 1e3
+    results["reblur_grabs"] = cache.grabs - grabs
+    results["cache"] = cache.stats()
+    return results
+
+
+def _wait_for(app, condition, timeout=30.0):
+    """Process events until condition() is true or timeout seconds pass."""
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    return condition()
+
+
+def bench_slideshow(images=2000, corrupt=50, frames=20, monitors=3, prefetch=2):
+    """Slideshow over a large directory with corrupt files: decode, swap and memory bounds."""
+    import shutil
+    import tempfile
+    app = _qt_app()
+    from slideshow import Slideshow
+    from utils import default_settings
+
+    tmp = tempfile.TemporaryDirectory()
+    # A few distinct photos, copied to make a large directory cheaply
+    originals = []
+    for i in range(8):
+        path = os.path.join(tmp.name, f"original-{i}.jpg")
+        _synthetic_desktop(3000, 2000, seed=i).save(path, "JPEG", 90)
+        originals.append(path)
+    for i in range(images):
+        shutil.copyfile(originals[i % len(originals)], os.path.join(tmp.name, f"photo-{i:06d}.jpg"))
+    # Corrupt files sort first, so they are hit straight away
+    with open(originals[0], "rb") as f:
+        jpeg = f.read()
+    for i in range(corrupt):
+        with open(os.path.join(tmp.name, f"broken-{i:04d}.jpg"), "wb") as f:
+            f.write(jpeg[:len(jpeg) // 50] if i % 2 else os.urandom(4096))
+    with open(os.path.join(tmp.name, "notes.txt"), "w") as f:
+        f.write("not an image")
+
+    settings = default_settings()
+    settings.update({"slideshow_dir": tmp.name, "slideshow_interval": 3600,
+                     "slideshow_prefetch": prefetch})
+    slideshow = Slideshow()
+
+    start = time.perf_counter()
+    slideshow.start(settings, _monitor_layout(monitors - 1) + _monitor_layout(1, 2560, 1440))
+    _wait_for(app, lambda: slideshow.shown > 0)
+    first_frame = time.perf_counter() - start
+
+    swap_times = []
+    for _ in range(frames):
+        _wait_for(app, lambda: len(slideshow.ready) == prefetch)
+        start = time.perf_counter()
+        slideshow.advance()
+        swap_times.append(time.perf_counter() - start)
+    stats = slideshow.stats()
+    slideshow.stop()
+    tmp.cleanup()
+
+    return {
+        "images": images,
+        "corrupt": corrupt,
+        "monitors": monitors,
+        "prefetch": prefetch,
+        "first_frame_ms": first_frame * 1e3,
+        "decode_ms_per_frame": stats["decode_ms"] / max(1, stats["decoded"] + stats["failed"]),
+        "swap_p50_ms": _percentile(swap_times, 0.5) * 1e3,
+        "swap_p99_ms": _percentile(swap_times, 0.99) * 1e3,
+        "peak_ready": stats["peak_ready"],
+        "slideshow": stats,
+    }
+
+
+def bench_paint(monitors=2, number=100):
+    """Full-window and clock-tick repaint time, precomposed frame versus live widgets."""
+    import tempfile
+    app = _qt_app()
+    from screenlocker import LockScreen
+    from utils import default_settings
+
+    tmp = tempfile.TemporaryDirectory()
+    image_path = os.path.join(tmp.name, "background.jpg")
+    _synthetic_desktop(3840, 2160).save(image_path)
+    avatar_path = os.path.join(tmp.name, "avatar.png")
+    _synthetic_desktop(256, 256, seed=1).save(avatar_path)
+
+    results = {"monitors": monitors, "number": number, "modes": {}}
+    for precompose in (False, True):
+        settings = default_settings()
+        settings.update({
+            "bg_image": image_path,
+            "user_avatar_path": avatar_path,
+            "enable_password": True,
+            "precompose_frame": precompose,
+        })
+        windows = [LockScreen(settings, None, geometry) for geometry in _monitor_layout(monitors)]
+        for window in windows:
+            window.show()
+        _drain_events(app)
+
+        def repaint_all():
+            for window in windows:
+                window.repaint()
+
+        def repaint_clock():
+            for window in windows:
+                window.clock_label.repaint()
+
+        results["modes"]["precomposed" if precompose else "widgets"] = {
+            "full_repaint_ms": _time_per_call(repaint_all, number) * 1e3 / monitors,
+            "clock_repaint_ms": _time_per_call(repaint_clock, number) * 1e3 / monitors,
+            "frame_builds": sum(window.frame_builds for window in windows),
+        }
+        for window in windows:
+            window.teardown()
+        _drain_events(app)
+
+    widgets, precomposed = results["modes"]["widgets"], results["modes"]["precomposed"]
+    results["full_repaint_speedup"] = widgets["full_repaint_ms"] / precomposed["full_repaint_ms"]
+    tmp.cleanup()
+    return results
+
+
+def bench_assets(cycles=5):
+    """Per-screen asset scaling on mixed-DPR virtual screens: prepared ahead versus at lock.
+
+    The offscreen platform has one screen, so each layout maps simulated
+    monitors to device pixel ratios through the locker's screen_ratio hook.
+    Every window's background, avatar and precomposed frame is checked for
+    the physical size and ratio of its monitor.
+    """
+    import tempfile
+    app = _qt_app()
+    from PyQt5.QtCore import QRect
+    from PyQt5.QtGui import QPalette
+    from background import background_cache, frame_cache, physical_size
+    from screenlocker import ScreenLocker, LockScreen
+    from utils import default_settings
+
+    tmp = tempfile.TemporaryDirectory()
+    image_path = os.path.join(tmp.name, "background.jpg")
+    _synthetic_desktop(3840, 2160).save(image_path)
+    avatar_path = os.path.join(tmp.name, "avatar.png")
+    _synthetic_desktop(512, 512, seed=1).save(avatar_path)
+
+    # (logical width, logical height, device pixel ratio) per monitor
+    layouts = {
+        "uniform_1x": [(1920, 1080, 1.0), (1920, 1080, 1.0)],
+        "uniform_2x": [(1920, 1080, 2.0), (1920, 1080, 2.0)],
+        "mixed_1x_2x": [(1920, 1080, 1.0), (1920, 1080, 2.0)],
+        "mixed_fractional": [(1280, 800, 1.25), (1920, 1080, 1.5), (2560, 1440, 1.0), (1512, 982, 2.0)],
+    }
+
+    def check(window, dpr):
+        """Return the assets of window not at its monitor's physical size and ratio."""
+        wrong = []
+        background = window.background_brush.texture()
+        if background.devicePixelRatio() != dpr or background.width() < round(window.width() * dpr) \
+                or background.height() < round(window.height() * dpr):
+            wrong.append("background")
+        avatar = window.avatar_pixmap
+        target = physical_size(LockScreen.AVATAR_SIZE, dpr)
+        if avatar is None or avatar.devicePixelRatio() != dpr or max(avatar.width(), avatar.height()) != target.width():
+            wrong.append("avatar")
+        frame = window.frame_pixmap
+        if frame is None or frame.devicePixelRatio() != dpr or frame.size() != physical_size(window.size(), dpr):
+            wrong.append("frame")
+        return wrong
+
+    results = {"cycles": cycles, "layouts": {}}
+    for name, monitors in layouts.items():
+        geometries, ratios, x = [], {}, 0
+        for width, height, dpr in monitors:
+            geometry = QRect(x, 0, width, height)
+            geometries.append(geometry)
+            ratios[(geometry.x(), geometry.y())] = dpr
+            x += width
+        settings = default_settings()
+        settings.update({"bg_image": image_path, "user_avatar_path": avatar_path})
+
+        run = {"monitors": [list(monitor) for monitor in monitors]}
+        for mode in ("at_lock", "prepared"):
+            lock_times, prepare_times, wrong, scaled_at_lock = [], [], set(), 0
+            before = background_cache.stats()
+            for _ in range(cycles):
+                background_cache.invalidate()
+                frame_cache.clear()
+                locker = ScreenLocker(settings, screen_geometries=lambda: geometries,
+                                      screen_ratio=lambda g: ratios[(g.x(), g.y())])
+                if mode == "prepared":
+                    start = time.perf_counter()
+                    locker.prepare_assets()
+                    _wait_for(app, lambda: locker.asset_preparer.isFinished())
+                    prepare_times.append(time.perf_counter() - start)
+                else:
+                    _drain_events(app)  # Let the deferred preparation run
+                    locker.stop_asset_preparer()
+                    background_cache.invalidate()
+
+                locker.lock_screen()
+                app.processEvents()
+                # Scaling left to the lock runs on the asset pool after the monitors are covered
+                _wait_for(app, lambda: all(t["final_ms"] is not None for t in locker.lock_timings))
+                app.processEvents()
+                lock_times.append(max(t["final_ms"] for t in locker.lock_timings))
+                scaled_at_lock += locker.asset_pool.submitted
+
+                for window in locker.lock_screens:
+                    dpr = ratios[(window.screen_geometry.x(), window.screen_geometry.y())]
+                    wrong.update(check(window, dpr))
+                locker.unlock_screen()
+                _drain_events(app)
+
+            after = background_cache.stats()
+            run[mode] = {
+                "final_frame_p50_ms": _percentile(lock_times, 0.5),
+                "prepare_p50_ms": _percentile(prepare_times, 0.5) * 1e3 if prepare_times else None,
+                "scaled_at_lock": scaled_at_lock + after["misses"] - before["misses"],
+                "prepared_hits": after["prepared_hits"] - before["prepared_hits"],
+                "wrong_assets": sorted(wrong),
+            }
+        run["final_frame_speedup"] = (run["at_lock"]["final_frame_p50_ms"]
+                                      / run["prepared"]["final_frame_p50_ms"])
+        results["layouts"][name] = run
+
+    background_cache.invalidate()
+    frame_cache.clear()
+    tmp.cleanup()
+    return results
+
+
+def bench_lock_pipeline(monitors=3, cycles=5):
+    """Time to cover each monitor and to its final frame, cover-first versus building each window fully.
+
+    Caches are emptied before every lock, so each one has to scale the
+    background and avatar (or blur the desktop) for every monitor. Also
+    checks that slideshows with no frame to show don't hold the final frame back.
+    """
+    import tempfile
+    app = _qt_app()
+    from background import background_cache, desktop_blur, frame_cache, AssetPreparer
+    from screenlocker import ScreenLocker
+    from utils import default_settings
+
+    tmp = tempfile.TemporaryDirectory()
+    image_path = os.path.join(tmp.name, "background.jpg")
+    _synthetic_desktop(3840, 2160).save(image_path)
+    avatar_path = os.path.join(tmp.name, "avatar.png")
+    _synthetic_desktop(512, 512, seed=1).save(avatar_path)
+    geometries = _monitor_layout(monitors)
+    grab = desktop_blur.grab
+    desktop_blur.grab = lambda geometry: _synthetic_desktop(geometry.width(), geometry.height())
+
+    results = {"monitors": monitors, "cycles": cycles, "runs": []}
+    for bg_type in ("Image", "Blur Current Desktop"):
+        for async_lock in (False, True):
+            settings = default_settings()
+            settings.update({
+                "bg_type": bg_type,
+                "bg_image": image_path,
+                "user_avatar_path": avatar_path,
+                "async_lock": async_lock,
+            })
+            locker = ScreenLocker(settings, screen_geometries=lambda: geometries)
+            _drain_events(app)
+            # Measure the lock without preparation, so no job may still be running
+            locker.stop_asset_preparer()
+            _wait_for(app, lambda: not AssetPreparer.active)
+
+            first_cover, all_covered, final = [], [], []
+            for _ in range(cycles):
+                background_cache.invalidate()
+                desktop_blur.invalidate()
+                frame_cache.clear()
+                locker.lock_screen()
+                app.processEvents()
+                _wait_for(app, lambda: all(t["final_ms"] is not None for t in locker.lock_timings))
+                timings = locker.lock_timings
+                first_cover.append(min(t["cover_ms"] for t in timings))
+                all_covered.append(max(t["cover_ms"] for t in timings))
+                final.append(max(t["final_ms"] for t in timings))
+                per_screen = [dict(t) for t in timings]
+                locker.unlock_screen()
+                _drain_events(app)
+
+            results["runs"].append({
+                "background": bg_type,
+                "async_lock": async_lock,
+                "first_cover_p50_ms": _percentile(first_cover, 0.5),
+                "all_covered_p50_ms": _percentile(all_covered, 0.5),
+                "final_frame_p50_ms": _percentile(final, 0.5),
+                "last_lock_screens": per_screen,
+                "asset_pool": locker.asset_pool.stats(),
+            })
+            locker.asset_pool.wait()
+
+    # Slideshows that can't deliver a frame must not hold the final frame back
+    from screenlocker import PowerMonitor
+    empty_dir = os.path.join(tmp.name, "empty")
+    corrupt_dir = os.path.join(tmp.name, "corrupt")
+    os.makedirs(empty_dir)
+    os.makedirs(corrupt_dir)
+    for index in range(3):
+        with open(os.path.join(corrupt_dir, f"{index}.jpg"), "wb") as f:
+            f.write(b"not an image")
+    results["slideshow_final_frame"] = {}
+    # The temp directory itself holds readable images, but transitions are paused
+    for case, directory in (("empty", empty_dir), ("unreadable", corrupt_dir), ("low_power", tmp.name)):
+        settings = default_settings()
+        settings.update({"bg_type": "Slideshow", "slideshow_dir": directory})
+        locker = ScreenLocker(settings, screen_geometries=lambda: geometries)
+        if case == "low_power":
+            locker.on_power_mode(PowerMonitor.THROTTLED)
+        locker.lock_screen()
+        results["slideshow_final_frame"][case] = _wait_for(
+            app, lambda: all(t["final_ms"] is not None for t in locker.lock_timings), timeout=5.0)
+        locker.unlock_screen()
+        _drain_events(app)
+
+    desktop_blur.grab = grab
+    background_cache.invalidate()
+    desktop_blur.invalidate()
+    frame_cache.clear()
+    tmp.cleanup()
+    return results
+
+
+def bench_attempt_limiter(presses=200, interval=0.5):
+    """Someone hammering Enter with wrong passwords: KDF runs with and without the attempt limiter.
+
+    A fake clock advances interval seconds per press. Also checks that the
+    counters survive a restart, that a corrupt state file is survived and that
+    a window torn down mid-check does not count that attempt.
+    """
+    import tempfile
+    app = _qt_app()
+    from screenlocker import ScreenLocker
+    from utils import AttemptLimiter, default_settings, hash_password
+
+    tmp = tempfile.TemporaryDirectory()
+    now = [1000000.0]
+    clock = lambda: now[0]
+
+    def hammer(settings, path):
+        limiter = AttemptLimiter(settings, path, clock)
+        locker = ScreenLocker(settings, screen_geometries=lambda: _monitor_layout(2),
+                              attempt_limiter=limiter)
+        locker.lock_screen()
+        app.processEvents()
+        start = time.perf_counter()
+        for press in range(presses):
+            window = locker.lock_screens[press % len(locker.lock_screens)]
+            window.password_field.setText("wrong")
+            window.check_password()
+            _wait_for(app, lambda: window.password_check is None)
+            now[0] += interval
+        elapsed = time.perf_counter() - start
+        locker.unlock_screen()
+        _drain_events(app)
+        return limiter, elapsed
+
+    settings = default_settings()
+    settings.update({
+        "enable_password": True,
+        # A realistic cost, so the CPU time saved shows
+        "password": hash_password("benchmark", "pbkdf2-sha256", {"i": 200000}),
+    })
+    unlimited_settings = dict(settings, max_attempts=presses + 1, failed_attempts=presses + 1)
+
+    results = {"presses": presses, "interval_s": interval}
+    for name, run_settings in (("unlimited", unlimited_settings), ("limited", settings)):
+        path = os.path.join(tmp.name, f"{name}.json")
+        limiter, elapsed = hammer(run_settings, path)
+        results[name] = {"kdf_runs": limiter.checks, "wall_s": elapsed, "state": limiter.state()}
+
+    # A restart picks the counters up again
+    limited = AttemptLimiter(settings, os.path.join(tmp.name, "limited.json"), clock)
+    results["restart_keeps_lockout"] = limited.locked_out() and limited.failures == results["limited"]["state"]["failures"]
+    # A corrupt file is reported and treated as no failures
+    corrupt_path = os.path.join(tmp.name, "corrupt.json")
+    with open(corrupt_path, "w") as f:
+        f.write('{"failures": 3, "blocked_')
+    results["corrupt_file_failures"] = AttemptLimiter(settings, corrupt_path, clock).failures
+    results["kdf_runs_avoided"] = results["unlimited"]["kdf_runs"] - results["limited"]["kdf_runs"]
+
+    # A monitor unplugged while its window checks a password drops that attempt
+    geometries = _monitor_layout(2)
+    limiter = AttemptLimiter(settings, os.path.join(tmp.name, "teardown.json"), clock)
+    locker = ScreenLocker(settings, screen_geometries=lambda: list(geometries),
+                          attempt_limiter=limiter)
+    locker.lock_screen()
+    app.processEvents()
+    window = locker.lock_screens[-1]
+    window.password_field.setText("wrong")
+    window.check_password()
+    geometries.pop()
+    locker.sync_lock_screens(list(geometries))
+    _drain_events(app)
+    results["teardown_during_check"] = {
+        "still_locked": locker.is_locked and len(locker.lock_screens) == 1,
+        "failures": limiter.failures,
+        "in_flight": limiter.state()["in_flight"],
+    }
+    locker.unlock_screen()
+    _drain_events(app)
+    tmp.cleanup()
+    return results
+
+
+def bench_settings_panel(number=5):
+    """Settings dialog construction with lazy tabs versus building every tab up front."""
+    app = _qt_app()
+    from settingspanel import SettingsPanel
+    from utils import default_settings
+
+    def build(eager):
+        start = time.perf_counter()
+        panel = SettingsPanel(default_settings())
+        if eager:
+            for index in range(panel.ui.tabs.count()):
+                panel.ensure_tab(index)
+        elapsed = time.perf_counter() - start
+        panel.deleteLater()
+        app.processEvents()
+        return elapsed
+
+    build(False)  # Warm up imports and style caches
+    eager = min(build(True) for _ in range(number))
+    lazy = min(build(False) for _ in range(number))
+    return {
+        "eager_ms": eager * 1e3,
+        "lazy_ms": lazy * 1e3,
+        "speedup": eager / lazy if lazy else None,
+    }
+
+
+def bench_native_event_filter(number=100000):
+    """Per-message cost of the Windows native event filter, before and after."""
+    import ctypes
+    from ctypes.wintypes import MSG
+    from utils import WindowsBackend
+
+    # A typical non-hotkey message, which is what the filter sees most
+    msg = MSG()
+    msg.message = 0x0200  # WM_MOUSEMOVE
+    address = ctypes.addressof(msg)
+    event_type = b"windows_generic_MSG"
+
+    def legacy_filter():
+        # Previous implementation: platform lookup and imports on every message
+        platform.system() == "Windows"
+        import ctypes
+        from ctypes.wintypes import MSG
+        message = ctypes.cast(int(address), ctypes.POINTER(MSG)).contents
+        return message.message == 0x0312
+
+    read_hotkey_message = WindowsBackend().read_hotkey_message
+
+    def filter():
+        return read_hotkey_message(event_type, address) == 1
+
+    before = _time_per_call(legacy_filter, number)
+    after = _time_per_call(filter, number)
+    return {
+        "before_us": before * 1e6,
+        "after_us": after * 1e6,
+        "speedup": before / after if after else None,
+    }
+
+
+def bench_encrypt_fields(fields=10):
+    """Encrypting N settings fields with the old per-call KDF versus the keyring."""
+    try:
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    except ImportError:
+        return {"skipped": "cryptography not installed"}
+    import base64
+    import tempfile
+    from utils import Keyring
+
+    values = [f"value-{i}" for i in range(fields)]
+    secret = "benchmark secret"
+
+    def legacy_encrypt(data, key):
+        # Previous implementation: a full 100k-round PBKDF2 on every call
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32,
+                         salt=b'screen_locker_salt', iterations=100000)
+        derived_key = base64.urlsafe_b64encode(kdf.derive(key.encode()))
+        return base64.urlsafe_b64encode(Fernet(derived_key).encrypt(data.encode())).decode()
+
+    start = time.perf_counter()
+    for value in values:
+        legacy_encrypt(value, secret)
+    before = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        keyring = Keyring(salt_file=f"{tmp}/salt")
+        start = time.perf_counter()
+        keyring.encrypt_many(values, secret)
+        after = time.perf_counter() - start
+
+    return {
+        "fields": fields,
+        "before_ms": before * 1e3,
+        "after_ms": after * 1e3,
+        "derivations": keyring.derivations,
+        "speedup": before / after if after else None,
+    }
+
+
+BENCHMARKS = {
+    "assets": bench_assets,
+    "attempt_limiter": bench_attempt_limiter,
+    "desktop_blur": bench_desktop_blur,
+    "encrypt_fields": bench_encrypt_fields,
+    "lock_cycles": bench_lock_cycles,
+    "lock_pipeline": bench_lock_pipeline,
+    "low_power": bench_low_power,
+    "native_event_filter": bench_native_event_filter,
+    "paint": bench_paint,
+    "screen_hotplug": bench_screen_hotplug,
+    "settings_panel": bench_settings_panel,
+    "slideshow": bench_slideshow,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Screen Locker micro-benchmarks.")
+    parser.add_argument("names", nargs="*",
+                        help=f"Benchmarks to run (default: all). Available: {', '.join(sorted(BENCHMARKS))}")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file")
+    parser.add_argument("--cycles", type=int, help="Lock/unlock cycles per settings permutation")
+    parser.add_argument("--monitors", type=int, help="Number of simulated monitors")
+    args = parser.parse_args(argv)
+    options = {key: value for key, value in (("cycles", args.cycles), ("monitors", args.monitors))
+               if value is not None}
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in args.names or sorted(BENCHMARKS):
+        start = time.perf_counter()
+        benchmark = BENCHMARKS[name]
+        accepted = inspect.signature(benchmark).parameters
+        results[name] = benchmark(**{key: value for key, value in options.items() if key in accepted})
+        results[name]["wall_s"] = time.perf_counter() - start
+
+    output = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
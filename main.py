@@ -1,35 +1,85 @@
+import time
+_PROCESS_START = time.perf_counter()  # Taken before any other import, for the startup profile
+
 import sys
 import os
+import json
+import argparse
+from contextlib import contextmanager
 from PyQt5.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QAction, QMessageBox
 from PyQt5.QtCore import Qt, QAbstractNativeEventFilter, QEvent
 from PyQt5.QtGui import QIcon
-import win32con
 from screenlocker import ScreenLocker
-from settingspanel import SettingsPanel
-from utils import is_windows, load_settings, request_admin_privileges, save_settings, set_as_default_lock_screen
+from utils import get_platform, is_windows, keyring, settings_store, load_settings, request_admin_privileges, save_settings, set_as_default_lock_screen
+
+# Environment variable that enables the startup profiler; set it to a report path or "1"
+PROFILE_ENV = "SCREENLOCKER_PROFILE"
+DEFAULT_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_profile.json")
+
+class StartupProfiler:
+    """Records wall-time per startup phase and writes them as a JSON report."""
+    def __init__(self, start=_PROCESS_START, enabled=True):
+        self.start = start
+        self.enabled = enabled
+        self.phases = {}  # name -> seconds
+        self.marks = {}   # name -> seconds since process start
+        self.extra = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def mark(self, name):
+        """Record the time since process start at which a milestone was reached."""
+        self.marks.setdefault(name, time.perf_counter() - self.start)
+
+    def report(self):
+        return {
+            "phases_ms": {name: seconds * 1000 for name, seconds in self.phases.items()},
+            "marks_ms": {name: seconds * 1000 for name, seconds in self.marks.items()},
+            "extra": self.extra,
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=4)
 
 # Add WinEventFilter class for hotkey handling
 class WinEventFilter(QAbstractNativeEventFilter):
     def __init__(self, locker):
         super().__init__()
         self.locker = locker
+        # Bind the message decoder once instead of resolving it per message
+        self.read_hotkey_message = get_platform().read_hotkey_message
 
     def nativeEventFilter(self, eventType, message):
-        if is_windows() and eventType == "windows_generic_MSG":
-            try:
-                import ctypes
-                from ctypes.wintypes import MSG
-                msg = ctypes.cast(int(message), ctypes.POINTER(MSG)).contents
-                if msg.message == win32con.WM_HOTKEY:
-                    if msg.wParam == 1:  # Our hotkey ID
-                        self.locker.lock_screen()
-                        return True, 0
-            except Exception as e:
-                print(f"Error in native event filter: {e}")
+        try:
+            if self.read_hotkey_message(eventType, message) == 1:  # Our hotkey ID
+                self.locker.lock_screen(triggered_at=time.perf_counter())
+                return True, 0
+        except Exception as e:
+            print(f"Error in native event filter: {e}")
         return False, 0
 
 class ScreenLockerApp:
-    def __init__(self):
+    def __init__(self, profiler=None):
+        self.profiler = profiler or StartupProfiler(enabled=False)
+
+        # Load settings
+        with self.profiler.phase("settings_load"):
+            try:
+                self.settings = load_settings()
+            except Exception as e:
+                QMessageBox.critical(None, "Error", f"Failed to load settings: {e}")
+                self.settings = load_settings(default=True)  # Fallback to default settings
+        self.profiler.extra["settings_file_load_ms"] = (settings_store.last_load_time or 0) * 1000
+        self.profiler.extra["settings_file_loads"] = settings_store.loads
+
         # Check if admin rights are needed and restart if necessary
         if self.needs_admin_privileges():
             if request_admin_privileges():
@@ -40,25 +90,21 @@ class ScreenLockerApp:
                 # Original process exits after spawning elevated one
                 sys.exit(0)
 
-        # Load settings
-        try:
-            self.settings = load_settings()
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to load settings: {e}")
-            self.settings = load_settings(default=True)  # Fallback to default settings
-
         # Create the screen locker
-        try:
-            self.locker = ScreenLocker(self.settings)
-        except Exception as e:
-            QMessageBox.critical(None, "Error", f"Failed to initialize screen locker: {e}")
-            sys.exit(1)  # Exit if the locker cannot be initialized
+        with self.profiler.phase("locker"):
+            try:
+                self.locker = ScreenLocker(self.settings)
+            except Exception as e:
+                QMessageBox.critical(None, "Error", f"Failed to initialize screen locker: {e}")
+                sys.exit(1)  # Exit if the locker cannot be initialized
 
-        # Create the settings panel
-        self.settings_panel = SettingsPanel(self.settings, self.locker)
+        # The settings panel is created the first time it is opened
+        self.settings_panel = None
 
         # Create system tray icon
-        self.setup_tray_icon()
+        with self.profiler.phase("tray"):
+            self.setup_tray_icon()
+        self.profiler.mark("time_to_tray")
 
         # Create and install the event filter
         if is_windows():
@@ -110,6 +156,10 @@ class ScreenLockerApp:
 
     def init_app(self):
         # Set up integrations immediately after admin check
+        with self.profiler.phase("integration"):
+            self.setup_integrations()
+
+    def setup_integrations(self):
         try:
             self.setup_windows_integration()
             if self.settings.get("set_as_default_lock", False):
@@ -122,9 +172,6 @@ class ScreenLockerApp:
             QMessageBox.warning(None, "Integration Setup",
                                 f"Failed to set up some integrations: {str(e)}")
 
-        # Create system tray icon
-        self.setup_tray_icon()
-
     def setup_tray_icon(self):
         """Set up the system tray icon and menu."""
         self.tray_icon = QSystemTrayIcon()
@@ -162,27 +209,70 @@ class ScreenLockerApp:
         self.tray_icon.show()
 
     def show_settings(self):
-        """Show the settings panel."""
+        """Show the settings panel, creating it on first use."""
+        if self.settings_panel is None:
+            with self.profiler.phase("settings_panel"):
+                # Imported here so the dialog's UI module isn't loaded at startup
+                from settingspanel import SettingsPanel
+                self.settings_panel = SettingsPanel(self.settings, self.locker)
         self.settings_panel.show()
 
     def exit_app(self):
         """Exit the application."""
         try:
-            save_settings(self.settings)  # Save settings before exiting
+            save_settings(self.settings, immediate=True)  # Save settings before exiting
         except Exception as e:
             QMessageBox.warning(None, "Warning", f"Failed to save settings: {e}")
 
+        keyring.wipe()  # Drop any cached encryption keys
         self.tray_icon.hide()  # Hide the tray icon
         QApplication.quit()  # Quit the application
 
+def parse_args(argv):
+    """Parse our own command line flags, leaving Qt's for QApplication."""
+    parser = argparse.ArgumentParser(description="Screen Locker")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_PATH, default=None,
+                        metavar="PATH", help="Write a JSON startup profile (default: startup_profile.json)")
+    parser.add_argument("--startup-budget", type=float, default=None, metavar="MS",
+                        help="Exit with status 2 if time-to-tray exceeds this many milliseconds")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="Quit as soon as startup has finished (for profiling)")
+    args, _ = parser.parse_known_args(argv)
+
+    if args.profile is None and os.environ.get(PROFILE_ENV):
+        value = os.environ[PROFILE_ENV]
+        args.profile = DEFAULT_PROFILE_PATH if value == "1" else value
+    return args
+
+def finish_startup_profile(profiler, args):
+    """Write the startup profile and check it against the budget. Returns an exit status."""
+    if args.profile:
+        try:
+            profiler.write(args.profile)
+        except OSError as e:
+            print(f"Failed to write startup profile: {e}")
+
+    time_to_tray = profiler.marks.get("time_to_tray", 0) * 1000
+    if args.startup_budget is not None and time_to_tray > args.startup_budget:
+        print(f"Startup budget exceeded: time-to-tray {time_to_tray:.1f} ms > {args.startup_budget:.1f} ms")
+        return 2
+    return 0
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    args = parse_args(sys.argv[1:])
+    profiler = StartupProfiler(enabled=bool(args.profile or args.exit_after_startup or
+                                            args.startup_budget is not None))
+    profiler.phases["imports"] = time.perf_counter() - _PROCESS_START
+
+    with profiler.phase("qapplication"):
+        app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)  # Ensure the app doesn't quit when the last window is closed
 
     # Create and run the screen locker app
     try:
-        screen_locker_app = ScreenLockerApp()
+        screen_locker_app = ScreenLockerApp(profiler)
         screen_locker_app.init_app()
+        profiler.mark("startup_complete")
 
         # Show success message after setup
         if is_windows() and screen_locker_app.settings.get("set_as_default_lock", False):
@@ -193,4 +283,9 @@ if __name__ == "__main__":
         QMessageBox.critical(None, "Error", f"Failed to initialize application: {e}")
         sys.exit(1)
 
+    if profiler.enabled:
+        status = finish_startup_profile(profiler, args)
+        if args.exit_after_startup or status:
+            sys.exit(status)
+
     sys.exit(app.exec_())
\ No newline at end of file
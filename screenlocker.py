@@ -1,25 +1,77 @@
 import os
 import sys
+import copy
+import json
 import time
+import weakref
 from datetime import datetime
 from PyQt5.QtWidgets import (QWidget, QLabel, QVBoxLayout, QHBoxLayout, 
-                           QPushButton, QLineEdit, QApplication, QDesktopWidget)
-from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal, QEvent
-from PyQt5.QtGui import QFont, QColor, QPalette, QPixmap, QKeySequence, QBrush
+                           QPushButton, QLineEdit, QApplication, QDesktopWidget, QSizePolicy)
+from PyQt5.QtCore import Qt, QTimer, QSize, QPoint, QThread, pyqtSignal, QEvent
+from PyQt5.QtGui import QFont, QColor, QPalette, QPixmap, QKeySequence, QBrush, QPainter, QRegion
 from PyQt5.QtCore import QObject, QEvent
-from utils import get_idle_time, parse_hotkey, fullscreen_on_all_monitors
+from PyQt5 import sip
+from utils import (get_idle_time, parse_hotkey, fullscreen_on_all_monitors, screen_pixel_ratio,
+                   verify_password, password_needs_rehash, hash_password, save_settings, keyring,
+                   get_power_provider, AttemptLimiter, format_wait)
+from background import (background_cache, desktop_blur, frame_cache, pixmap_bytes, blur_snapshot,
+                        AssetPreparer, AssetPool)
+from slideshow import Slideshow
 
 # Explicitly export the ScreenLocker class
 __all__ = ['ScreenLocker']
 
+class PasswordCheckThread(QThread):
+    """Verifies a password on a worker thread.
+
+    On success it also re-hashes the password if the stored hash uses a
+    legacy format or an outdated cost, so the upgrade costs the GUI nothing.
+    """
+    checked = pyqtSignal(bool, str)  # (correct, upgraded hash or "")
+
+    def __init__(self, password, stored_hash, parent=None):
+        super().__init__(parent)
+        self.password = password
+        self.stored_hash = stored_hash
+
+    def run(self):
+        correct = verify_password(self.password, self.stored_hash)
+        upgraded_hash = ""
+        if correct and password_needs_rehash(self.stored_hash):
+            try:
+                upgraded_hash = hash_password(self.password)
+            except Exception as e:
+                print(f"Error upgrading password hash: {e}")
+        self.password = None
+        self.checked.emit(correct, upgraded_hash)
+
 class LockScreen(QWidget):
     """Widget to display the locked screen."""   
-    def __init__(self, settings, parent=None, screen_geometry=None):
+    # Every LockScreen created, for leak diagnostics
+    instances = weakref.WeakSet()
+    AVATAR_SIZE = QSize(96, 96)  # Logical pixels
+
+    def __init__(self, settings, parent=None, screen_geometry=None, pending_assets=()):
         super().__init__(None, Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        LockScreen.instances.add(self)
         
         self.settings = settings
+        self.avatar_pixmap = None
         self.password_attempt = ""
+        self.password_check = None  # Running PasswordCheckThread, if any
         self.parent_locker = parent  # Store the ScreenLocker instance
+        self.screen_geometry = screen_geometry  # Monitor this window covers, if assigned
+        # Assets ("background", "avatar") the locker is still preparing; a
+        # placeholder is shown until finish_asset() swaps each one in
+        self.pending_assets = set(pending_assets)
+
+        # Precomposed frame: background plus the widgets that never change
+        self.static_widgets = []
+        self.background_brush = None
+        self.frame_pixmap = None
+        self.frame_key = None
+        self.frame_builds = 0
+        self.composing = False
         
         # Set up the window
         if screen_geometry:
@@ -43,13 +95,38 @@ class LockScreen(QWidget):
         # Set up the background
         palette = self.palette()
         
-        if self.settings.get("bg_image"):
+        if "background" in self.pending_assets:
+            # Cover in plain colour until the real background is ready
+            palette.setColor(QPalette.Window, QColor(self.settings.get("bg_color", "#000000")))
+        elif self.settings.get("bg_type") == "Blur Current Desktop":
+            # Blurred snapshot of the screen this window covers
+            try:
+                geometry = self.screen_geometry or self.geometry()
+                pixmap = desktop_blur.get(geometry, self.size(), self.settings, self.pixel_ratio())
+            except Exception as e:
+                print(f"Error blurring desktop: {e}")
+                pixmap = None
+            if pixmap is not None:
+                palette.setBrush(QPalette.Window, QBrush(pixmap))
+            else:
+                palette.setColor(QPalette.Window, QColor(self.settings.get("bg_color", "#000000")))
+        elif self.settings.get("bg_type") == "Slideshow":
+            # Frame decoded ahead by the locker's slideshow; colour until the first arrives
+            pixmap = None
+            if self.parent_locker:
+                pixmap = self.parent_locker.slideshow.current_pixmap(self.size(), self.pixel_ratio())
+            if pixmap is not None:
+                palette.setBrush(QPalette.Window, QBrush(pixmap))
+            else:
+                palette.setColor(QPalette.Window, QColor(self.settings.get("bg_color", "#000000")))
+        elif self.settings.get("bg_image"):
             # Use background image
             try:
-                pixmap = QPixmap(self.settings["bg_image"])
-                if not pixmap.isNull():
-                    palette.setBrush(QPalette.Window, QBrush(pixmap.scaled(
-                        self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)))
+                # Decoded and scaled variants are shared across windows and locks
+                pixmap = background_cache.get_scaled(self.settings["bg_image"], self.size(),
+                                                     self.pixel_ratio())
+                if pixmap is not None:
+                    palette.setBrush(QPalette.Window, QBrush(pixmap))
                 else:
                     # Fall back to black if image loading fails
                     palette.setColor(QPalette.Window, QColor("#000000"))
@@ -61,6 +138,122 @@ class LockScreen(QWidget):
             bg_color = self.settings.get("bg_color", "#000000")
             palette.setColor(QPalette.Window, QColor(bg_color))
             
+        self.background_brush = palette.brush(QPalette.Window)
+        self.setPalette(palette)
+        self.compose_static_layers()
+
+    def load_avatar(self):
+        """Show the user avatar, scaled for this monitor's pixel ratio, or a placeholder."""
+        avatar_path = self.settings.get("user_avatar_path", "")
+        pixmap = None
+        if "avatar" not in self.pending_assets and avatar_path and os.path.exists(avatar_path):
+            pixmap = background_cache.get_scaled(avatar_path, self.AVATAR_SIZE,
+                                                 self.pixel_ratio(), fit=True)
+        self.avatar_pixmap = pixmap
+        if pixmap is not None:
+            self.avatar_label.setPixmap(pixmap)
+        elif "avatar" in self.pending_assets:
+            # Empty circle until the avatar is ready
+            self.avatar_label.clear()
+        else:
+            # Use default user icon emoji as fallback
+            self.avatar_label.setText("👤")
+            self.avatar_label.setFont(QFont("", 68))
+            self.avatar_label.setAlignment(Qt.AlignCenter)
+
+    def finish_asset(self, name):
+        """Swap in an asset the locker has finished preparing, then recompose."""
+        if name not in self.pending_assets:
+            return
+        self.pending_assets.discard(name)
+        if name == "avatar":
+            if hasattr(self, "avatar_label"):
+                self.load_avatar()
+            self.compose_static_layers()
+        else:
+            self.setup_background()
+
+    def pixel_ratio(self):
+        """Return the device pixel ratio of the monitor this window covers.
+
+        Known from the monitor geometry before the window is shown, so
+        assets can be scaled for the right screen up front.
+        """
+        if self.parent_locker and self.screen_geometry:
+            return self.parent_locker.screen_ratio(self.screen_geometry)
+        return self.devicePixelRatioF()
+
+    def add_static_widget(self, widget):
+        """Mark widget as never changing, so it can be painted into the precomposed frame."""
+        policy = widget.sizePolicy()
+        policy.setRetainSizeWhenHidden(True)  # Keep its place in the layout once hidden
+        widget.setSizePolicy(policy)
+        self.static_widgets.append(widget)
+
+    def compose_static_layers(self):
+        """Paint the background and static widgets into one pixmap per window.
+
+        The pixmap, at the screen's device pixel ratio, becomes the window
+        background and the static widgets are hidden, so a repaint is one
+        blit plus the live clock, password field and button. Frames are
+        shared through frame_cache, so one is only painted when the size,
+        background or layout is new. Hidden windows are composed once shown.
+        """
+        if not self.static_widgets or not self.settings.get("precompose_frame", True):
+            return
+        if sip.isdeleted(self) or not self.isVisible():
+            return
+        # Rendering delivers any pending resize event, which lands back here
+        if self.composing:
+            return
+        # Placeholders are short-lived; build the frame once the real assets are in
+        if self.pending_assets:
+            return
+        self.composing = True
+        try:
+            self.build_frame()
+        finally:
+            self.composing = False
+
+    def static_layers_key(self):
+        """Identify what the static widgets show."""
+        # The avatar comes from background_cache, so the same file version
+        # at the same size is the same pixmap
+        avatar = self.avatar_pixmap.cacheKey() if self.avatar_pixmap is not None else None
+        widgets = tuple((w.x(), w.y(), w.width(), w.height(), w.text(), w.styleSheet(), w.font().key())
+                        for w in self.static_widgets)
+        return (avatar, widgets)
+
+    def build_frame(self):
+        self.layout().activate()
+        dpr = self.pixel_ratio()
+        brush = self.background_brush
+        background_key = (brush.texture().cacheKey() if brush.style() == Qt.TexturePattern
+                          else brush.color().rgba())
+        key = (self.width(), self.height(), dpr, background_key, self.static_layers_key())
+
+        if key != self.frame_key:
+            frame = frame_cache.get(key)
+            if frame is None:
+                frame = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+                frame.setDevicePixelRatio(dpr)
+                painter = QPainter(frame)
+                # Overwrite rather than blend, so the frame needs no clearing first
+                painter.setCompositionMode(QPainter.CompositionMode_Source)
+                painter.fillRect(self.rect(), brush)
+                painter.end()
+                for widget in self.static_widgets:
+                    widget.render(frame, widget.mapTo(self, QPoint(0, 0)), QRegion(),
+                                  QWidget.DrawChildren | QWidget.DrawWindowBackground)
+                frame_cache.put(key, frame)
+                self.frame_builds += 1
+            self.frame_pixmap = frame
+            self.frame_key = key
+
+        for widget in self.static_widgets:
+            widget.hide()
+        palette = self.palette()
+        palette.setBrush(QPalette.Window, QBrush(self.frame_pixmap))
         self.setPalette(palette)
         
     def setup_layout(self):
@@ -75,67 +268,51 @@ class LockScreen(QWidget):
         # Add clock if enabled
         if self.settings.get("enable_clock", True):
             self.clock_label = QLabel()
-            self.update_clock()
-            
+
             # Add clock emoji if no custom icon
-            if not self.settings.get("clock_icon"):
-                self.clock_label.setText("🕐 " + self.clock_label.text())
-            
-            # Set font properties
-            font_size = self.settings.get("clock_size", 10)
-            font = QFont()
-            font.setPointSize(font_size)
-            self.clock_label.setFont(font)
-            
-            # Set color
-            clock_color = self.settings.get("clock_color", "#FFFFFF")
-            self.clock_label.setStyleSheet(f"color: {clock_color}")
-            
-            # Update clock every second
-            self.clock_timer = QTimer(self)
-            self.clock_timer.timeout.connect(self.update_clock)
-            self.clock_timer.start(1000)
-            
+            self.clock_prefix = "🕐 " if not self.settings.get("clock_icon") else ""
+            self.clock_label.setAlignment(Qt.AlignCenter)
+            self.update_clock()
             main_layout.addWidget(self.clock_label, 0, Qt.AlignCenter)
+
+            if self.settings.get("show_date", True):
+                self.date_label = QLabel()
+                self.date_label.setText(datetime.now().strftime(ClockService.date_format(self.settings)))
+                main_layout.addWidget(self.date_label, 0, Qt.AlignCenter)
+
+            self.style_clock()
+
+            # The locker's shared clock service drives updates
+            if self.parent_locker:
+                self.parent_locker.clock.tick.connect(self.set_clock_text)
+                self.parent_locker.clock.date_changed.connect(self.set_date_text)
         
         # Add user icon/avatar if enabled
         if self.settings.get("show_user_avatar", True):
-            user_avatar = QLabel()
-            avatar_size = QSize(96, 96)
-            user_avatar.setFixedSize(avatar_size)
+            self.avatar_label = QLabel()
+            self.avatar_label.setFixedSize(self.AVATAR_SIZE)
+            self.load_avatar()
             
-            # Try to load user avatar
-            avatar_path = self.settings.get("user_avatar_path", "")
-            if avatar_path and os.path.exists(avatar_path):
-                pixmap = QPixmap(avatar_path)
-            else:
-                # Use default user icon emoji as fallback
-                user_avatar.setText("👤")
-                user_avatar.setFont(QFont("", 68))
-                user_avatar.setAlignment(Qt.AlignCenter)
-            
-            if 'pixmap' in locals():
-                pixmap = pixmap.scaled(avatar_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                user_avatar.setPixmap(pixmap)
-            
-            user_avatar.setStyleSheet("""
+            self.avatar_label.setStyleSheet("""
                 QLabel {
                     background-color: rgba(255, 255, 255, 0.1);
                     border-radius: 48px;
                     padding: 8px;
                 }
             """)
-            main_layout.addWidget(user_avatar, 0, Qt.AlignCenter)
+            main_layout.addWidget(self.avatar_label, 0, Qt.AlignCenter)
+            self.add_static_widget(self.avatar_label)
             
         # Add user name if enabled
         if self.settings.get("show_username", True):
             try:
                 import getpass
-                username = self.settings.get("custom_username", getpass.getuser())
+                username = self.settings.get("custom_username") or getpass.getuser()
                 user_label = QLabel(username)
                 user_label.setFont(QFont("", 14))
                 user_label.setStyleSheet("color: white; margin: 10px;")
                 main_layout.addWidget(user_label, 0, Qt.AlignCenter)
+                self.add_static_widget(user_label)
             except Exception as e:
                 print(f"Error getting username: {e}")
         
@@ -150,6 +327,7 @@ class LockScreen(QWidget):
         lock_label.setFont(lock_font)
         lock_label.setStyleSheet("color: white")
         main_layout.addWidget(lock_label, 0, Qt.AlignCenter)
+        self.add_static_widget(lock_label)
         
         # Add spacing before the unlock interface
         main_layout.addSpacing(20)
@@ -186,6 +364,11 @@ class LockScreen(QWidget):
             self.message_label.setStyleSheet("color: red")
             main_layout.addWidget(self.message_label, 0, Qt.AlignCenter)
 
+            # Still backing off from an earlier lock (or run)
+            limiter = self.attempt_limiter()
+            if limiter is not None and limiter.remaining() > 0:
+                self.show_attempt_wait(limiter.remaining())
+
         # Add unlock icon to button if no custom icon
         unlock_icon = "🔓 " if not self.settings.get("unlock_icon") else ""
         unlock_button = QPushButton(f"{unlock_icon}{'Sign in' if self.settings.get('enable_password', False) else 'Unlock'}")
@@ -223,16 +406,59 @@ class LockScreen(QWidget):
     def update_clock(self):
         # Update the clock label with current time
         if hasattr(self, "clock_label"):
-            current_time = datetime.now()
-            
-            # Format based on settings
-            if self.settings.get("clock_24h", False):
-                time_format = "%H:%M:%S"
+            if self.parent_locker:
+                time_text = self.parent_locker.clock.current_text()
             else:
-                time_format = "%I:%M:%S %p"
-                
-            time_text = current_time.strftime(time_format)
-            self.clock_label.setText(time_text)
+                time_text = datetime.now().strftime(ClockService.time_format(self.settings))
+            self.set_clock_text(time_text)
+
+    def set_clock_text(self, time_text):
+        """Show time_text on the clock, skipping the repaint if nothing changed."""
+        text = self.clock_prefix + time_text
+        if self.clock_label.text() != text:
+            self.clock_label.setText(text)
+
+    def style_clock(self):
+        """Apply the clock font, size and colour, and size the label to fit."""
+        font = QFont()
+        font_family = self.settings.get("clock_font", "System Default")
+        if font_family != "System Default":
+            font.setFamily(font_family)
+        font_size = self.settings.get("clock_size", 10)
+        font.setPointSize(font_size)
+        self.clock_label.setFont(font)
+
+        clock_color = self.settings.get("clock_color", "#FFFFFF")
+        self.clock_label.setStyleSheet(f"color: {clock_color}")
+
+        # Size the label for the widest possible time up front, so a tick
+        # only repaints the label's own rect over the window background
+        # instead of relaying out the whole window
+        self.clock_label.setFixedSize(self.clock_text_size(self.clock_label, ClockService.time_format(self.settings)))
+
+        if hasattr(self, "date_label"):
+            date_font = QFont(font)
+            date_font.setPointSize(max(10, font_size // 3))
+            self.date_label.setFont(date_font)
+            self.date_label.setStyleSheet(f"color: {clock_color}")
+
+        # A new clock size moves the static widgets
+        self.compose_static_layers()
+
+    def set_date_text(self, date_text):
+        if hasattr(self, "date_label") and self.date_label.text() != date_text:
+            self.date_label.setText(date_text)
+
+    def clock_text_size(self, label, time_format):
+        """Return a label size that fits any time the format can produce."""
+        metrics = label.fontMetrics()
+        # Digits are usually equal width, but AM and PM are not
+        samples = [datetime(2000, 12, 28, hour, 58, 58) for hour in (8, 20)]
+        width = max(metrics.horizontalAdvance(self.clock_prefix + sample.strftime(time_format))
+                    for sample in samples)
+        margins = label.contentsMargins()
+        return QSize(width + metrics.averageCharWidth() + margins.left() + margins.right(),
+                     metrics.height() + margins.top() + margins.bottom())
     
     def check_password(self):
         """Check if the entered password is correct."""
@@ -240,20 +466,127 @@ class LockScreen(QWidget):
             self.unlock_screen()
             return
 
+        # Ignore repeated Enter presses while a check is in flight
+        if self.password_check is not None:
+            return
+
         entered_password = self.password_field.text()
         stored_password = self.settings.get("password", "")
 
-        # Import verify_password from utils
-        from utils import verify_password
-        
-        # Check if the password is correct
-        if (stored_password and verify_password(entered_password, stored_password)) or not stored_password:
+        if not stored_password:
+            self.unlock_screen()
+            return
+
+        # Refuse without hashing anything while backing off, or while
+        # another window is checking a password
+        limiter = self.attempt_limiter()
+        if limiter is not None and not limiter.begin_attempt():
+            wait = limiter.remaining()
+            if wait > 0:
+                self.password_field.clear()
+                self.show_attempt_wait(wait)
+            return
+
+        # Run the KDF off the GUI thread so the lock screen keeps repainting
+        self.password_field.setEnabled(False)
+        self.message_label.setText("")
+        self.password_check = PasswordCheckThread(entered_password, stored_password, self)
+        self.password_check.checked.connect(self.on_password_checked)
+        self.password_check.finished.connect(self.password_check.deleteLater)
+        self.password_check.start()
+
+    def on_password_checked(self, correct, upgraded_hash):
+        """Handle the result of a background password check."""
+        # A result queued just before teardown arrives after the check was dropped
+        if sip.isdeleted(self) or self.password_check is None:
+            return
+        # The thread is done once it has emitted; make sure it has fully exited
+        # before a possible teardown deletes it along with this window
+        self.password_check.wait()
+        self.password_check = None
+        self.password_field.setEnabled(True)
+        limiter = self.attempt_limiter()
+        wait = limiter.end_attempt(correct) if limiter is not None else 0.0
+
+        if correct:
+            if upgraded_hash:
+                # Store the password with the current algorithm and cost
+                self.settings["password"] = upgraded_hash
+                try:
+                    save_settings(self.settings)
+                except Exception as e:
+                    print(f"Error saving upgraded password hash: {e}")
             self.unlock_screen()
         else:
             self.message_label.setText("Incorrect password")
             self.password_field.clear()
-            self.password_field.setFocus()  # Keep focus on password field after failed attempt
+            if wait > 0:
+                self.show_attempt_wait(wait)
+            else:
+                self.password_field.setFocus()  # Keep focus on password field after failed attempt
+
+    def attempt_limiter(self):
+        """Return the limiter shared by every lock window, if this window has a locker."""
+        return self.parent_locker.attempts if self.parent_locker else None
+
+    def show_attempt_wait(self, wait):
+        """Disable the password field until another attempt is allowed in wait seconds."""
+        limiter = self.attempt_limiter()
+        reason = "Too many failed attempts" if limiter and limiter.locked_out() else "Incorrect password"
+        self.message_label.setText(f"{reason}. Try again in {format_wait(wait)}.")
+        self.password_field.setEnabled(False)
+        QTimer.singleShot(int(wait * 1000) + 1, self.end_attempt_wait)
+
+    def end_attempt_wait(self):
+        if sip.isdeleted(self) or not hasattr(self, "password_field"):
+            return
+        limiter = self.attempt_limiter()
+        if limiter is not None and limiter.remaining() > 0:
+            # Another window's failure extended the wait
+            self.show_attempt_wait(limiter.remaining())
+            return
+        self.message_label.setText("")
+        self.password_field.setEnabled(True)
+        self.password_field.setFocus()
     
+    def held_pixmaps(self):
+        """Return the pixmaps this window keeps alive."""
+        pixmaps = []
+        for brush in (self.palette().brush(QPalette.Window), self.background_brush):
+            if brush is not None and brush.style() == Qt.TexturePattern:
+                pixmaps.append(brush.texture())
+        if self.avatar_pixmap is not None:
+            pixmaps.append(self.avatar_pixmap)
+        return pixmaps
+
+    def teardown(self):
+        """Stop timers, drop references and schedule the window for deletion."""
+        if hasattr(self, "clock_label") and self.parent_locker:
+            self.parent_locker.clock.tick.disconnect(self.set_clock_text)
+            self.parent_locker.clock.date_changed.disconnect(self.set_date_text)
+        if self.password_check is not None:
+            self.password_check.checked.disconnect(self.on_password_checked)
+            self.password_check.wait()
+            self.password_check = None
+            # Its result was disconnected above, so it never counts as a failure
+            if self.parent_locker:
+                self.parent_locker.attempts.cancel_attempt()
+        self.removeEventFilter(self)
+        self.parent_locker = None
+
+        # Release the background and avatar pixmaps now rather than at deletion
+        palette = self.palette()
+        palette.setBrush(QPalette.Window, QBrush(QColor("#000000")))
+        self.setPalette(palette)
+        self.avatar_pixmap = None
+        self.pending_assets = set()
+        self.background_brush = None
+        self.frame_pixmap = None
+        self.static_widgets = []
+
+        self.close()
+        self.deleteLater()
+
     def unlock_screen(self):
         # Unlock the screen
         if self.parent_locker:
@@ -288,78 +621,1039 @@ class LockScreen(QWidget):
         self.setup_background()
         super().resizeEvent(event)
 
+    def move_to(self, screen_geometry):
+        """Cover a different monitor; the background is only re-scaled if the size changed."""
+        self.screen_geometry = screen_geometry
+        self.setGeometry(screen_geometry)
+
+    def reset(self):
+        """Clear any state left over from a previous lock so the window can be reused."""
+        if hasattr(self, "password_field"):
+            self.password_field.clear()
+            self.message_label.setText("")
+            self.password_field.setEnabled(True)
+            limiter = self.attempt_limiter()
+            if limiter is not None and limiter.remaining() > 0:
+                self.show_attempt_wait(limiter.remaining())
+        self.update_clock()
+
     def showEvent(self, event):
         """Handle window show event."""
         super().showEvent(event)
+        # Compose after the first paint so it doesn't delay locking
+        QTimer.singleShot(0, self.compose_static_layers)
         # Set focus to password field when window is shown
         if hasattr(self, "password_field"):
             self.password_field.setFocus()
 
+class ClockService(QObject):
+    """Single clock tick shared by every lock window.
+
+    The time is formatted once per tick and only broadcast when the text
+    changes. Ticks are aligned to the wall-clock second (or minute, when
+    seconds aren't displayed) so all monitors flip together.
+
+    The power monitor can throttle the clock to minute resolution or
+    suspend it outright; ticks skipped that way are counted in
+    ``avoided_wakeups``.
+    """
+    tick = pyqtSignal(str)
+    date_changed = pyqtSignal(str)
+
+    # Settings date_format values mapped to strftime formats
+    DATE_FORMATS = {
+        "MM/DD/YYYY": "%m/%d/%Y",
+        "DD/MM/YYYY": "%d/%m/%Y",
+        "YYYY-MM-DD": "%Y-%m-%d",
+    }
+
+    # Fire slightly after the boundary so strftime sees the new second (ms)
+    BOUNDARY_SLACK = 5
+
+    def __init__(self, settings, now=datetime.now, clock=time.monotonic):
+        super().__init__()
+        self.now = now
+        self.clock = clock
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.update)
+        self.text = None
+        self.date_text = None
+        self.ticks = 0
+        self.broadcasts = 0
+
+        # Low-power state
+        self.running = False  # Between start() and stop(), even while suspended
+        self.suspended = False
+        self.throttled = False
+        self.saving_since = None
+        self.saving_ticks = 0
+        self.avoided_wakeups = 0
+        self.configure(settings)
+
+    @staticmethod
+    def time_format(settings):
+        """Return the strftime format for the clock settings."""
+        # Format based on settings
+        time_format = "%H:%M" if settings.get("clock_24h", False) else "%I:%M"
+        if settings.get("clock_show_seconds", True):
+            time_format += ":%S"
+        if not settings.get("clock_24h", False):
+            time_format += " %p"
+        return time_format
+
+    @classmethod
+    def date_format(cls, settings):
+        return cls.DATE_FORMATS.get(settings.get("date_format"), "%m/%d/%Y")
+
+    def configure(self, settings):
+        """Pick up changed clock settings."""
+        self.account_savings()
+        self.settings = settings
+        self.seconds_wanted = "%S" in self.time_format(settings)
+        if self.throttled:
+            settings = dict(settings, clock_show_seconds=False)
+        self.format = self.time_format(settings)
+        self.date_fmt = self.date_format(settings)
+        self.show_seconds = "%S" in self.format
+        self.text = None
+        self.date_text = None
+        if self.timer.isActive():
+            self.update()
+
+    def current_text(self):
+        return self.now().strftime(self.format)
+
+    def start(self):
+        self.running = True
+        self.account_savings()
+        if not self.suspended:
+            self.update()
+
+    def stop(self):
+        self.timer.stop()
+        self.running = False
+        self.account_savings()
+
+    def throttle(self, enabled):
+        """Switch to minute resolution (or back), e.g. while on battery."""
+        if enabled != self.throttled:
+            self.throttled = enabled
+            self.configure(self.settings)
+
+    def suspend(self):
+        """Stop ticking altogether, e.g. while the displays are off."""
+        if not self.suspended:
+            self.suspended = True
+            self.timer.stop()
+            self.account_savings()
+
+    def resume(self):
+        """Tick again straight away after suspend()."""
+        if self.suspended:
+            self.suspended = False
+            self.account_savings()
+            if self.running:
+                self.update()
+
+    def account_savings(self):
+        """Count the ticks skipped since the last state change, and restart the count."""
+        now = self.clock()
+        if self.saving_since is not None:
+            period = 1.0 if self.seconds_wanted else 60.0
+            expected = int((now - self.saving_since) / period)
+            self.avoided_wakeups += max(0, expected - (self.ticks - self.saving_ticks))
+            self.saving_since = None
+        if self.running and (self.suspended or self.throttled):
+            self.saving_since = now
+            self.saving_ticks = self.ticks
+
+    def is_active(self):
+        return self.timer.isActive()
+
+    def update(self):
+        """Format the time once and broadcast it if it changed."""
+        now = self.now()
+        text = now.strftime(self.format)
+        self.ticks += 1
+        if text != self.text:
+            self.text = text
+            self.broadcasts += 1
+            self.tick.emit(text)
+        date_text = now.strftime(self.date_fmt)
+        if date_text != self.date_text:
+            self.date_text = date_text
+            self.date_changed.emit(date_text)
+        self.schedule(now)
+
+    def schedule(self, now):
+        """Arm the timer for the next second or minute boundary."""
+        delay = 1000 - now.microsecond // 1000
+        if not self.show_seconds:
+            delay += (59 - now.second) * 1000
+        self.timer.start(delay + self.BOUNDARY_SLACK)
+
+class PowerMonitor(QObject):
+    """Moves the lock screen into low-power modes while locked.
+
+    The power provider is sampled on a coarse timer only while locked. With
+    the displays off the monitor switches to SUSPENDED and listens for input
+    application-wide, so any key press or mouse movement wakes the lock
+    screen immediately rather than at the next sample.
+    """
+    NORMAL = "normal"
+    THROTTLED = "throttled"  # On battery: minute-resolution clock
+    SUSPENDED = "suspended"  # Displays off: no clock updates or animations
+
+    mode_changed = pyqtSignal(str)
+
+    # Seconds between power samples; input wakes us sooner while suspended
+    POLL_INTERVAL = 5.0
+    SUSPENDED_POLL_INTERVAL = 30.0
+    # Seconds to stay awake after input while the displays come back on
+    INPUT_GRACE = 10.0
+
+    INPUT_EVENTS = (QEvent.KeyPress, QEvent.MouseButtonPress, QEvent.MouseMove,
+                    QEvent.Wheel, QEvent.TouchBegin)
+
+    def __init__(self, settings, provider=None, clock=time.monotonic):
+        super().__init__()
+        self.provider = provider  # None selects the platform backend on first use
+        self.clock = clock
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.timeout.connect(self.sample)
+
+        self.mode = self.NORMAL
+        self.battery = False
+        self.awake_until = 0.0
+        self.mode_since = None
+        self.mode_seconds = {self.NORMAL: 0.0, self.THROTTLED: 0.0, self.SUSPENDED: 0.0}
+        self.samples = 0
+        self.input_wakes = 0
+        self.requested = False  # Between start() and stop(), whether or not enabled
+        self.configure(settings)
+
+    def configure(self, settings):
+        """Pick up changed low-power settings, starting or stopping sampling if started."""
+        self.enabled = settings.get("low_power_mode", True)
+        self.throttle_on_battery = settings.get("low_power_on_battery", True)
+        if not self.requested:
+            return
+        if not self.enabled:
+            self.end_sampling()
+        elif self.is_active():
+            self.sample()
+        else:
+            self.begin_sampling()
+
+    def start(self):
+        """Start sampling the power status, e.g. when the screen locks."""
+        self.requested = True
+        if self.enabled and not self.is_active():
+            self.begin_sampling()
+
+    def stop(self):
+        """Stop sampling and drop back to normal mode."""
+        self.requested = False
+        self.end_sampling()
+
+    def begin_sampling(self):
+        self.mode_since = self.clock()
+        self.timer.start(int(self.POLL_INTERVAL * 1000))
+        self.sample()
+
+    def end_sampling(self):
+        self.timer.stop()
+        self.set_mode(self.NORMAL)
+        if self.mode_since is not None:
+            self.mode_seconds[self.mode] += self.clock() - self.mode_since
+            self.mode_since = None
+
+    def is_active(self):
+        return self.timer.isActive()
+
+    def sample(self):
+        """Read the power status and switch mode to match."""
+        self.samples += 1
+        if self.provider is None:
+            self.provider = get_power_provider()
+        try:
+            blanked = self.provider.displays_off()
+            self.battery = self.provider.on_battery()
+        except Exception as e:
+            print(f"Error reading power status: {e}")
+            blanked = False
+
+        if blanked and self.clock() >= self.awake_until:
+            self.set_mode(self.SUSPENDED)
+        else:
+            self.set_mode(self.awake_mode())
+
+    def awake_mode(self):
+        return self.THROTTLED if self.battery and self.throttle_on_battery else self.NORMAL
+
+    def set_mode(self, mode):
+        if mode == self.mode:
+            return
+        now = self.clock()
+        if self.mode_since is not None:
+            self.mode_seconds[self.mode] += now - self.mode_since
+            self.mode_since = now
+
+        # Only watch every input event while there is something to wake
+        app = QApplication.instance()
+        if mode == self.SUSPENDED:
+            app.installEventFilter(self)
+            self.timer.setInterval(int(self.SUSPENDED_POLL_INTERVAL * 1000))
+        elif self.mode == self.SUSPENDED:
+            app.removeEventFilter(self)
+            self.timer.setInterval(int(self.POLL_INTERVAL * 1000))
+
+        self.mode = mode
+        self.mode_changed.emit(mode)
+
+    def wake(self):
+        """Leave suspended mode immediately, without reading the provider."""
+        if self.mode == self.SUSPENDED:
+            self.input_wakes += 1
+            self.awake_until = self.clock() + self.INPUT_GRACE
+            self.set_mode(self.awake_mode())
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.INPUT_EVENTS:
+            self.wake()
+        return False
+
+    def stats(self):
+        """Return time spent in each mode and sampling counters."""
+        seconds = dict(self.mode_seconds)
+        if self.mode_since is not None:
+            seconds[self.mode] += self.clock() - self.mode_since
+        return {
+            "mode": self.mode,
+            "provider": self.provider.name if self.provider else None,
+            "samples": self.samples,
+            "input_wakes": self.input_wakes,
+            "mode_seconds": seconds,
+        }
+
+class ScreenTopologyWatcher(QObject):
+    """Reports monitor hotplug and resolution changes as one settled signal.
+
+    A single hotplug usually fires several screen added/removed and
+    geometry changed signals, so they are coalesced over a short delay.
+    """
+    changed = pyqtSignal()
+
+    # Wait for the burst of screen signals to settle (ms)
+    SETTLE_DELAY = 100
+
+    def __init__(self, app=None):
+        super().__init__()
+        self.app = app or QApplication.instance()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.changed)
+        self.events = 0
+
+        self.app.screenAdded.connect(self.on_screen_added)
+        self.app.screenRemoved.connect(self.schedule)
+        for screen in self.app.screens():
+            screen.geometryChanged.connect(self.schedule)
+
+    def on_screen_added(self, screen):
+        screen.geometryChanged.connect(self.schedule)
+        self.schedule()
+
+    def schedule(self, *args):
+        self.events += 1
+        self.timer.start(self.SETTLE_DELAY)
+
+class IdleScheduler(QObject):
+    """Adaptive idle checker that sleeps until the timeout could next expire.
+
+    Instead of polling on a fixed interval, each sample schedules the next
+    one for ``timeout - idle_time`` seconds later, the earliest moment the
+    user could have been idle long enough to lock.
+    """
+    # Never sample more often than this, even right at the threshold (seconds)
+    MIN_INTERVAL = 1.0
+
+    def __init__(self, timeout, on_idle, idle_source=get_idle_time, clock=time.monotonic):
+        super().__init__()
+        self.timeout = timeout  # Seconds
+        self.on_idle = on_idle
+        self.idle_source = idle_source
+        self.clock = clock
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.timeout.connect(self.check)
+
+        self.wakeups = 0
+        self.active_seconds = 0.0
+        self.started_at = None
+        self.next_delay = None
+
+    def start(self):
+        """Start (or resume) idle sampling."""
+        if self.started_at is None:
+            self.started_at = self.clock()
+        self.check()
+
+    def stop(self):
+        """Stop sampling entirely, e.g. while the screen is locked."""
+        self.timer.stop()
+        if self.started_at is not None:
+            self.active_seconds += self.clock() - self.started_at
+            self.started_at = None
+        self.next_delay = None
+
+    def is_active(self):
+        return self.started_at is not None
+
+    def check(self):
+        """Sample the idle time and either fire or schedule the next sample."""
+        self.wakeups += 1
+        idle_time = self.idle_source()
+        remaining = self.timeout - idle_time
+
+        if remaining <= 0:
+            self.stop()
+            self.on_idle()
+            return
+
+        self.schedule(max(remaining, self.MIN_INTERVAL))
+
+    def schedule(self, delay):
+        self.next_delay = delay
+        self.timer.start(int(delay * 1000))
+
+    def stats(self):
+        """Return wakeup statistics for the time spent sampling."""
+        elapsed = self.active_seconds
+        if self.started_at is not None:
+            elapsed += self.clock() - self.started_at
+        per_hour = self.wakeups * 3600.0 / elapsed if elapsed > 0 else 0.0
+        return {
+            "wakeups": self.wakeups,
+            "active_seconds": elapsed,
+            "wakeups_per_hour": per_hour,
+            "next_delay": self.next_delay,
+        }
+
 class ScreenLocker(QObject):
     """Main class to manage the screen locking functionality."""
-    def __init__(self, settings):
+    # Settings a lock window reads while laying itself out; changing one
+    # means building new windows
+    LAYOUT_KEYS = frozenset([
+        "enable_clock", "clock_icon", "show_date", "show_user_avatar", "user_avatar_path",
+        "show_username", "custom_username", "lock_icon", "enable_password", "password_icon",
+        "unlock_icon", "precompose_frame",
+    ])
+    # Settings with a cheaper route to the live windows
+    CLOCK_KEYS = frozenset(["clock_24h", "clock_show_seconds", "date_format",
+                            "clock_color", "clock_size", "clock_font"])
+    BACKGROUND_KEYS = frozenset(["bg_type", "bg_color", "bg_image", "bg_blur", "bg_opacity",
+                                 "slideshow_dir", "slideshow_interval", "slideshow_prefetch"])
+    IDLE_KEYS = frozenset(["enable_timer", "idle_timeout"])
+    POWER_KEYS = frozenset(["low_power_mode", "low_power_on_battery"])
+    ATTEMPT_KEYS = frozenset(["max_attempts", "failed_attempts", "lockout_duration"])
+
+    def __init__(self, settings, screen_geometries=fullscreen_on_all_monitors, power_provider=None,
+                 screen_ratio=screen_pixel_ratio, attempt_limiter=None):
         super().__init__()
         
         self.settings = settings
+        # Copy of the settings last applied; callers update the settings dict in place
+        self.applied_settings = copy.deepcopy(settings)
+        self.last_settings_update = None
+        self.screen_geometries = screen_geometries  # Callable returning one QRect per monitor
+        self.screen_ratio = screen_ratio  # Callable returning a monitor's device pixel ratio
         self.lock_screens = []
         self.is_locked = False
-        
+
+        # One clock tick for all monitors, running only while locked
+        self.clock = ClockService(self.settings)
+
+        # Throttles the clock while locked with the displays off or on battery
+        self.power = PowerMonitor(self.settings, power_provider)
+        self.power.mode_changed.connect(self.on_power_mode)
+
+        # Failed unlock attempts, counted across every window and restart
+        self.attempts = attempt_limiter or AttemptLimiter(self.settings)
+
+        # Background slideshow, decoding ahead on a worker thread while locked
+        self.slideshow = Slideshow()
+        self.slideshow.frame_changed.connect(self.on_slideshow_frame)
+        self.slideshow.stalled.connect(self.on_slideshow_stalled)
+
+        # Follow monitors being plugged, unplugged or reconfigured
+        self.topology = ScreenTopologyWatcher()
+        self.topology.changed.connect(self.on_screens_changed)
+        self.last_topology_change = None
+
+        # Pre-warmed windows, reused across locks when "prewarm_windows" is on
+        self.warm_screens = []
+        self.warm_signature = None
+        self.last_lock_latency = None  # Seconds from trigger to all windows visible
+
+        # Scales backgrounds and avatars for each monitor ahead of a lock
+        self.asset_preparer = None
+
+        # Assets still missing at lock time are prepared in parallel and
+        # swapped into the already-covering windows as each one finishes
+        self.asset_pool = AssetPool()
+        self.asset_pool.done.connect(self.on_asset_ready)
+        self.lock_generation = 0  # Results from an earlier lock are ignored
+        self.asset_waiters = {}  # Job key -> [(window, asset name)]
+        self.pending_blurs = {}  # Job key -> (geometry, blur, grab_ms)
+        self.pending_timings = {}  # Window -> (its lock_timings entry, trigger time) until its final frame
+        self.lock_timings = []  # Per screen: geometry, time to cover and time to final frame (ms)
+
         # Set up the idle timer if enabled
         self.setup_idle_timer()
+
+        # Build the hidden windows once the event loop is running
+        if self.settings.get("prewarm_windows", False):
+            QTimer.singleShot(0, self.prewarm)
+        else:
+            QTimer.singleShot(0, self.prepare_assets)
     
     def setup_idle_timer(self):
-        # Set up the idle timer for automatic locking
+        # Set up the idle scheduler for automatic locking
         if self.settings.get("enable_timer", False):
-            # Create and start the idle check timer
-            self.idle_timer = QTimer()
-            self.idle_timer.timeout.connect(self.check_idle_time)
-            self.idle_timer.start(10000)  # Check every 10 seconds
+            idle_timeout = self.settings.get("idle_timeout", 5) * 60  # Convert minutes to seconds
+            self.idle_scheduler = IdleScheduler(idle_timeout, self.check_idle_time)
+            if not self.is_locked:
+                self.idle_scheduler.start()
     
     def check_idle_time(self):
-        # Check if the system has been idle for the timeout period
+        # Called by the idle scheduler once the timeout has been reached
         if not self.is_locked:
-            idle_time = get_idle_time()
-            idle_timeout = self.settings.get("idle_timeout", 5) * 60  # Convert minutes to seconds
-            
-            if idle_time >= idle_timeout:
-                self.lock_screen()
+            self.lock_screen()
     
     def unlock_screen(self):
         """Unlock the screen."""
         if self.is_locked:
             self.is_locked = False
+
+            # Resume idle sampling from scratch
+            if hasattr(self, "idle_scheduler"):
+                self.idle_scheduler.start()
             
-            # Close all lock screens
+            # Tear down all lock screens, or just hide them if they are kept warm
             for screen in self.lock_screens:
-                screen.close()
+                if screen in self.warm_screens:
+                    screen.hide()
+                else:
+                    screen.teardown()
             
             # Clear the list of lock screens
             self.lock_screens.clear()  # Use clear() instead of reassignment
+
+            # Drop lock-time jobs still in flight
+            self.lock_generation += 1
+            self.asset_waiters = {}
+            self.pending_blurs = {}
+            self.pending_timings = {}
+
+            self.clock.stop()
+            self.power.stop()
+            self.slideshow.stop()
     
-    def lock_screen(self):
-        # Lock the screen
+    def lock_screen(self, triggered_at=None):
+        """Lock the screen.
+
+        Args:
+            triggered_at (float): time.perf_counter() value of the triggering
+                event, used to measure lock latency. Defaults to now.
+        """
+        # Signals such as QAction.triggered may pass a bool here
+        if not isinstance(triggered_at, float):
+            triggered_at = time.perf_counter()
+
         if not self.is_locked:
             self.is_locked = True
+
+            # Nothing to detect while locked
+            if hasattr(self, "idle_scheduler"):
+                self.idle_scheduler.stop()
+
+            # Don't keep derived encryption keys around while away
+            keyring.wipe()
             
             # Create a lock screen for each monitor
-            geometries = fullscreen_on_all_monitors()
-            
+            geometries = self.screen_geometries()
+
+            prewarmed = self.settings.get("prewarm_windows", False)
+            async_lock = self.settings.get("async_lock", True) and not prewarmed
+            self.lock_generation += 1
+            self.lock_timings = []
+
+            # Snapshot the desktop before any lock window covers it; when
+            # covering first, the blur runs on the asset pool afterwards
+            bg_type = self.settings.get("bg_type")
+            grabbed = []
+            if bg_type == "Blur Current Desktop":
+                if async_lock:
+                    grabbed = desktop_blur.grab_stale(geometries, self.settings)
+                else:
+                    desktop_blur.refresh(geometries, self.settings)
+            self.update_slideshow(geometries)
+
+            if async_lock:
+                self.cover_screens(geometries, grabbed, triggered_at)
+            elif prewarmed:
+                # Reuse the hidden windows, rebuilding only if something changed
+                if not self.warm_screens_valid(geometries):
+                    self.prewarm(geometries)
+                for lock_screen in self.warm_screens:
+                    if bg_type in ("Blur Current Desktop", "Slideshow"):
+                        lock_screen.setup_background()
+                    lock_screen.reset()
+                    lock_screen.show()
+                    lock_screen.raise_()
+                    lock_screen.activateWindow()
+                    self.lock_screens.append(lock_screen)
+                    self.record_cover(lock_screen, triggered_at, final=True)
+            else:
+                for geometry in geometries:
+                    lock_screen = LockScreen(self.settings, self, geometry)  # Pass self as parent
+                    lock_screen.show()
+                    self.lock_screens.append(lock_screen)
+                    self.record_cover(lock_screen, triggered_at, final=True)
+
+            self.last_lock_latency = time.perf_counter() - triggered_at
+
+            if self.settings.get("enable_clock", True):
+                self.clock.start()
+            self.power.start()
+
+    def cover_screens(self, geometries, grabbed, triggered_at):
+        """Put a lock window on every monitor in one pass, leaving slow assets for later.
+
+        A window whose background or avatar isn't ready yet covers its
+        monitor with plain colour (and an empty avatar circle) instead. The
+        missing assets are prepared in parallel on the asset pool, and
+        on_asset_ready() swaps each one into the windows waiting for it.
+        """
+        grabbed = {self.geometry_key(geometry): (geometry, image, grab_ms)
+                   for geometry, image, grab_ms in grabbed}
+        jobs = {}
+        for geometry in geometries:
+            missing = self.missing_assets(geometry, grabbed, jobs)
+            lock_screen = LockScreen(self.settings, self, geometry, pending_assets=missing)
+            lock_screen.show()
+            self.lock_screens.append(lock_screen)
+            self.record_cover(lock_screen, triggered_at, final=not missing)
+            for asset, key in missing.items():
+                self.asset_waiters.setdefault(key, []).append((lock_screen, asset))
+
+        for key, (func, args) in jobs.items():
+            self.asset_pool.submit(key, func, *args)
+
+    def missing_assets(self, geometry, grabbed, jobs):
+        """Return {asset name: job key} for the assets of geometry's window that aren't ready.
+
+        Jobs to prepare them are added to jobs (key -> (function, args));
+        monitors needing the same variant share one job.
+        """
+        missing = {}
+        generation = self.lock_generation
+        dpr = self.screen_ratio(geometry)
+        size = (geometry.width(), geometry.height())
+        bg_type = self.settings.get("bg_type")
+        bg_image = self.settings.get("bg_image", "")
+
+        if bg_type == "Blur Current Desktop":
+            key = (generation, "blur") + self.geometry_key(geometry)
+            if key[2:] in grabbed:
+                _, image, grab_ms = grabbed[key[2:]]
+                blur = self.settings.get("bg_blur", 5)
+                self.pending_blurs[key] = (geometry, blur, grab_ms)
+                jobs[key] = (blur_snapshot, (image, blur, desktop_blur.budget))
+                missing["background"] = key
+        elif bg_type == "Slideshow":
+            # The slideshow's own decoder thread delivers the first frame, if one can come
+            if self.slideshow.frame_expected() and self.slideshow.current_pixmap(size, dpr) is None:
+                missing["background"] = (generation, "slideshow")
+        elif bg_image and not background_cache.has_variant(bg_image, size, dpr):
+            key = (generation, "scale", bg_image, size, dpr, False)
+            jobs[key] = (background_cache.prepare, key[2:])
+            missing["background"] = key
+
+        avatar_path = self.settings.get("user_avatar_path", "")
+        avatar_size = (LockScreen.AVATAR_SIZE.width(), LockScreen.AVATAR_SIZE.height())
+        if (self.settings.get("show_user_avatar", True) and avatar_path and os.path.exists(avatar_path)
+                and not background_cache.has_variant(avatar_path, avatar_size, dpr, True)):
+            key = (generation, "scale", avatar_path, avatar_size, dpr, True)
+            jobs[key] = (background_cache.prepare, key[2:])
+            missing["avatar"] = key
+        return missing
+
+    def geometry_key(self, geometry):
+        return (geometry.x(), geometry.y(), geometry.width(), geometry.height())
+
+    def on_asset_ready(self, key, result):
+        """Swap a finished lock-time asset into the windows waiting for it."""
+        if key[0] != self.lock_generation:
+            return  # From a lock that has since ended
+        if key[1] == "blur":
+            geometry, blur, grab_ms = self.pending_blurs.pop(key)
+            if result is not None:
+                small, info, source = result
+                desktop_blur.store(geometry, blur, small, info, grab_ms, source)
+        self.finish_waiters(key)
+
+    def finish_waiters(self, key):
+        for lock_screen, asset in self.asset_waiters.pop(key, []):
+            if lock_screen not in self.lock_screens:
+                continue  # Replaced after a settings or monitor change
+            lock_screen.finish_asset(asset)
+            if not lock_screen.pending_assets and lock_screen in self.pending_timings:
+                timing, triggered_at = self.pending_timings.pop(lock_screen)
+                timing["final_ms"] = (time.perf_counter() - triggered_at) * 1e3
+
+    def record_cover(self, lock_screen, triggered_at, final=False):
+        """Note when lock_screen covered its monitor, and its final frame if it has one."""
+        elapsed_ms = (time.perf_counter() - triggered_at) * 1e3
+        geometry = lock_screen.screen_geometry or lock_screen.geometry()
+        timing = {"screen": list(self.geometry_key(geometry)), "cover_ms": elapsed_ms,
+                  "final_ms": elapsed_ms if final else None}
+        self.lock_timings.append(timing)
+        if not final:
+            self.pending_timings[lock_screen] = (timing, triggered_at)
+
+    def on_power_mode(self, mode):
+        """Throttle or suspend the shared clock to match the power mode."""
+        if mode == PowerMonitor.SUSPENDED:
+            self.clock.suspend()
+        else:
+            self.clock.throttle(mode == PowerMonitor.THROTTLED)
+            self.clock.resume()
+
+        # Slideshow transitions are only worth their decode cost at full power
+        if mode == PowerMonitor.NORMAL:
+            self.slideshow.resume()
+        else:
+            self.slideshow.pause()
+
+    def update_slideshow(self, geometries=None):
+        """Run the slideshow while locked with a slideshow background, else stop it."""
+        if self.is_locked and self.settings.get("bg_type") == "Slideshow":
+            self.slideshow.start(self.settings, geometries or self.screen_geometries(), self.screen_ratio)
+        else:
+            self.slideshow.stop()
+
+    def on_slideshow_frame(self):
+        key = (self.lock_generation, "slideshow")
+        waiting = [lock_screen for lock_screen, _ in self.asset_waiters.get(key, [])]
+        self.finish_waiters(key)
+        for lock_screen in self.lock_screens:
+            if lock_screen not in waiting:
+                lock_screen.setup_background()
+
+    def on_slideshow_stalled(self):
+        # No frame is coming for now; windows keep their colour until one does
+        self.finish_waiters((self.lock_generation, "slideshow"))
+
+    def power_stats(self):
+        """Return low-power counters, including the clock wakeups avoided."""
+        stats = self.power.stats()
+        stats["avoided_wakeups"] = self.clock.avoided_wakeups
+        return stats
+
+    def on_screens_changed(self):
+        """Cover a changed monitor layout without dropping the lock."""
+        geometries = self.screen_geometries()
+        if self.is_locked:
+            self.sync_lock_screens(geometries)
+        elif self.settings.get("prewarm_windows", False):
+            self.prewarm(geometries)
+        else:
+            self.prepare_assets(geometries)
+
+    def sync_lock_screens(self, geometries):
+        """Match the lock windows to geometries, touching only the affected windows.
+
+        Windows whose monitor is unchanged are left alone, windows whose
+        monitor went away are moved to a new one if there is one, and only
+        then are windows created or destroyed. Returns the counts.
+        """
+        def key(geometry):
+            return (geometry.x(), geometry.y(), geometry.width(), geometry.height())
+
+        # The slideshow pre-scales for each monitor size
+        self.update_slideshow(geometries)
+
+        unmatched = list(geometries)
+        spare = []
+        for screen in self.lock_screens:
+            current = key(screen.screen_geometry) if screen.screen_geometry else None
+            for i, geometry in enumerate(unmatched):
+                if key(geometry) == current:
+                    del unmatched[i]
+                    break
+            else:
+                spare.append(screen)
+
+        moved = created = 0
+        for geometry in unmatched:
+            if spare:
+                # Prefer a window of the same size, which needs no re-scale or relayout
+                screen = next((s for s in spare if s.size() == geometry.size()), spare[0])
+                spare.remove(screen)
+                screen.move_to(geometry)
+                moved += 1
+            else:
+                screen = LockScreen(self.settings, self, geometry)
+                screen.show()
+                screen.raise_()
+                self.lock_screens.append(screen)
+                created += 1
+
+        for screen in spare:
+            self.lock_screens.remove(screen)
+            screen.teardown()
+
+        if spare and self.lock_screens:
+            self.lock_screens[0].activateWindow()
+
+        if self.settings.get("prewarm_windows", False):
+            self.warm_screens = list(self.lock_screens)
+            self.warm_signature = self.settings_signature(geometries)
+
+        self.last_topology_change = {
+            "screens": len(self.lock_screens),
+            "created": created,
+            "moved": moved,
+            "removed": len(spare),
+        }
+        return self.last_topology_change
+
+    def settings_signature(self, geometries):
+        """Return a value that changes whenever the warm windows would need rebuilding."""
+        layout = [(g.x(), g.y(), g.width(), g.height(), self.screen_ratio(g)) for g in geometries]
+        return json.dumps([self.settings, layout], sort_keys=True, default=str)
+
+    def warm_screens_valid(self, geometries):
+        """Check whether the pre-warmed windows match the current settings and screens."""
+        return bool(self.warm_screens) and self.warm_signature == self.settings_signature(geometries)
+
+    def prewarm(self, geometries=None):
+        """Build one hidden lock window per monitor so locking is just a show."""
+        if geometries is None:
+            geometries = self.screen_geometries()
+        if self.warm_screens_valid(geometries):
+            return
+
+        self.discard_warm_screens()
+        for geometry in geometries:
+            lock_screen = LockScreen(self.settings, self, geometry)
+            # Force layout and polish now rather than on first show
+            lock_screen.ensurePolished()
+            lock_screen.layout().activate()
+            self.warm_screens.append(lock_screen)
+        self.warm_signature = self.settings_signature(geometries)
+
+    def asset_jobs(self, geometries):
+        """Return the (path, size, ratio, fit) variants a lock on geometries would use."""
+        jobs = []
+        bg_image = self.settings.get("bg_image", "")
+        if bg_image and self.settings.get("bg_type") not in ("Blur Current Desktop", "Slideshow"):
             for geometry in geometries:
-                lock_screen = LockScreen(self.settings, self, geometry)  # Pass self as parent
-                lock_screen.show()
-                self.lock_screens.append(lock_screen)
-    
+                jobs.append((bg_image, geometry.size(), self.screen_ratio(geometry), False))
+        avatar_path = self.settings.get("user_avatar_path", "")
+        if avatar_path and self.settings.get("show_user_avatar", True):
+            for dpr in sorted({self.screen_ratio(geometry) for geometry in geometries}):
+                jobs.append((avatar_path, LockScreen.AVATAR_SIZE, dpr, True))
+        # Monitors of the same size and ratio share a variant
+        unique = []
+        for job in jobs:
+            if job not in unique:
+                unique.append(job)
+        return unique
+
+    def prepare_assets(self, geometries=None):
+        """Scale the background and avatar for every monitor on a worker thread.
+
+        Runs while unlocked, so the next lock finds them in background_cache.
+        Returns the number of variants queued.
+        """
+        if geometries is None:
+            geometries = self.screen_geometries()
+        jobs = [job for job in self.asset_jobs(geometries)
+                if not background_cache.has_variant(*job)]
+        if not jobs:
+            return 0
+        self.stop_asset_preparer()
+        self.asset_preparer = AssetPreparer(jobs)
+        self.asset_preparer.start(QThread.LowPriority)
+        return len(jobs)
+
+    def stop_asset_preparer(self):
+        if self.asset_preparer is not None:
+            self.asset_preparer.stop()
+            self.asset_preparer = None
+
+    def discard_warm_screens(self):
+        """Throw away the pre-warmed windows that are not currently on screen."""
+        for screen in self.warm_screens:
+            if screen not in self.lock_screens:
+                screen.teardown()
+        self.warm_screens = []
+        self.warm_signature = None
+
+    def diagnostics(self):
+        """Report live lock windows, timers and pixmaps, for soak tests.
+
+        Windows that have been torn down but not yet deleted by the event
+        loop are not counted.
+        """
+        live = [screen for screen in LockScreen.instances if not sip.isdeleted(screen)]
+
+        timers = [timer for screen in live for timer in screen.findChildren(QTimer)]
+        timers.append(self.clock.timer)
+        timers.append(self.power.timer)
+        timers.append(self.topology.timer)
+        timers.append(self.slideshow.timer)
+        if hasattr(self, "idle_scheduler"):
+            timers.append(self.idle_scheduler.timer)
+
+        # The same pixmap can be shared by several windows; count it once
+        pixmaps = {}
+        for screen in live:
+            for pixmap in screen.held_pixmaps():
+                pixmaps[pixmap.cacheKey()] = pixmap
+
+        return {
+            "lock_screens": len(live),
+            "visible_lock_screens": sum(1 for screen in live if screen.isVisible()),
+            "warm_screens": len(self.warm_screens),
+            "timers": len(timers),
+            "active_timers": sum(1 for timer in timers if timer.isActive()),
+            "pixmaps": len(pixmaps),
+            "pixmap_bytes": sum(pixmap_bytes(pixmap) for pixmap in pixmaps.values()),
+            "background_cache": background_cache.stats(),
+            "desktop_blur": desktop_blur.stats(),
+            "frame_cache": frame_cache.stats(),
+            "asset_pool": self.asset_pool.stats(),
+            "lock_timings": self.lock_timings,
+            "slideshow": self.slideshow.stats(),
+            "power": self.power_stats(),
+            "attempts": self.attempts.state(),
+        }
+
     def apply_settings(self, new_settings):
-        # Apply new settings
+        """Apply changed settings with the smallest update that covers each change.
+
+        The lock is never dropped: clock restyles and background swaps are
+        applied to the live windows in place, and layout changes build the
+        replacement windows before the old ones are torn down. Returns the
+        names of the updates made.
+        """
+        old_settings = self.applied_settings
+        changed = {key for key in set(old_settings) | set(new_settings)
+                   if old_settings.get(key) != new_settings.get(key)}
         self.settings = new_settings
-        
-        # Update idle timer
-        if hasattr(self, "idle_timer"):
-            self.idle_timer.stop()
-            
-        self.setup_idle_timer()
-        
-        # Update lock screens if currently locked
+        self.applied_settings = copy.deepcopy(new_settings)
+        updates = set()
+
+        if changed & self.CLOCK_KEYS:
+            self.clock.configure(new_settings)
+            updates.add("clock")
+        if changed & self.POWER_KEYS:
+            self.power.configure(new_settings)
+            updates.add("power")
+        if changed & self.ATTEMPT_KEYS:
+            self.attempts.configure(new_settings)
+            updates.add("attempts")
+        if changed & self.IDLE_KEYS:
+            # Update idle scheduler
+            if hasattr(self, "idle_scheduler"):
+                self.idle_scheduler.stop()
+                del self.idle_scheduler
+            self.setup_idle_timer()
+            updates.add("idle")
+
+        windows = self.live_windows()
+        for window in windows:
+            window.settings = new_settings
+        if changed & self.BACKGROUND_KEYS:
+            self.update_slideshow()
+
+        if changed & self.LAYOUT_KEYS:
+            self.rebuild_lock_screens()
+            updates.add("rebuild")
+        else:
+            if changed & self.CLOCK_KEYS:
+                for window in windows:
+                    if hasattr(window, "clock_label"):
+                        window.style_clock()
+                updates.add("restyle")
+            if changed & self.BACKGROUND_KEYS:
+                for window in windows:
+                    window.setup_background()
+                updates.add("background")
+            # The warm windows have been brought up to date in place
+            if self.warm_screens and changed:
+                self.warm_signature = self.settings_signature(self.screen_geometries())
+
+        if "prewarm_windows" in changed:
+            if not self.settings.get("prewarm_windows", False):
+                self.discard_warm_screens()
+            updates.add("prewarm")
+
+        # Build the hidden windows, or just their assets, against the new settings
+        if self.settings.get("prewarm_windows", False):
+            QTimer.singleShot(0, self.prewarm)
+        elif changed & (self.BACKGROUND_KEYS | self.LAYOUT_KEYS) and not self.is_locked:
+            self.prepare_assets()
+
+        self.last_settings_update = sorted(updates)
+        return self.last_settings_update
+
+    def live_windows(self):
+        """Return every lock window, shown or pre-warmed, once each."""
+        windows = list(self.lock_screens)
+        windows.extend(screen for screen in self.warm_screens if screen not in windows)
+        return windows
+
+    def rebuild_lock_screens(self):
+        """Replace every lock window with one built from the current settings.
+
+        While locked the new windows are shown before the old ones are
+        torn down, so the desktop is never exposed.
+        """
+        old_windows = self.live_windows()
+        self.warm_screens = []
+        self.warm_signature = None
+
         if self.is_locked:
-            self.unlock_screen()
-            self.lock_screen()
\ No newline at end of file
+            geometries = self.screen_geometries()
+            self.lock_screens = []
+            for geometry in geometries:
+                lock_screen = LockScreen(self.settings, self, geometry)
+                lock_screen.show()
+                lock_screen.raise_()
+                self.lock_screens.append(lock_screen)
+            if self.lock_screens:
+                self.lock_screens[0].activateWindow()
+
+            if self.settings.get("prewarm_windows", False):
+                self.warm_screens = list(self.lock_screens)
+                self.warm_signature = self.settings_signature(geometries)
+
+            # The clock may have been switched on or off
+            if self.settings.get("enable_clock", True):
+                self.clock.start()
+            else:
+                self.clock.stop()
+
+        for window in old_windows:
+            window.teardown()
\ No newline at end of file
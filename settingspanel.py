@@ -13,35 +13,55 @@ class SettingsPanel(QDialog):
         self.settings = settings  # This is a dictionary
         self.locker = locker
 
-        # Set up the UI
+        # Set up the UI; tab contents are built the first time each tab is shown
         self.ui = SettingsPanelUI()
         self.ui.setupUI(self)
 
-        # Load settings into the UI
-        self.load_settings_to_ui()
-
         # Connect signals to slots
         self.connect_signals()
 
+        # Build and load the initially visible tab
+        self.ui.tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.ui.tabs.currentIndex())
+
+    def ensure_tab(self, index):
+        """Build a tab on first use, then wire it up and fill it from the settings."""
+        if self.ui.build_tab(index):
+            self.tab_signal_connectors[index]()
+            self.tab_loaders[index]()
+
+    @property
+    def tab_loaders(self):
+        return [self.load_general_tab, self.load_appearance_tab, self.load_security_tab, lambda: None]
+
+    @property
+    def tab_signal_connectors(self):
+        return [self.connect_general_signals, self.connect_appearance_signals,
+                self.connect_security_signals, self.connect_about_signals]
+
     def connect_signals(self):
-        """Connect UI signals to their handlers."""
+        """Connect the dialog button signals to their handlers."""
         # Main dialog buttons
         self.ui.ok_btn.clicked.connect(self.save_and_close)
         self.ui.apply_btn.clicked.connect(self.apply_settings)
         self.ui.cancel_btn.clicked.connect(self.reject)
         self.ui.restore_defaults_btn.clicked.connect(self.restore_defaults)
 
+    def connect_general_signals(self):
         # Hotkey settings
         self.ui.hotkey_edit.keyPressEvent = self.capture_hotkey
         self.ui.clear_hotkey_btn.clicked.connect(self.clear_hotkey)
 
+    def connect_appearance_signals(self):
         # Background settings
         self.ui.bg_color_btn.clicked.connect(self.choose_background_color)
         self.ui.bg_image_btn.clicked.connect(self.choose_background_image)
+        self.ui.slideshow_dir_btn.clicked.connect(self.choose_slideshow_dir)
 
         # Clock settings
         self.ui.clock_color_btn.clicked.connect(self.choose_clock_color)
 
+    def connect_security_signals(self):
         # Import/Export
         self.ui.export_settings_btn.clicked.connect(self.export_settings)
         self.ui.import_settings_btn.clicked.connect(self.import_settings)
@@ -53,12 +73,18 @@ class SettingsPanel(QDialog):
         # Configure auth
         self.ui.configure_auth_btn.clicked.connect(self.configure_auth_method)
 
+    def connect_about_signals(self):
         # About tab
         self.ui.report_bug_btn.clicked.connect(self.report_bug)
         self.ui.check_updates_btn.clicked.connect(self.check_updates)
 
     def load_settings_to_ui(self):
-        """Load settings from the dictionary into the UI."""
+        """Load settings from the dictionary into the tabs that have been built."""
+        for index, loader in enumerate(self.tab_loaders):
+            if self.ui.is_tab_built(index):
+                loader()
+
+    def load_general_tab(self):
         # General settings
         self.ui.hotkey_edit.setText(self.settings.get("hotkey", "Ctrl+Alt+L"))
         self.ui.enable_timer.setChecked(self.settings.get("enable_timer", False))
@@ -78,17 +104,21 @@ class SettingsPanel(QDialog):
         self.ui.lock_on_screensaver_checkbox.setChecked(self.settings.get("lock_on_screensaver", True))
         self.ui.autostart_checkbox.setChecked(self.settings.get("autostart", False))
 
+    def load_appearance_tab(self):
         # Appearance settings
         self.ui.bg_type.setCurrentText(self.settings.get("bg_type", "Solid Color"))
         bg_color = QColor(self.settings.get("bg_color", "#000000"))
         self.ui.bg_color_preview.setStyleSheet(f"background-color: {bg_color.name()}; border: 1px solid #3D3D3D; border-radius: 2px;")
         self.ui.bg_image_path.setText(self.settings.get("bg_image", ""))
+        self.ui.slideshow_dir.setText(self.settings.get("slideshow_dir", ""))
+        self.ui.slideshow_interval.setValue(self.settings.get("slideshow_interval", 30))
         self.ui.bg_blur_slider.setValue(self.settings.get("bg_blur", 5))
         self.ui.bg_opacity_slider.setValue(self.settings.get("bg_opacity", 100))
 
         # Clock settings
         self.ui.enable_clock.setChecked(self.settings.get("enable_clock", True))
         self.ui.clock_format.setCurrentText(self.settings.get("clock_format", "24 Hour"))
+        self.ui.clock_show_seconds.setChecked(self.settings.get("clock_show_seconds", True))
         self.ui.clock_size.setValue(self.settings.get("clock_size", 40))
         self.ui.clock_font.setCurrentText(self.settings.get("clock_font", "System Default"))
         clock_color = QColor(self.settings.get("clock_color", "#FFFFFF"))
@@ -101,6 +131,7 @@ class SettingsPanel(QDialog):
         self.ui.show_user_avatar.setChecked(self.settings.get("show_user_avatar", True))
         self.ui.show_keyboard_layout.setChecked(self.settings.get("show_keyboard_layout", False))
 
+    def load_security_tab(self):
         # Security settings
         self.ui.webcam_detection_checkbox.setChecked(self.settings.get("webcam_detection", False))
         self.ui.webcam_sensitivity_slider.setValue(self.settings.get("webcam_sensitivity", 5))
@@ -135,78 +166,95 @@ class SettingsPanel(QDialog):
         self.ui.console_output.setChecked(self.settings.get("console_output", False))
 
     def save_settings_from_ui(self):
-        """Save settings from the UI to the dictionary."""
+        """Save settings from the UI to the dictionary.
+
+        Tabs that have never been shown keep their current values.
+        """
         try:
             # Create a temporary dictionary to store new settings
             new_settings = {}
 
-            # General settings
-            new_settings["hotkey"] = self.ui.hotkey_edit.text()
-            new_settings["enable_timer"] = self.ui.enable_timer.isChecked()
-            new_settings["idle_timeout"] = self.ui.idle_timer.value()
-
-            # Password settings
-            new_settings["enable_password"] = self.ui.enable_password.isChecked()
-            
-            # Only save password if passwords match and not empty
-            if self.ui.enable_password.isChecked():
-                password = self.ui.password_edit.text()
-                confirm_password = self.ui.password_confirm.text()
-
-                if password and password == confirm_password:
-                    new_settings["password"] = hash_password(password)
-                elif password != confirm_password:
-                    QMessageBox.warning(self, "Password Mismatch", "Passwords do not match. Password not saved.")
-                    return False
-
-            # Copy all other settings from UI to the dictionary
-            new_settings.update({
-                "hot_corners": self.ui.hot_corners_checkbox.isChecked(),
-                "hot_corner_position": self.ui.hot_corners_combo.currentText(),
-                "lock_on_startup": self.ui.lock_on_startup_checkbox.isChecked(),
-                "lock_on_sleep": self.ui.lock_on_sleep_checkbox.isChecked(),
-                "lock_on_screensaver": self.ui.lock_on_screensaver_checkbox.isChecked(),
-                "autostart": self.ui.autostart_checkbox.isChecked(),
-                "bg_type": self.ui.bg_type.currentText(),
-                "bg_color": self.ui.bg_color_preview.styleSheet().split("background-color: ")[1].split(";")[0],
-                "bg_image": self.ui.bg_image_path.text(),
-                "bg_blur": self.ui.bg_blur_slider.value(),
-                "bg_opacity": self.ui.bg_opacity_slider.value(),
-                "enable_clock": self.ui.enable_clock.isChecked(),
-                "clock_format": self.ui.clock_format.currentText(),
-                "clock_size": self.ui.clock_size.value(),
-                "clock_font": self.ui.clock_font.currentText(),
-                "clock_color": self.ui.clock_color_preview.styleSheet().split("background-color: ")[1].split(";")[0],
-                "show_date": self.ui.show_date.isChecked(),
-                "date_format": self.ui.date_format.currentText(),
-                "show_unlock_button": self.ui.show_unlock_button.isChecked(),
-                "show_user_avatar": self.ui.show_user_avatar.isChecked(),
-                "show_keyboard_layout": self.ui.show_keyboard_layout.isChecked(),
-                "webcam_detection": self.ui.webcam_detection_checkbox.isChecked(),
-                "webcam_sensitivity": self.ui.webcam_sensitivity_slider.value(),
-                "webcam_timeout": self.ui.webcam_timeout.value(),
-                "failed_attempts": self.ui.failed_attempts_spinbox.value(),
-                "lockout_duration": self.ui.lockout_duration_spinbox.value(),
-                "password_expiry": self.ui.password_expiry_checkbox.isChecked(),
-                "password_expiry_days": self.ui.password_expiry_spinbox.value(),
-                "debug_mode": self.ui.debug_mode.isChecked(),
-                "console_output": self.ui.console_output.isChecked(),
-                "two_factor": self.ui.two_factor_checkbox.isChecked(),
-                "two_factor_method": self.ui.two_factor_method_combo.currentText(),
-                "two_factor_email": self.ui.two_factor_email.text()
-            })
-
-            # Set authentication method based on radio selection
-            if self.ui.auth_password_radio.isChecked():
-                new_settings["auth_method"] = "Password"
-            elif self.ui.auth_pin_radio.isChecked():
-                new_settings["auth_method"] = "PIN"
-            elif self.ui.auth_pattern_radio.isChecked():
-                new_settings["auth_method"] = "Pattern"
-            elif self.ui.auth_fingerprint_radio.isChecked():
-                new_settings["auth_method"] = "Fingerprint"
-            elif self.ui.auth_face_radio.isChecked():
-                new_settings["auth_method"] = "Face Recognition"
+            if self.ui.is_tab_built(0):
+                # General settings
+                new_settings["hotkey"] = self.ui.hotkey_edit.text()
+                new_settings["enable_timer"] = self.ui.enable_timer.isChecked()
+                new_settings["idle_timeout"] = self.ui.idle_timer.value()
+
+                # Password settings
+                new_settings["enable_password"] = self.ui.enable_password.isChecked()
+
+                # Only save password if passwords match and not empty
+                if self.ui.enable_password.isChecked():
+                    password = self.ui.password_edit.text()
+                    confirm_password = self.ui.password_confirm.text()
+
+                    # The fields hold the stored hash until the user types a new password
+                    if password and password == confirm_password and password != self.settings.get("password"):
+                        new_settings["password"] = hash_password(password)
+                    elif password != confirm_password:
+                        QMessageBox.warning(self, "Password Mismatch", "Passwords do not match. Password not saved.")
+                        return False
+
+                new_settings.update({
+                    "hot_corners": self.ui.hot_corners_checkbox.isChecked(),
+                    "hot_corner_position": self.ui.hot_corners_combo.currentText(),
+                    "lock_on_startup": self.ui.lock_on_startup_checkbox.isChecked(),
+                    "lock_on_sleep": self.ui.lock_on_sleep_checkbox.isChecked(),
+                    "lock_on_screensaver": self.ui.lock_on_screensaver_checkbox.isChecked(),
+                    "autostart": self.ui.autostart_checkbox.isChecked(),
+                })
+
+            if self.ui.is_tab_built(1):
+                new_settings.update({
+                    "bg_type": self.ui.bg_type.currentText(),
+                    "bg_color": self.ui.bg_color_preview.styleSheet().split("background-color: ")[1].split(";")[0],
+                    "bg_image": self.ui.bg_image_path.text(),
+                    "slideshow_dir": self.ui.slideshow_dir.text(),
+                    "slideshow_interval": self.ui.slideshow_interval.value(),
+                    "bg_blur": self.ui.bg_blur_slider.value(),
+                    "bg_opacity": self.ui.bg_opacity_slider.value(),
+                    "enable_clock": self.ui.enable_clock.isChecked(),
+                    "clock_format": self.ui.clock_format.currentText(),
+                    # The lock screen reads clock_24h; keep it in step with the format
+                    "clock_24h": self.ui.clock_format.currentText() == "24 Hour",
+                    "clock_show_seconds": self.ui.clock_show_seconds.isChecked(),
+                    "clock_size": self.ui.clock_size.value(),
+                    "clock_font": self.ui.clock_font.currentText(),
+                    "clock_color": self.ui.clock_color_preview.styleSheet().split("background-color: ")[1].split(";")[0],
+                    "show_date": self.ui.show_date.isChecked(),
+                    "date_format": self.ui.date_format.currentText(),
+                    "show_unlock_button": self.ui.show_unlock_button.isChecked(),
+                    "show_user_avatar": self.ui.show_user_avatar.isChecked(),
+                    "show_keyboard_layout": self.ui.show_keyboard_layout.isChecked(),
+                })
+
+            if self.ui.is_tab_built(2):
+                new_settings.update({
+                    "webcam_detection": self.ui.webcam_detection_checkbox.isChecked(),
+                    "webcam_sensitivity": self.ui.webcam_sensitivity_slider.value(),
+                    "webcam_timeout": self.ui.webcam_timeout.value(),
+                    "failed_attempts": self.ui.failed_attempts_spinbox.value(),
+                    "lockout_duration": self.ui.lockout_duration_spinbox.value(),
+                    "password_expiry": self.ui.password_expiry_checkbox.isChecked(),
+                    "password_expiry_days": self.ui.password_expiry_spinbox.value(),
+                    "debug_mode": self.ui.debug_mode.isChecked(),
+                    "console_output": self.ui.console_output.isChecked(),
+                    "two_factor": self.ui.two_factor_checkbox.isChecked(),
+                    "two_factor_method": self.ui.two_factor_method_combo.currentText(),
+                    "two_factor_email": self.ui.two_factor_email.text()
+                })
+
+                # Set authentication method based on radio selection
+                if self.ui.auth_password_radio.isChecked():
+                    new_settings["auth_method"] = "Password"
+                elif self.ui.auth_pin_radio.isChecked():
+                    new_settings["auth_method"] = "PIN"
+                elif self.ui.auth_pattern_radio.isChecked():
+                    new_settings["auth_method"] = "Pattern"
+                elif self.ui.auth_fingerprint_radio.isChecked():
+                    new_settings["auth_method"] = "Fingerprint"
+                elif self.ui.auth_face_radio.isChecked():
+                    new_settings["auth_method"] = "Face Recognition"
 
             # Update the settings dictionary with new values
             self.settings.update(new_settings)
@@ -264,6 +312,12 @@ class SettingsPanel(QDialog):
         if file_path:
             self.ui.bg_image_path.setText(file_path)
 
+    def choose_slideshow_dir(self):
+        """Open folder dialog to choose the slideshow image folder."""
+        directory = QFileDialog.getExistingDirectory(self, "Select Slideshow Folder")
+        if directory:
+            self.ui.slideshow_dir.setText(directory)
+
     def choose_clock_color(self):
         """Open color dialog to choose clock color."""
         color = QColorDialog.getColor()
@@ -9,6 +9,10 @@ from PyQt5.QtGui import QColor, QPalette, QIcon, QFont, QPixmap
 from utils import is_windows
 
 class SettingsPanelUI:
+    # Tab titles in display order, and the method that builds each one
+    TAB_TITLES = ["General", "Appearance", "Security", "About"]
+    TAB_BUILDERS = ["setup_general_tab", "setup_appearance_tab", "setup_security_tab", "setup_about_tab"]
+
     def setupUI(self, dialog):
         # Apply dark theme with improved colors
         dark_stylesheet = """
@@ -151,8 +155,55 @@ class SettingsPanelUI:
         # Create tabs
         self.tabs = QTabWidget()
 
+        # Tabs start out as empty pages; their widgets are built on first show
+        self.built_tabs = set()
+        for title in self.TAB_TITLES:
+            self.tabs.addTab(QWidget(), title)
+
+        # Add tabs to main layout
+        self.main_layout.addWidget(self.tabs)
+
+        # Add buttons at the bottom
+        self.buttons_layout = QHBoxLayout()
+        self.buttons_layout.setSpacing(6)
+
+        self.restore_defaults_btn = QPushButton("Restore Defaults")
+        self.restore_defaults_btn.setToolTip("↩️ Restore all settings to default values.")
+        self.buttons_layout.addWidget(self.restore_defaults_btn)
+
+        self.buttons_layout.addStretch()
+
+        self.apply_btn = QPushButton("Apply")
+        self.apply_btn.setToolTip("✅ Apply changes without closing the window.")
+        self.buttons_layout.addWidget(self.apply_btn)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setToolTip("❌ Cancel changes and close the window.")
+        self.buttons_layout.addWidget(self.cancel_btn)
+
+        self.ok_btn = QPushButton("OK")
+        self.ok_btn.setToolTip("✅ Save changes and close the window.")
+        self.buttons_layout.addWidget(self.ok_btn)
+
+        self.main_layout.addLayout(self.buttons_layout)
+
+    def build_tab(self, index):
+        """Build the widgets of a tab if that hasn't happened yet.
+
+        Returns True if the tab was built by this call.
+        """
+        if index in self.built_tabs or not 0 <= index < len(self.TAB_BUILDERS):
+            return False
+        getattr(self, self.TAB_BUILDERS[index])()
+        self.built_tabs.add(index)
+        return True
+
+    def is_tab_built(self, index):
+        return index in self.built_tabs
+
+    def setup_general_tab(self):
         # General settings tab
-        self.general_tab = QWidget()
+        self.general_tab = self.tabs.widget(0)
         self.general_layout = QVBoxLayout(self.general_tab)
         self.general_layout.setContentsMargins(8, 8, 8, 8)
         self.general_layout.setSpacing(8)
@@ -296,8 +347,9 @@ class SettingsPanelUI:
 
         self.general_layout.addStretch()
 
+    def setup_appearance_tab(self):
         # Appearance settings tab
-        self.appearance_tab = QWidget()
+        self.appearance_tab = self.tabs.widget(1)
         self.appearance_layout = QVBoxLayout(self.appearance_tab)
         self.appearance_layout.setContentsMargins(8, 8, 8, 8)
         self.appearance_layout.setSpacing(8)
@@ -333,6 +385,22 @@ class SettingsPanelUI:
         self.bg_image_btn.setToolTip("🖼️ Select a background image.")
         self.bg_layout.addRow("", self.bg_image_btn)
 
+        self.slideshow_dir = QLineEdit()
+        self.slideshow_dir.setPlaceholderText("No folder selected")
+        self.slideshow_dir.setReadOnly(True)
+        self.bg_layout.addRow("Slideshow Folder:", self.slideshow_dir)
+
+        self.slideshow_dir_btn = QPushButton("Browse...")
+        self.slideshow_dir_btn.setToolTip("🗂️ Select a folder of images for the slideshow.")
+        self.bg_layout.addRow("", self.slideshow_dir_btn)
+
+        self.slideshow_interval = QSpinBox()
+        self.slideshow_interval.setRange(5, 3600)
+        self.slideshow_interval.setValue(30)
+        self.slideshow_interval.setSuffix(" s")
+        self.slideshow_interval.setToolTip("⏭️ How long each slideshow image is shown.")
+        self.bg_layout.addRow("Change Every:", self.slideshow_interval)
+
         self.bg_blur_slider = QSlider(Qt.Horizontal)
         self.bg_blur_slider.setRange(0, 20)
         self.bg_blur_slider.setValue(5)
@@ -378,6 +446,10 @@ class SettingsPanelUI:
         self.clock_color_layout.addWidget(self.clock_color_preview)
         self.clock_color_layout.addStretch()
 
+        self.clock_show_seconds = QCheckBox("Show seconds")
+        self.clock_show_seconds.setChecked(True)
+        self.clock_show_seconds.setToolTip("⏱️ Show seconds on the clock. Without them the clock only updates once a minute.")
+
         self.show_date = QCheckBox("Show date")
         self.show_date.setChecked(True)
         self.show_date.setToolTip("📅 Show the current date on the lock screen.")
@@ -392,6 +464,7 @@ class SettingsPanelUI:
 
         self.clock_layout.addRow("", self.enable_clock)
         self.clock_layout.addRow("Format:", self.clock_format)
+        self.clock_layout.addRow("", self.clock_show_seconds)
         self.clock_layout.addRow("Font:", self.clock_font)
         self.clock_layout.addRow("Font Size:", self.clock_size)
         self.clock_layout.addRow("Font Color:", self.clock_color_layout)
@@ -428,8 +501,9 @@ class SettingsPanelUI:
         self.appearance_layout.addWidget(self.ui_group)
         self.appearance_layout.addStretch()
 
+    def setup_security_tab(self):
         # Security settings tab
-        self.security_tab = QWidget()
+        self.security_tab = self.tabs.widget(2)
         self.security_layout = QVBoxLayout(self.security_tab)
         self.security_layout.setContentsMargins(8, 8, 8, 8)
         self.security_layout.setSpacing(8)
@@ -581,8 +655,9 @@ class SettingsPanelUI:
 
         self.security_layout.addStretch()
 
+    def setup_about_tab(self):
         # About tab
-        self.about_tab = QWidget()
+        self.about_tab = self.tabs.widget(3)
         self.about_layout = QVBoxLayout(self.about_tab)
         self.about_layout.setContentsMargins(8, 8, 8, 8)
         self.about_layout.setSpacing(8)
@@ -675,36 +750,3 @@ class SettingsPanelUI:
         self.about_layout.addWidget(self.license_group)
 
         self.about_layout.addStretch()
-
-        # Add all tabs to the tab widget
-        self.tabs.addTab(self.general_tab, "General")
-        self.tabs.addTab(self.appearance_tab, "Appearance")
-        self.tabs.addTab(self.security_tab, "Security")
-        self.tabs.addTab(self.about_tab, "About")
-
-        # Add tabs to main layout
-        self.main_layout.addWidget(self.tabs)
-
-        # Add buttons at the bottom
-        self.buttons_layout = QHBoxLayout()
-        self.buttons_layout.setSpacing(6)
-
-        self.restore_defaults_btn = QPushButton("Restore Defaults")
-        self.restore_defaults_btn.setToolTip("↩️ Restore all settings to default values.")
-        self.buttons_layout.addWidget(self.restore_defaults_btn)
-
-        self.buttons_layout.addStretch()
-
-        self.apply_btn = QPushButton("Apply")
-        self.apply_btn.setToolTip("✅ Apply changes without closing the window.")
-        self.buttons_layout.addWidget(self.apply_btn)
-
-        self.cancel_btn = QPushButton("Cancel")
-        self.cancel_btn.setToolTip("❌ Cancel changes and close the window.")
-        self.buttons_layout.addWidget(self.cancel_btn)
-
-        self.ok_btn = QPushButton("OK")
-        self.ok_btn.setToolTip("✅ Save changes and close the window.")
-        self.buttons_layout.addWidget(self.ok_btn)
-
-        self.main_layout.addLayout(self.buttons_layout)
\ No newline at end of file
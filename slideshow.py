@@ -0,0 +1,305 @@
+import os
+import time
+import bisect
+import threading
+from collections import deque
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, QSize, QRect, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPixmap
+from background import pixmap_bytes, physical_size
+
+# File extensions picked up from the slideshow directory
+SLIDESHOW_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp")
+
+
+def list_slideshow_images(directory):
+    """Return the image paths in directory, sorted by name."""
+    try:
+        with os.scandir(directory) as entries:
+            paths = [entry.path for entry in entries
+                     if entry.name.lower().endswith(SLIDESHOW_EXTENSIONS) and entry.is_file()]
+    except OSError as e:
+        print(f"Error reading slideshow directory: {e}")
+        return []
+    paths.sort()
+    return paths
+
+
+def decode_frame(path, sizes):
+    """Decode path and crop-scale it to fill each (width, height) in sizes.
+
+    Returns a dict of size -> QImage, or None if the file can't be decoded.
+    Safe to call off the GUI thread, as it only uses QImage.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+
+    # Let the decoder shrink large images (JPEG can do this almost for free)
+    source = reader.size()
+    if source.isValid() and sizes:
+        largest = max(sizes, key=lambda size: size[0] * size[1])
+        target = source.scaled(QSize(*largest), Qt.KeepAspectRatioByExpanding)
+        if target.width() < source.width():
+            reader.setScaledSize(target)
+
+    image = reader.read()
+    if image.isNull():
+        return None
+
+    frames = {}
+    for width, height in sizes:
+        scaled = image.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        # Centre crop so the image fills the monitor exactly
+        crop = QRect((scaled.width() - width) // 2, (scaled.height() - height) // 2, width, height)
+        frames[(width, height)] = scaled.copy(crop).convertToFormat(QImage.Format_RGB32)
+    return frames
+
+
+class SlideshowDecoder(QThread):
+    """Decodes slideshow images ahead of time on a worker thread.
+
+    At most ``prefetch`` frames are decoded ahead: each decoded frame takes
+    a slot, and the slideshow gives the slot back once the frame is shown.
+    """
+    frame_ready = pyqtSignal(object)  # {"path": ..., "images": {size: QImage}, "source": decoder}
+    listed = pyqtSignal(int)
+
+    def __init__(self, directory, sizes, prefetch, after=None):
+        super().__init__()
+        self.directory = directory
+        self.sizes = sizes
+        self.after = after  # Continue from the image after this path
+        self.slots = threading.Semaphore(prefetch)
+        self.stopping = threading.Event()
+        self.decoded = 0
+        self.failed = 0
+        self.decode_seconds = 0.0
+
+    def run(self):
+        paths = list_slideshow_images(self.directory)
+        self.listed.emit(len(paths))
+
+        # Pick up where the previous lock left off
+        index = bisect.bisect_right(paths, self.after) if self.after else 0
+        failures_in_row = 0
+        while paths and not self.stopping.is_set():
+            self.slots.acquire()
+            if self.stopping.is_set():
+                break
+
+            path = paths[index % len(paths)]
+            index += 1
+            start = time.perf_counter()
+            try:
+                images = decode_frame(path, self.sizes)
+            except Exception as e:
+                print(f"Error decoding slideshow image {path}: {e}")
+                images = None
+            self.decode_seconds += time.perf_counter() - start
+
+            if images is None:
+                # Skip corrupt or unreadable files; give up if none can be read
+                self.failed += 1
+                self.slots.release()
+                failures_in_row += 1
+                if failures_in_row >= len(paths):
+                    print("Slideshow: no readable images found.")
+                    break
+                continue
+
+            failures_in_row = 0
+            self.decoded += 1
+            self.frame_ready.emit({"path": path, "images": images, "source": self})
+
+    def release_slot(self):
+        self.slots.release()
+
+    def stop(self):
+        """Ask the thread to finish and wait for it."""
+        self.stopping.set()
+        self.slots.release()  # Wake it if it is waiting for a free slot
+        self.wait()
+
+
+class Slideshow(QObject):
+    """Cycles the lock window background through a directory of images.
+
+    Decoding and scaling happen on a SlideshowDecoder thread; the GUI thread
+    only converts ready frames to pixmaps and swaps them in. Transitions
+    can be paused (e.g. in low-power mode) without stopping the decoder,
+    which simply waits once its prefetch slots are full.
+    """
+    frame_changed = pyqtSignal()
+    stalled = pyqtSignal()  # No frame is coming for now: the decoder finished or transitions paused
+
+    def __init__(self):
+        super().__init__()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.CoarseTimer)
+        self.timer.timeout.connect(self.advance)
+
+        self.decoder = None
+        self.config = None
+        self.ready = deque()
+        self.current = {}  # (width, height) in device pixels -> QPixmap of the frame on screen
+        self.ratios = {}  # (width, height) in device pixels -> device pixel ratio
+        self.current_path = None
+        self.current_config = None  # (directory, sizes) the frame on screen was decoded for
+        self.waiting = False  # Show the next frame as soon as it is decoded
+        self.paused = False
+
+        self.images = 0  # Images found in the directory
+        self.shown = 0
+        self.late = 0  # Transitions that had to wait for the decoder
+        self.peak_ready = 0
+        self.swap_seconds = 0.0
+        # Totals from decoders that have been stopped
+        self.decoded = 0
+        self.failed = 0
+        self.decode_seconds = 0.0
+
+    def start(self, settings, geometries, ratio=None):
+        """Start or reconfigure the slideshow for the given monitors.
+
+        Frames are decoded at each monitor's physical resolution; ratio maps
+        a geometry to its device pixel ratio (1.0 for all if not given).
+        """
+        self.ratios = {}
+        for geometry in geometries:
+            dpr = ratio(geometry) if ratio else 1.0
+            size = physical_size(geometry.size(), dpr)
+            self.ratios[(size.width(), size.height())] = dpr
+        sizes = tuple(sorted(self.ratios))
+        config = (settings.get("slideshow_dir", ""), sizes, settings.get("slideshow_prefetch", 2))
+        if config != self.config or self.decoder is None:
+            self.stop_decoder()
+            self.config = config
+            directory, sizes, prefetch = config
+            self.images = 0
+            if directory:
+                self.decoder = SlideshowDecoder(directory, sizes, prefetch, self.current_path)
+                self.decoder.frame_ready.connect(self.on_frame_ready)
+                self.decoder.listed.connect(self.on_listed)
+                self.decoder.finished.connect(self.on_decoder_finished)
+                self.decoder.start(QThread.LowPriority)
+                # Replace the frame on screen straight away if it is from
+                # another directory or the wrong size
+                self.waiting = self.current_config != (directory, sizes)
+
+        self.timer.setInterval(settings.get("slideshow_interval", 30) * 1000)
+        if self.decoder is None:
+            self.timer.stop()  # No directory, so nothing to show
+        elif not self.paused:
+            self.timer.start()
+
+    def stop(self):
+        """Stop transitions and decoding. The frame on screen is kept for the next lock."""
+        self.timer.stop()
+        self.stop_decoder()
+
+    def stop_decoder(self):
+        if self.decoder is not None:
+            self.decoder.frame_ready.disconnect(self.on_frame_ready)
+            self.decoder.listed.disconnect(self.on_listed)
+            self.decoder.finished.disconnect(self.on_decoder_finished)
+            self.decoder.stop()
+            self.decoded += self.decoder.decoded
+            self.failed += self.decoder.failed
+            self.decode_seconds += self.decoder.decode_seconds
+            self.decoder = None
+        self.ready.clear()
+        self.config = None
+
+    def pause(self):
+        """Hold the current frame, e.g. while in low-power mode."""
+        self.paused = True
+        self.timer.stop()
+        self.stalled.emit()
+
+    def resume(self):
+        if self.paused:
+            self.paused = False
+            if self.decoder is not None:
+                self.timer.start()
+
+    def is_running(self):
+        return self.decoder is not None
+
+    def frame_expected(self):
+        """Return True if a new frame will be swapped in without a resume or restart."""
+        if self.decoder is None or self.paused:
+            return False
+        return self.decoder.isRunning() or bool(self.ready)
+
+    def on_decoder_finished(self):
+        # Finished on its own: the directory is empty or nothing in it can be read
+        if self.sender() is self.decoder and not self.ready:
+            self.stalled.emit()
+
+    def on_listed(self, count):
+        if self.sender() is self.decoder:  # Not queued by a decoder that has since stopped
+            self.images = count
+
+    def on_frame_ready(self, frame):
+        if frame["source"] is not self.decoder:
+            return  # Queued before that decoder was stopped
+        self.ready.append(frame)
+        self.peak_ready = max(self.peak_ready, len(self.ready))
+        if self.waiting and not self.paused:
+            self.advance()
+
+    def advance(self):
+        """Swap in the next decoded frame, or show it as soon as it arrives."""
+        if not self.ready:
+            self.late += 1
+            self.waiting = True
+            return
+
+        start = time.perf_counter()
+        frame = self.ready.popleft()
+        self.current = {}
+        for size, image in frame["images"].items():
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(self.ratios.get(size, 1.0))
+            self.current[size] = pixmap
+        self.current_path = frame["path"]
+        self.current_config = self.config[:2]
+        self.waiting = False
+        self.shown += 1
+        if self.decoder is not None:
+            self.decoder.release_slot()
+        self.swap_seconds += time.perf_counter() - start
+        self.frame_changed.emit()
+
+    def current_pixmap(self, size, dpr=1.0):
+        """Return the frame on screen at logical size and dpr, or None if nothing has been decoded yet."""
+        target = physical_size(size, dpr)
+        key = (target.width(), target.height())
+        pixmap = self.current.get(key)
+        if pixmap is not None and pixmap.devicePixelRatio() != dpr:
+            pixmap = None  # Same pixels, but meant for a screen with another ratio
+        if pixmap is None and self.current:
+            # A monitor the decoder doesn't know about yet; scale what we have
+            source = max(self.current.values(), key=lambda p: p.width() * p.height())
+            pixmap = source.scaled(target, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            pixmap.setDevicePixelRatio(dpr)
+            self.current[key] = pixmap
+        return pixmap
+
+    def stats(self):
+        """Return frame counters and the memory held by decoded frames."""
+        ready_bytes = sum(image.sizeInBytes() for frame in self.ready for image in frame["images"].values())
+        decoder = self.decoder
+        return {
+            "running": self.is_running(),
+            "paused": self.paused,
+            "images": self.images,
+            "shown": self.shown,
+            "late": self.late,
+            "ready": len(self.ready),
+            "peak_ready": self.peak_ready,
+            "decoded": self.decoded + (decoder.decoded if decoder else 0),
+            "failed": self.failed + (decoder.failed if decoder else 0),
+            "decode_ms": (self.decode_seconds + (decoder.decode_seconds if decoder else 0.0)) * 1e3,
+            "swap_ms": self.swap_seconds * 1e3,
+            "bytes": ready_bytes + sum(pixmap_bytes(p) for p in self.current.values()),
+        }
@@ -3,120 +3,342 @@ import json
 import sys
 import time
 import hashlib
+import atexit
 import platform
+import threading
+from collections import OrderedDict
 from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QApplication, QDesktopWidget
+from PyQt5.QtWidgets import QApplication
 
 # Constants
+SYSTEM = platform.system()  # Resolved once; the OS cannot change under us
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
-DEFAULT_SETTINGS = {
-    "hotkey": "Ctrl+Alt+L",
-    "enable_timer": False,
-    "idle_timeout": 5,
-    "enable_password": False,
-    "password": "",  # Changed default to empty string for security
-    "password_hash": "",  # Added for storing hashed password
-    "bg_color": "#000000",
-    "bg_image": "",  # Path to background image
-    "enable_clock": True,
-    "clock_24h": False,
-    "clock_size": 40,
-    "clock_color": "#FFFFFF",
-    "debug_mode": False,  # Debug mode for force closing the lock screen
-    "autostart": False,
-    "system_tray": False,
-    "minimize_to_tray": False,
-    "auth_method": "Password",
-    "hash_passwords": True,  # Changed default to True for security
-    "two_factor": False,
-    "two_factor_method": "Email",
-    "max_attempts": 3,
-    "lockout_duration": 5,
-    "recovery_email": "",
-    "use_recovery_questions": False,
-    "recovery_questions": [],  # Added to store recovery questions
-    "recovery_answers": [],    # Added to store hashed answers
-    "background_type": "Color",
-    "show_clock": True,
-    "clock_format": "12 Hour",
-    "lock_on_startup": False,  # Added new option
-    "custom_message": "",      # Added for custom lock screen message
-    "last_locked": 0           # Track when screen was last locked
+ATTEMPTS_FILE = os.path.join(os.path.dirname(__file__), "attempts.json")  # Failed unlock attempt counters
+SETTINGS_VERSION = 1
+
+_MISSING = object()
+_NUMBER_TYPES = (int, float)
+
+class Field:
+    """Declarative description of a single setting: its type, default and allowed values."""
+    def __init__(self, kind, default, minimum=None, maximum=None, choices=None):
+        self.kind = kind  # "bool", "int", "float", "str", "color", "list"
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+
+    def default_value(self):
+        # Lists are mutable, so never hand out the schema's own default
+        return list(self.default) if isinstance(self.default, list) else self.default
+
+    def compile(self):
+        """Return a single check function for this field, chosen once up front."""
+        kind, lo, hi, choices = self.kind, self.minimum, self.maximum, self.choices
+        if choices is not None:
+            allowed = frozenset(choices)
+            return lambda value: type(value) is str and value in allowed
+        if kind == "bool":
+            return lambda value: type(value) is bool
+        if kind in ("int", "float"):
+            lo = float("-inf") if lo is None else lo
+            hi = float("inf") if hi is None else hi
+            if kind == "int":
+                return lambda value: type(value) is int and lo <= value <= hi
+            return lambda value: type(value) in _NUMBER_TYPES and lo <= value <= hi
+        if kind == "color":
+            return lambda value: type(value) is str and len(value) in (4, 7, 9) and value[:1] == "#"
+        if kind == "list":
+            return lambda value: type(value) is list
+        return lambda value: type(value) is str
+
+    def repair(self, value):
+        """Return the closest valid value for a bad one, or the default."""
+        if self.kind in ("int", "float") and self.choices is None:
+            try:
+                if type(value) is bool:
+                    raise ValueError
+                number = float(value)
+                number = int(round(number)) if self.kind == "int" else number
+            except (TypeError, ValueError):
+                return self.default_value()
+            if self.minimum is not None:
+                number = max(self.minimum, number)
+            if self.maximum is not None:
+                number = min(self.maximum, number)
+            return number
+        if self.kind == "bool" and value in (0, 1) and type(value) is int:
+            return bool(value)
+        return self.default_value()
+
+# Every setting the application reads or writes, with its type, range and default
+SETTINGS_SCHEMA = {
+    "settings_version": Field("int", SETTINGS_VERSION, 0),
+    "hotkey": Field("str", "Ctrl+Alt+L"),
+    "enable_timer": Field("bool", False),
+    "idle_timeout": Field("int", 5, 1, 180),  # Minutes
+    "low_power_mode": Field("bool", True),  # Stop waking up while the displays are off
+    "low_power_on_battery": Field("bool", True),  # Minute-resolution clock on battery
+    "enable_password": Field("bool", False),
+    "password": Field("str", ""),  # Changed default to empty string for security
+    "password_hash": Field("str", ""),  # Added for storing hashed password
+    "bg_type": Field("str", "Solid Color", choices=["Solid Color", "Image", "Slideshow", "Blur Current Desktop"]),
+    "bg_color": Field("color", "#000000"),
+    "bg_image": Field("str", ""),  # Path to background image
+    "slideshow_dir": Field("str", ""),  # Directory of slideshow images
+    "slideshow_interval": Field("int", 30, 5, 3600),  # Seconds per image
+    "slideshow_prefetch": Field("int", 2, 1, 10),  # Images decoded ahead
+    "bg_blur": Field("int", 5, 0, 20),
+    "bg_opacity": Field("int", 100, 0, 100),
+    "enable_clock": Field("bool", True),
+    "clock_24h": Field("bool", False),
+    "clock_show_seconds": Field("bool", True),
+    "clock_size": Field("int", 40, 10, 200),
+    "clock_color": Field("color", "#FFFFFF"),
+    "clock_font": Field("str", "System Default"),
+    "show_date": Field("bool", True),
+    "date_format": Field("str", "MM/DD/YYYY", choices=["MM/DD/YYYY", "DD/MM/YYYY", "YYYY-MM-DD"]),
+    "debug_mode": Field("bool", False),  # Debug mode for force closing the lock screen
+    "console_output": Field("bool", False),
+    "autostart": Field("bool", False),
+    "system_tray": Field("bool", False),
+    "minimize_to_tray": Field("bool", False),
+    "hot_corners": Field("bool", False),
+    "hot_corner_position": Field("str", "Top Right", choices=["Top Left", "Top Right", "Bottom Left", "Bottom Right"]),
+    "lock_on_sleep": Field("bool", True),
+    "lock_on_screensaver": Field("bool", True),
+    "set_as_default_lock": Field("bool", False),  # Windows: replace the system lock screen
+    "secure_desktop": Field("bool", False),
+    "replace_win_l": Field("bool", True),
+    "show_unlock_button": Field("bool", True),
+    "show_user_avatar": Field("bool", True),
+    "user_avatar_path": Field("str", ""),
+    "show_username": Field("bool", True),
+    "custom_username": Field("str", ""),  # Empty for the login name
+    "clock_icon": Field("str", ""),  # Custom icons replace the default emoji when set
+    "lock_icon": Field("str", ""),
+    "password_icon": Field("str", ""),
+    "unlock_icon": Field("str", ""),
+    "precompose_frame": Field("bool", True),  # Paint static lock screen layers once per monitor
+    "async_lock": Field("bool", True),  # Cover every monitor first, swap in slow assets as they are ready
+    "prewarm_windows": Field("bool", False),  # Keep hidden lock windows built while unlocked
+    "show_keyboard_layout": Field("bool", False),
+    "auth_method": Field("str", "Password", choices=["Password", "PIN", "Pattern", "Fingerprint", "Face Recognition"]),
+    "hash_passwords": Field("bool", True),  # Changed default to True for security
+    "two_factor": Field("bool", False),
+    "two_factor_method": Field("str", "Email", choices=["Email", "SMS", "Authenticator App"]),
+    "two_factor_email": Field("str", ""),
+    "max_attempts": Field("int", 3, 1, 100),
+    "failed_attempts": Field("int", 5, 3, 10),
+    "lockout_duration": Field("int", 5, 1, 60),  # Minutes
+    "password_expiry": Field("bool", False),
+    "password_expiry_days": Field("int", 90, 1, 365),
+    "webcam_detection": Field("bool", False),
+    "webcam_sensitivity": Field("int", 5, 1, 10),
+    "webcam_timeout": Field("int", 15, 5, 60),  # Seconds
+    "recovery_email": Field("str", ""),
+    "use_recovery_questions": Field("bool", False),
+    "recovery_questions": Field("list", []),  # Added to store recovery questions
+    "recovery_answers": Field("list", []),    # Added to store hashed answers
+    "background_type": Field("str", "Color"),
+    "show_clock": Field("bool", True),
+    "clock_format": Field("str", "12 Hour", choices=["12 Hour", "24 Hour"]),
+    "lock_on_startup": Field("bool", False),  # Added new option
+    "custom_message": Field("str", ""),      # Added for custom lock screen message
+    "last_locked": Field("float", 0, 0),     # Track when screen was last locked
 }
 
+DEFAULT_SETTINGS = {key: field.default_value() for key, field in SETTINGS_SCHEMA.items()}
+
+# Compiled once: key -> (check, field)
+_COMPILED_SCHEMA = [(key, field.compile(), field) for key, field in SETTINGS_SCHEMA.items()]
+
+def default_settings():
+    """Return a fresh copy of the default settings."""
+    return {key: field.default_value() for key, field in SETTINGS_SCHEMA.items()}
+
+def _looks_hashed(password):
+    """Check whether a stored password is already a hash rather than plain text."""
+    return password.startswith("$") or len(password) in (64, 80)
+
+def _migrate_to_v1(settings):
+    """Version 0 -> 1: carry over renamed keys and hash any plain text password."""
+    if "bg_type" not in settings and "background_type" in settings:
+        settings["bg_type"] = "Image" if settings["background_type"] == "Image" else "Solid Color"
+    if "clock_24h" in settings and "clock_format" not in settings:
+        settings["clock_format"] = "24 Hour" if settings["clock_24h"] else "12 Hour"
+
+    password = settings.get("password", "")
+    if settings.get("hash_passwords", True) and isinstance(password, str) and password \
+            and not _looks_hashed(password):
+        settings["password"] = hash_password(password)
+
+# (target version, migration function) in ascending order
+SETTINGS_MIGRATIONS = [
+    (1, _migrate_to_v1),
+]
+
+class ValidationReport:
+    """Record of what repair_settings changed."""
+    def __init__(self):
+        self.migrations = []  # Versions migrated to
+        self.repairs = []     # (key, problem, old value, new value)
+
+    def add(self, key, problem, old, new):
+        self.repairs.append((key, problem, old, new))
+
+    @property
+    def changed(self):
+        return bool(self.migrations or self.repairs)
+
+    def summary(self):
+        lines = [f"migrated settings to version {version}" for version in self.migrations]
+        missing = [key for key, problem, _, _ in self.repairs if problem == "missing"]
+        if missing:
+            lines.append(f"{len(missing)} missing setting(s) set to defaults: {', '.join(missing)}")
+        for key, problem, old, new in self.repairs:
+            if problem != "missing":
+                lines.append(f"{key}: {problem} value {old!r}, set to {new!r}")
+        return lines
+
+def repair_settings(settings):
+    """Migrate and validate settings in place, repairing individual bad fields.
+
+    Returns (settings, report). Keys the schema doesn't know about are kept
+    as they are.
+    """
+    report = ValidationReport()
+    if not isinstance(settings, dict):
+        report.add("*", "invalid", type(settings).__name__, "defaults")
+        return default_settings(), report
+
+    version = settings.get("settings_version", 0)
+    if type(version) is not int:
+        version = 0
+    for target, migrate in SETTINGS_MIGRATIONS:
+        if version < target:
+            migrate(settings)
+            version = target
+            report.migrations.append(target)
+    settings["settings_version"] = max(version, SETTINGS_VERSION)
+
+    for key, check, field in _COMPILED_SCHEMA:
+        value = settings.get(key, _MISSING)
+        if value is _MISSING:
+            settings[key] = field.default_value()
+            report.add(key, "missing", None, settings[key])
+        elif not check(value):
+            settings[key] = field.repair(value)
+            report.add(key, "invalid", value, settings[key])
+
+    return settings, report
+
 def validate_settings(settings):
-    """Validate the loaded settings."""
+    """Check whether settings match the schema without needing any repairs."""
     if not isinstance(settings, dict):
         return False
-    
-    # First check that all required keys exist with correct types
-    # We don't simply check equality of types because we want to allow
-    # compatible numeric types (int/float)
-    for key, default_value in DEFAULT_SETTINGS.items():
-        if key not in settings:
-            return False
-        
-        # Special handling for numeric types
-        if isinstance(default_value, (int, float)):
-            if not isinstance(settings[key], (int, float)):
-                return False
-        # Special handling for lists
-        elif isinstance(default_value, list):
-            if not isinstance(settings[key], list):
-                return False
-        # All other types must match exactly
-        elif not isinstance(settings[key], type(default_value)):
-            return False
-    
-    return True
+    return all(key in settings and check(settings[key]) for key, check, _ in _COMPILED_SCHEMA)
 
-def load_settings(default=False):
-    """
-    Load settings from the settings file.
-    Args:
-        default (bool): If True, return default settings without loading from file
+def read_settings_file():
+    """Read, migrate and repair the settings file, falling back to defaults.
+
+    Returns (settings, report).
     """
+    report = ValidationReport()
     try:
-        if default:
-            return DEFAULT_SETTINGS.copy()
-
         if os.path.exists(SETTINGS_FILE):
             with open(SETTINGS_FILE, 'r') as f:
                 settings = json.load(f)
-                if not validate_settings(settings):
-                    print("Settings file is corrupted. Using default settings.")
-                    return DEFAULT_SETTINGS.copy()
-                
-                # Ensure all default settings are present
-                for key, value in DEFAULT_SETTINGS.items():
-                    if key not in settings:
-                        settings[key] = value
-                
-                # Handle password migration if needed
-                if settings["hash_passwords"] and settings["password"] and not settings["password_hash"]:
-                    settings["password_hash"] = hash_password(settings["password"])
-                    settings["password"] = ""  # Clear plaintext password
-                    
-                return settings
+
+            settings, report = repair_settings(settings)
+            if report.changed:
+                for line in report.summary():
+                    print(f"Settings: {line}")
+                # Persist the repairs so they only happen once
+                save_settings(settings)
+            return settings, report
         else:
             # Create the settings file with default values if it doesn't exist
             save_settings(DEFAULT_SETTINGS)
-            return DEFAULT_SETTINGS.copy()
+            return default_settings(), report
     except FileNotFoundError:
         print(f"Settings file not found. Creating default settings: {SETTINGS_FILE}")
         save_settings(DEFAULT_SETTINGS)
-        return DEFAULT_SETTINGS.copy()
+        return default_settings(), report
     except json.JSONDecodeError:
         print(f"Error decoding settings file. Using default settings: {SETTINGS_FILE}")
         # Backup corrupted file for potential recovery
         backup_corrupted_settings()
-        return DEFAULT_SETTINGS.copy()
+        return default_settings(), report
     except OSError as e:
         print(f"OS error occurred while loading settings: {e}")
-        return DEFAULT_SETTINGS.copy()
+        return default_settings(), report
     except Exception as e:
         print(f"Unexpected error loading settings: {e}")
-        return DEFAULT_SETTINGS.copy()
+        return default_settings(), report
+
+class SettingsStore:
+    """Caches the parsed, validated settings and re-reads them only when the file changes.
+
+    Every consumer gets the same dict. When the file is changed by something
+    else, the dict is refreshed in place so existing references stay valid.
+    Writes made through settings_writer don't count as changes.
+    """
+    def __init__(self, path=SETTINGS_FILE):
+        self.path = path
+        self.settings = None
+        self._stat = None
+        self.loads = 0
+        self.hits = 0
+        self.last_load_time = None  # Seconds spent in the last real load
+        self.last_report = None  # ValidationReport from the last real load
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def load(self):
+        """Return the settings, re-reading the file only if its mtime or size changed."""
+        stat = self._file_stat()
+        if self.settings is not None and stat == self._stat:
+            self.hits += 1
+            return self.settings
+
+        start = time.perf_counter()
+        settings, self.last_report = read_settings_file()
+        self.last_load_time = time.perf_counter() - start
+        self.loads += 1
+
+        if self.settings is None:
+            self.settings = settings
+        else:
+            self.settings.clear()
+            self.settings.update(settings)
+        self._stat = self._file_stat()
+        return self.settings
+
+    def file_written(self):
+        """Record that the file on disk now matches our settings."""
+        self._stat = self._file_stat()
+
+    def invalidate(self):
+        """Force the next load to re-read the file."""
+        self._stat = None
+
+settings_store = SettingsStore()
+
+def load_settings(default=False):
+    """
+    Load settings from the settings file.
+    Args:
+        default (bool): If True, return default settings without loading from file
+    """
+    if default:
+        return default_settings()
+    return settings_store.load()
 
 def backup_corrupted_settings():
     """Create a backup of corrupted settings file."""
@@ -129,51 +351,726 @@ def backup_corrupted_settings():
         except Exception as e:
             print(f"Failed to backup corrupted settings: {e}")
 
-def save_settings(settings):
-    """Save settings to the settings file with basic error handling."""
-    try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(SETTINGS_FILE), exist_ok=True)
-        
-        # Write settings directly to file
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f, indent=4)
-            f.flush()
-            os.fsync(f.fileno())  # Ensure data is written to disk
-            
-        return True
+class SettingsWriter:
+    """Writes settings atomically, coalescing bursts of saves into one write.
+
+    Each save serializes the settings straight away, so later changes to the
+    dict don't leak into a pending write. The file is only written once no
+    further save has arrived for ``delay`` seconds, and not at all if the
+    content matches what is already on disk. Writes go to a temporary file
+    that is fsynced and then renamed over the settings file, so a crash
+    leaves either the old or the new file, never a truncated one.
+    """
+    def __init__(self, path=SETTINGS_FILE, delay=0.5):
+        self.path = path
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending = None  # Serialized settings waiting to be written
+        self._timer = None
+        self._written = None  # Last content known to be on disk
+        self.writes = 0
+        self.skipped = 0
+
+    def save(self, settings, immediate=False):
+        """Queue settings to be written, or write them now if immediate."""
+        content = json.dumps(settings, indent=4)
+        with self._lock:
+            self._pending = content
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not immediate and self.delay > 0:
+                self._timer = threading.Timer(self.delay, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+                return True
+        return self.flush()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+    def flush(self):
+        """Write any pending settings synchronously."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            content, self._pending = self._pending, None
+            if content is None:
+                return True
+
+            if self._written is None:
+                try:
+                    with open(self.path, 'r') as f:
+                        self._written = f.read()
+                except OSError:
+                    pass
+            if content == self._written:
+                self.skipped += 1
+                return True
+
+            self._write(content)
+            self._written = content
+            self.writes += 1
+            if self.path == settings_store.path:
+                settings_store.file_written()
+            return True
+
+    def _write(self, content):
+        import tempfile
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".settings.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())  # Ensure data is on disk before the rename
+            os.replace(tmp_path, self.path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        if not is_windows():
+            # Persist the rename itself
+            try:
+                dir_fd = os.open(directory, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError:
+                pass
+
+settings_writer = SettingsWriter()
+atexit.register(settings_writer.flush)
 
+def save_settings(settings, immediate=False):
+    """Save settings to the settings file.
+
+    Saves are debounced by settings_writer; pass immediate=True (or call
+    settings_writer.flush()) when the data must be on disk before returning.
+    """
+    try:
+        return settings_writer.save(settings, immediate=immediate)
     except Exception as e:
         print(f"Error saving settings: {e}")
         raise
 
+# Wait after the first failure past the free attempts, doubling with each
+# further failure up to the maximum (seconds)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+class AttemptLimiter:
+    """Rate-limits unlock attempts across every lock window.
+
+    The first ``max_attempts`` failures are free. Each failure after that
+    makes the next attempt wait twice as long as the previous one, and
+    ``failed_attempts`` failures in a row start a lockout of
+    ``lockout_duration`` minutes (then one more failure starts another).
+    Attempts made while waiting, or while another window's check is still
+    running, are refused before any password hashing happens. The counters
+    are written atomically to ``path`` on every failure, so restarting or
+    crashing the app doesn't reset them; a correct password clears them.
+    """
+    def __init__(self, settings=None, path=ATTEMPTS_FILE, clock=time.time):
+        self.path = path
+        self.clock = clock  # Wall-clock time, since deadlines outlive the process
+        self.writer = SettingsWriter(path, delay=0)
+        self.configure(settings or DEFAULT_SETTINGS)
+        self.failures = 0  # In a row, since the last correct password
+        self.blocked_until = 0.0  # clock() time before which attempts are refused
+        self.lockouts = 0
+        self.in_flight = False  # A check is running in some window
+        self.checks = 0  # Attempts allowed through to the password check
+        self.rejected = 0  # Attempts refused without checking
+        self.load()
+
+    def configure(self, settings):
+        self.free_attempts = settings.get("max_attempts", 3)
+        self.lockout_after = settings.get("failed_attempts", 5)
+        self.lockout_seconds = settings.get("lockout_duration", 5) * 60
+
+    def load(self):
+        """Restore the counters saved by a previous run."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    state = json.load(f)
+                self.failures = max(0, int(state.get("failures", 0)))
+                self.blocked_until = float(state.get("blocked_until", 0.0))
+                self.lockouts = max(0, int(state.get("lockouts", 0)))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"Error loading unlock attempt counters: {e}")
+
+    def save(self):
+        try:
+            self.writer.save({"failures": self.failures, "blocked_until": self.blocked_until,
+                              "lockouts": self.lockouts}, immediate=True)
+        except Exception as e:
+            print(f"Error saving unlock attempt counters: {e}")
+
+    def remaining(self):
+        """Return the seconds until an attempt is allowed, 0 if one is allowed now."""
+        now = self.clock()
+        wait = self.blocked_until - now
+        # Never trust a deadline further out than any we set, e.g. after
+        # the system clock was turned back
+        longest = max(self.lockout_seconds, BACKOFF_MAX)
+        if wait > longest:
+            self.blocked_until = now + longest
+            wait = longest
+        return max(0.0, wait)
+
+    def locked_out(self):
+        """Return True while a lockout (rather than a short backoff) is running."""
+        return self.failures >= self.lockout_after and self.remaining() > 0
+
+    def begin_attempt(self):
+        """Return True if a password may be checked now, and mark a check as running."""
+        if self.in_flight or self.remaining() > 0:
+            self.rejected += 1
+            return False
+        self.in_flight = True
+        self.checks += 1
+        return True
+
+    def end_attempt(self, correct):
+        """Record the result of a check. Returns the seconds until the next attempt."""
+        self.in_flight = False
+        if correct:
+            self.reset()
+            return 0.0
+
+        self.failures += 1
+        now = self.clock()
+        if self.failures >= self.lockout_after:
+            self.blocked_until = now + self.lockout_seconds
+            self.lockouts += 1
+        elif self.failures >= self.free_attempts:
+            delay = BACKOFF_BASE * 2 ** (self.failures - self.free_attempts)
+            self.blocked_until = now + min(delay, BACKOFF_MAX)
+        self.save()
+        return self.remaining()
+
+    def cancel_attempt(self):
+        """Forget a check whose result will never arrive, e.g. its window was closed."""
+        self.in_flight = False
+
+    def reset(self):
+        """Clear the counters, as after a correct password."""
+        if self.failures or self.blocked_until:
+            self.failures = 0
+            self.blocked_until = 0.0
+            self.save()
+
+    def state(self):
+        """Return the counters and timing, for diagnostics and tests."""
+        return {
+            "failures": self.failures,
+            "free_attempts": self.free_attempts,
+            "lockout_after": self.lockout_after,
+            "remaining": self.remaining(),
+            "locked_out": self.locked_out(),
+            "lockouts": self.lockouts,
+            "in_flight": self.in_flight,
+            "checks": self.checks,
+            "rejected": self.rejected,
+        }
+
+def format_wait(seconds):
+    """Describe a wait in whole seconds, or minutes when over a minute, rounding up."""
+    if seconds > 60:
+        minutes = -(-seconds // 60)
+        return f"{int(minutes)} minute{'s' if minutes != 1 else ''}"
+    seconds = -(-seconds // 1)
+    return f"{int(seconds)} second{'s' if seconds != 1 else ''}"
+
+class IdleProvider:
+    """Base class for idle time backends."""
+    name = "none"
+    platforms = ()  # platform.system() values the backend applies to
+
+    def available(self):
+        """Return True if the backend can report idle time on this machine."""
+        return False
+
+    def idle_time(self):
+        """Return the idle time in seconds."""
+        return 0
+
+class NullIdleProvider(IdleProvider):
+    """Fallback used when no real backend is available; never reports idle."""
+    name = "none"
+
+    def available(self):
+        return True
+
+class FakeIdleProvider(IdleProvider):
+    """Provider with a settable idle time, for driving the scheduler headless."""
+    name = "fake"
+
+    def __init__(self, idle=0.0, clock=None):
+        self.idle = idle
+        self.clock = clock  # Optional callable; idle then grows with it
+        self.since = clock() if clock else None
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def set_idle(self, idle):
+        self.idle = idle
+        if self.clock:
+            self.since = self.clock()
+
+    def idle_time(self):
+        self.calls += 1
+        if self.clock:
+            return self.idle + (self.clock() - self.since)
+        return self.idle
+
+class WindowsIdleProvider(IdleProvider):
+    """GetLastInputInfo based idle time."""
+    name = "win32"
+    platforms = ("Windows",)
+
+    def available(self):
+        try:
+            import win32api
+            self.win32api = win32api
+            return True
+        except ImportError:
+            return False
+
+    def idle_time(self):
+        return (self.win32api.GetTickCount() - self.win32api.GetLastInputInfo()) / 1000.0
+
+class X11IdleProvider(IdleProvider):
+    """Idle time from the X11 MIT-SCREEN-SAVER extension via libXss."""
+    name = "x11"
+    platforms = ("Linux",)
+
+    def available(self):
+        if not os.environ.get("DISPLAY"):
+            return False
+        try:
+            import ctypes
+            import ctypes.util
+
+            class XScreenSaverInfo(ctypes.Structure):
+                _fields_ = [
+                    ("window", ctypes.c_ulong),
+                    ("state", ctypes.c_int),
+                    ("kind", ctypes.c_int),
+                    ("til_or_since", ctypes.c_ulong),
+                    ("idle", ctypes.c_ulong),
+                    ("eventMask", ctypes.c_ulong),
+                ]
+
+            xlib = ctypes.CDLL(ctypes.util.find_library("X11") or "libX11.so.6")
+            xss = ctypes.CDLL(ctypes.util.find_library("Xss") or "libXss.so.1")
+            xlib.XOpenDisplay.restype = ctypes.c_void_p
+            xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+            xlib.XDefaultRootWindow.restype = ctypes.c_ulong
+            xlib.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+            xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+            xss.XScreenSaverQueryExtension.argtypes = [
+                ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+            xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(XScreenSaverInfo)
+            xss.XScreenSaverQueryInfo.argtypes = [
+                ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XScreenSaverInfo)]
+
+            display = xlib.XOpenDisplay(None)
+            if not display:
+                return False
+            event_base, error_base = ctypes.c_int(), ctypes.c_int()
+            if not xss.XScreenSaverQueryExtension(display, ctypes.byref(event_base),
+                                                  ctypes.byref(error_base)):
+                xlib.XCloseDisplay(display)
+                return False
+
+            # Keep the connection and info struct for the life of the process
+            self.xss = xss
+            self.display = display
+            self.root = xlib.XDefaultRootWindow(display)
+            self.info = xss.XScreenSaverAllocInfo()
+            return True
+        except (OSError, AttributeError):
+            return False
+
+    def idle_time(self):
+        if not self.xss.XScreenSaverQueryInfo(self.display, self.root, self.info):
+            raise OSError("XScreenSaverQueryInfo failed")
+        return self.info.contents.idle / 1000.0
+
+class DevInputIdleProvider(IdleProvider):
+    """Idle time from the timestamp of the last event on readable /dev/input devices.
+
+    A daemon thread waits on the event devices and records when input last
+    arrived. The device list is read again every ``rescan_interval`` seconds,
+    so keyboards and mice plugged in later are watched too. Reading does not
+    grab the devices, so other clients still see every event. Requires read
+    access (usually membership of the input group).
+    """
+    name = "evdev"
+    platforms = ("Linux",)
+    input_dir = "/dev/input"
+    rescan_interval = 5.0
+
+    def available(self):
+        self.devices = {}  # path -> fd
+        if not os.path.isdir(self.input_dir):
+            return False
+        self._scan()
+        if not self.devices:
+            return False
+
+        self.last_event = time.monotonic()
+        self.thread = threading.Thread(target=self._watch, name="evdev-idle", daemon=True)
+        self.thread.start()
+        return True
+
+    def _scan(self):
+        """Open event devices that appeared since the last scan."""
+        try:
+            names = os.listdir(self.input_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(self.input_dir, name)
+            if not name.startswith("event") or path in self.devices:
+                continue
+            try:
+                self.devices[path] = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            except OSError:
+                continue
+
+    def _drop(self, path):
+        os.close(self.devices.pop(path))
+
+    def _watch(self):
+        import select
+        next_scan = time.monotonic() + self.rescan_interval
+        while True:
+            fds = {fd: path for path, fd in self.devices.items()}
+            timeout = max(0.0, next_scan - time.monotonic())
+            try:
+                readable, _, _ = select.select(list(fds), [], [], timeout)
+            except (OSError, ValueError):
+                return
+            for fd in readable:
+                try:
+                    # Drain pending events; we only care that something arrived
+                    while os.read(fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+                except OSError:
+                    # Device went away (ENODEV once unplugged)
+                    self._drop(fds[fd])
+            if readable:
+                self.last_event = time.monotonic()
+            if time.monotonic() >= next_scan:
+                self._scan()
+                next_scan = time.monotonic() + self.rescan_interval
+
+    def idle_time(self):
+        return time.monotonic() - self.last_event
+
+class LogindIdleProvider(IdleProvider):
+    """Idle time from the logind session IdleHint/IdleSinceHint properties.
+
+    The desktop environment only sets IdleHint after its own idle delay, so
+    this is coarser than the other backends and is tried last.
+    """
+    name = "logind"
+    platforms = ("Linux",)
+
+    def available(self):
+        import shutil
+        if not shutil.which("busctl"):
+            return False
+        try:
+            self._query()
+            return True
+        except Exception:
+            return False
+
+    def _query(self):
+        import subprocess
+        session = os.environ.get("XDG_SESSION_ID")
+        path = f"/org/freedesktop/login1/session/{session or 'auto'}"
+        output = subprocess.run(
+            ["busctl", "get-property", "org.freedesktop.login1", path,
+             "org.freedesktop.login1.Session", "IdleHint", "IdleSinceHintMonotonic"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=2,
+            universal_newlines=True).stdout.split()
+        # Output looks like: "b true t 123456789"
+        return output[1] == "true", int(output[3])
+
+    def idle_time(self):
+        idle_hint, since_usec = self._query()
+        if not idle_hint or not since_usec:
+            return 0
+        # IdleSinceHintMonotonic uses CLOCK_MONOTONIC, same as time.monotonic on Linux
+        return max(0.0, time.monotonic() - since_usec / 1000000.0)
+
+# Idle backends in order of preference
+IDLE_PROVIDERS = [WindowsIdleProvider, X11IdleProvider, DevInputIdleProvider, LogindIdleProvider]
+_idle_provider = None
+
+def register_idle_provider(provider_class, index=None):
+    """Register an additional idle backend, optionally at a given priority index."""
+    if index is None:
+        IDLE_PROVIDERS.append(provider_class)
+    else:
+        IDLE_PROVIDERS.insert(index, provider_class)
+
+def select_idle_provider():
+    """Pick the best available idle backend for this platform."""
+    for provider_class in IDLE_PROVIDERS:
+        if SYSTEM not in provider_class.platforms:
+            continue
+        provider = provider_class()
+        try:
+            if provider.available():
+                return provider
+        except Exception as e:
+            print(f"Idle provider {provider_class.name} failed to initialize: {e}")
+    print("Idle time detection not supported on this system.")
+    return NullIdleProvider()
+
+def get_idle_provider():
+    """Return the idle backend, selecting it on first use."""
+    global _idle_provider
+    if _idle_provider is None:
+        _idle_provider = select_idle_provider()
+    return _idle_provider
+
+def set_idle_provider(provider):
+    """Override the idle backend (e.g. with a FakeIdleProvider); None re-selects."""
+    global _idle_provider
+    _idle_provider = provider
+
 def get_idle_time():
     """Get the idle time in seconds."""
     try:
-        if is_windows():
-            import win32api
-            import win32con
-            return (win32api.GetTickCount() - win32api.GetLastInputInfo()) / 1000.0
-        elif is_linux():
-            # For Linux, we would need to implement this differently
-            # This is a placeholder
-            print("Idle time detection not implemented for Linux.")
-            return 0
-        elif is_mac():
-            # For macOS, we would need to implement this differently
-            # This is a placeholder
-            print("Idle time detection not implemented for macOS.")
-            return 0
-        else:
-            print("Idle time detection not supported on this OS.")
-            return 0
-    except ImportError:
-        print("Required modules for idle time detection not available.")
-        return 0
+        return get_idle_provider().idle_time()
     except Exception as e:
         print(f"Error getting idle time: {e}")
         return 0
 
+class PowerProvider:
+    """Base class for power status backends.
+
+    Reports whether the machine is running on battery and whether all
+    displays have been blanked, so the lock screen can stop waking up.
+    """
+    name = "none"
+    platforms = ()  # platform.system() values the backend applies to
+
+    def available(self):
+        """Return True if the backend can report power status on this machine."""
+        return False
+
+    def on_battery(self):
+        return False
+
+    def displays_off(self):
+        return False
+
+class NullPowerProvider(PowerProvider):
+    """Fallback used when no real backend is available; always reports mains and displays on."""
+    name = "none"
+
+    def available(self):
+        return True
+
+class FakePowerProvider(PowerProvider):
+    """Provider with settable state, for driving low-power mode headless."""
+    name = "fake"
+
+    def __init__(self, battery=False, blanked=False):
+        self.battery = battery
+        self.blanked = blanked
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def set_state(self, battery=None, blanked=None):
+        if battery is not None:
+            self.battery = battery
+        if blanked is not None:
+            self.blanked = blanked
+
+    def on_battery(self):
+        self.calls += 1
+        return self.battery
+
+    def displays_off(self):
+        return self.blanked
+
+class WindowsPowerProvider(PowerProvider):
+    """GetSystemPowerStatus based battery state. Display state is not reported."""
+    name = "win32"
+    platforms = ("Windows",)
+
+    def available(self):
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class SYSTEM_POWER_STATUS(ctypes.Structure):
+                _fields_ = [
+                    ("ACLineStatus", wintypes.BYTE),
+                    ("BatteryFlag", wintypes.BYTE),
+                    ("BatteryLifePercent", wintypes.BYTE),
+                    ("SystemStatusFlag", wintypes.BYTE),
+                    ("BatteryLifeTime", wintypes.DWORD),
+                    ("BatteryFullLifeTime", wintypes.DWORD),
+                ]
+
+            self.status = SYSTEM_POWER_STATUS()
+            self.get_status = ctypes.windll.kernel32.GetSystemPowerStatus
+            self.status_ref = ctypes.byref(self.status)
+            return bool(self.get_status(self.status_ref))
+        except (ImportError, OSError, AttributeError):
+            return False
+
+    def on_battery(self):
+        if not self.get_status(self.status_ref):
+            raise OSError("GetSystemPowerStatus failed")
+        return self.status.ACLineStatus == 0
+
+class SysfsPowerProvider(PowerProvider):
+    """Battery state from /sys/class/power_supply and display state from DRM connectors.
+
+    A machine counts as on battery when it has mains supplies and none of
+    them is online. Without a mains supply battery state comes from UPower
+    when it is running. Displays count as off when every connected DRM
+    output reports a DPMS state other than On.
+    """
+    name = "sysfs"
+    platforms = ("Linux",)
+    power_dir = "/sys/class/power_supply"
+    drm_dir = "/sys/class/drm"
+    upower = None  # Battery state source when there is no mains supply
+
+    def available(self):
+        if self._mains():
+            return True
+        if not os.path.isdir(self.drm_dir):
+            return False  # Nothing sysfs can tell; let UPower handle it
+        upower = UPowerPowerProvider()
+        if upower.available():
+            self.upower = upower
+            self.name = "sysfs+upower"
+        return True
+
+    def _read(self, *parts):
+        try:
+            with open(os.path.join(*parts)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _mains(self):
+        try:
+            supplies = os.listdir(self.power_dir)
+        except OSError:
+            return []
+        return [name for name in supplies if self._read(self.power_dir, name, "type") == "Mains"]
+
+    def on_battery(self):
+        if self.upower is not None:
+            return self.upower.on_battery()
+        mains = self._mains()
+        if not mains:
+            return False  # Desktop, or nothing we can judge by
+        return not any(self._read(self.power_dir, name, "online") == "1" for name in mains)
+
+    def displays_off(self):
+        try:
+            # Connectors look like card0-HDMI-A-1; the cards themselves have no status
+            connectors = [name for name in os.listdir(self.drm_dir) if "-" in name]
+        except OSError:
+            return False
+        states = [self._read(self.drm_dir, name, "dpms") for name in connectors
+                  if self._read(self.drm_dir, name, "status") == "connected"]
+        states = [state for state in states if state]
+        return bool(states) and all(state != "On" for state in states)
+
+class UPowerPowerProvider(PowerProvider):
+    """Battery state from the UPower OnBattery property. Display state is not reported."""
+    name = "upower"
+    platforms = ("Linux",)
+
+    def available(self):
+        import shutil
+        if not shutil.which("busctl"):
+            return False
+        try:
+            self.on_battery()
+            return True
+        except Exception:
+            return False
+
+    def on_battery(self):
+        import subprocess
+        output = subprocess.run(
+            ["busctl", "get-property", "org.freedesktop.UPower", "/org/freedesktop/UPower",
+             "org.freedesktop.UPower", "OnBattery"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=2,
+            universal_newlines=True).stdout.split()
+        # Output looks like: "b true"
+        return output[1] == "true"
+
+# Power backends in order of preference
+POWER_PROVIDERS = [WindowsPowerProvider, SysfsPowerProvider, UPowerPowerProvider]
+_power_provider = None
+
+def register_power_provider(provider_class, index=None):
+    """Register an additional power backend, optionally at a given priority index."""
+    if index is None:
+        POWER_PROVIDERS.append(provider_class)
+    else:
+        POWER_PROVIDERS.insert(index, provider_class)
+
+def select_power_provider():
+    """Pick the best available power backend for this platform."""
+    for provider_class in POWER_PROVIDERS:
+        if SYSTEM not in provider_class.platforms:
+            continue
+        provider = provider_class()
+        try:
+            if provider.available():
+                return provider
+        except Exception as e:
+            print(f"Power provider {provider_class.name} failed to initialize: {e}")
+    return NullPowerProvider()
+
+def get_power_provider():
+    """Return the power backend, selecting it on first use."""
+    global _power_provider
+    if _power_provider is None:
+        _power_provider = select_power_provider()
+    return _power_provider
+
+def set_power_provider(provider):
+    """Override the power backend (e.g. with a FakePowerProvider); None re-selects."""
+    global _power_provider
+    _power_provider = provider
+
 def parse_hotkey(hotkey_str):
     """Parse a hotkey string into modifier and key."""
     modifiers = 0
@@ -212,98 +1109,154 @@ def parse_hotkey(hotkey_str):
 
 def lock_workstation():
     """Lock the workstation based on OS."""
-    if is_windows():
-        try:
-            import ctypes
-            ctypes.windll.user32.LockWorkStation()
-            return True
-        except Exception as e:
-            print(f"Error locking Windows workstation: {e}")
-            return False
-    elif is_linux():
-        try:
-            # Common Linux lock commands
-            commands = [
-                "dbus-send --type=method_call --dest=org.gnome.ScreenSaver " +
-                "/org/gnome/ScreenSaver org.gnome.ScreenSaver.Lock",
-                "loginctl lock-session",
-                "gnome-screensaver-command --lock",
-                "xdg-screensaver lock",
-                "cinnamon-screensaver-command --lock",
-                "mate-screensaver-command --lock"
-            ]
-            
-            for cmd in commands:
-                try:
-                    if os.system(cmd) == 0:
-                        return True
-                except:
-                    continue
-            
-            print("Failed to lock Linux workstation with available commands.")
-            return False
-        except Exception as e:
-            print(f"Error locking Linux workstation: {e}")
-            return False
-    elif is_mac():
-        try:
-            os.system("/System/Library/CoreServices/Menu\\ Extras/User.menu/Contents/Resources/CGSession -suspend")
-            return True
-        except Exception as e:
-            print(f"Error locking macOS workstation: {e}")
-            return False
-    else:
-        print("Locking not supported on this OS.")
-        return False
+    return get_platform().lock_workstation()
 
 def fullscreen_on_all_monitors():
     """Get a list of geometries for all monitors to create fullscreen windows."""
-    desktop = QDesktopWidget()
-    geometries = []
-
-    for i in range(desktop.screenCount()):
-        geometries.append(desktop.screenGeometry(i))
+    return [screen.geometry() for screen in QApplication.screens()]
 
-    return geometries
+def screen_pixel_ratio(geometry):
+    """Get the device pixel ratio of the monitor showing geometry."""
+    screen = QApplication.screenAt(geometry.center()) or QApplication.primaryScreen()
+    return screen.devicePixelRatio() if screen is not None else 1.0
 
 def is_windows():
     """Check if the current OS is Windows."""
-    return platform.system() == "Windows"
+    return SYSTEM == "Windows"
 
 def is_linux():
     """Check if the current OS is Linux."""
-    return platform.system() == "Linux"
+    return SYSTEM == "Linux"
 
 def is_mac():
     """Check if the current OS is macOS."""
-    return platform.system() == "Darwin"
+    return SYSTEM == "Darwin"
 
-def setup_autostart(enable=True):
-    """Set up or remove autostart for the application."""
+class PlatformBackend:
+    """OS-specific operations, with any platform modules bound at creation."""
+    name = "generic"
     app_name = "WindowsScreenLocker"
-    app_path = f'"{os.path.abspath(sys.argv[0])}"'  # Quote the path
-    
-    if is_windows():
-        import winreg
+
+    def app_path(self):
+        return f'"{os.path.abspath(sys.argv[0])}"'  # Quote the path
+
+    def idle_time(self):
+        return get_idle_time()
+
+    def lock_workstation(self):
+        print("Locking not supported on this OS.")
+        return False
+
+    def setup_autostart(self, enable=True):
+        return False
+
+    def is_elevated(self):
+        return False
+
+    def request_elevation(self):
+        return False
+
+    def read_hotkey_message(self, event_type, message):
+        """Return the hotkey id if a native message is a hotkey press, else None."""
+        return None
+
+class WindowsBackend(PlatformBackend):
+    name = "Windows"
+
+    # Values Qt uses for the eventType of a native Windows message
+    NATIVE_EVENT_TYPES = (b"windows_generic_MSG", "windows_generic_MSG")
+    WM_HOTKEY = 0x0312
+
+    def __init__(self):
+        import ctypes
+        from ctypes.wintypes import MSG
+        self.ctypes = ctypes
+        self.msg_pointer = ctypes.POINTER(MSG)
+        self.windll = getattr(ctypes, "windll", None)
+        try:
+            import winreg
+            self.winreg = winreg
+        except ImportError:
+            self.winreg = None
+
+    def read_hotkey_message(self, event_type, message):
+        if event_type not in self.NATIVE_EVENT_TYPES:
+            return None
+        msg = self.ctypes.cast(int(message), self.msg_pointer).contents
+        if msg.message == self.WM_HOTKEY:
+            return msg.wParam
+        return None
+
+    def lock_workstation(self):
+        try:
+            self.windll.user32.LockWorkStation()
+            return True
+        except Exception as e:
+            print(f"Error locking Windows workstation: {e}")
+            return False
+
+    def setup_autostart(self, enable=True):
+        winreg = self.winreg
         key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
 
         try:
             with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE) as key:
                 if enable:
-                    winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, app_path)
+                    winreg.SetValueEx(key, self.app_name, 0, winreg.REG_SZ, self.app_path())
                 else:
                     try:
-                        winreg.DeleteValue(key, app_name)
+                        winreg.DeleteValue(key, self.app_name)
                     except FileNotFoundError:
                         pass
             return True
         except Exception as e:
             print(f"Error setting up Windows autostart: {e}")
             return False
-    elif is_linux():
+
+    def is_elevated(self):
+        return self.windll.shell32.IsUserAnAdmin() != 0
+
+    def request_elevation(self):
+        if not self.is_elevated():
+            self.windll.shell32.ShellExecuteW(
+                None, "runas", sys.executable, " ".join(sys.argv), None, 1
+            )
+            sys.exit(0)
+        return True
+
+class LinuxBackend(PlatformBackend):
+    name = "Linux"
+
+    # Common Linux lock commands
+    LOCK_COMMANDS = [
+        "dbus-send --type=method_call --dest=org.gnome.ScreenSaver " +
+        "/org/gnome/ScreenSaver org.gnome.ScreenSaver.Lock",
+        "loginctl lock-session",
+        "gnome-screensaver-command --lock",
+        "xdg-screensaver lock",
+        "cinnamon-screensaver-command --lock",
+        "mate-screensaver-command --lock"
+    ]
+
+    def lock_workstation(self):
+        try:
+            for cmd in self.LOCK_COMMANDS:
+                try:
+                    if os.system(cmd) == 0:
+                        return True
+                except:
+                    continue
+            
+            print("Failed to lock Linux workstation with available commands.")
+            return False
+        except Exception as e:
+            print(f"Error locking Linux workstation: {e}")
+            return False
+
+    def setup_autostart(self, enable=True):
         # Create autostart file for Linux
         autostart_dir = os.path.join(os.path.expanduser("~"), ".config", "autostart")
-        autostart_file = os.path.join(autostart_dir, f"{app_name}.desktop")
+        autostart_file = os.path.join(autostart_dir, f"{self.app_name}.desktop")
         
         try:
             if enable:
@@ -311,8 +1264,8 @@ def setup_autostart(enable=True):
                 with open(autostart_file, 'w') as f:
                     f.write(f"""[Desktop Entry]
 Type=Application
-Name={app_name}
-Exec={app_path}
+Name={self.app_name}
+Exec={self.app_path()}
 Terminal=false
 NoDisplay=false
 X-GNOME-Autostart-enabled=true
@@ -324,10 +1277,25 @@ X-GNOME-Autostart-enabled=true
         except Exception as e:
             print(f"Error setting up Linux autostart: {e}")
             return False
-    elif is_mac():
+
+    def is_elevated(self):
+        return os.geteuid() == 0
+
+class MacBackend(PlatformBackend):
+    name = "Darwin"
+
+    def lock_workstation(self):
+        try:
+            os.system("/System/Library/CoreServices/Menu\\ Extras/User.menu/Contents/Resources/CGSession -suspend")
+            return True
+        except Exception as e:
+            print(f"Error locking macOS workstation: {e}")
+            return False
+
+    def setup_autostart(self, enable=True):
         # Create launch agent for macOS
         launchagent_dir = os.path.join(os.path.expanduser("~"), "Library", "LaunchAgents")
-        launchagent_file = os.path.join(launchagent_dir, f"com.user.{app_name}.plist")
+        launchagent_file = os.path.join(launchagent_dir, f"com.user.{self.app_name}.plist")
         
         try:
             if enable:
@@ -338,10 +1306,10 @@ X-GNOME-Autostart-enabled=true
 <plist version="1.0">
 <dict>
     <key>Label</key>
-    <string>com.user.{app_name}</string>
+    <string>com.user.{self.app_name}</string>
     <key>ProgramArguments</key>
     <array>
-        <string>{app_path}</string>
+        <string>{self.app_path()}</string>
     </array>
     <key>RunAtLoad</key>
     <true/>
@@ -356,30 +1324,238 @@ X-GNOME-Autostart-enabled=true
         except Exception as e:
             print(f"Error setting up macOS autostart: {e}")
             return False
-    
-    return False
 
-def hash_password(password):
-    """Hash the password using a secure hashing algorithm with salt."""
-    # Use a unique salt based on the username to prevent rainbow table attacks
-    try:
-        salt = hashlib.sha256(os.getlogin().encode()).hexdigest()[:16]
-        hashed = hashlib.pbkdf2_hmac(
-            'sha256', 
-            password.encode(), 
-            salt.encode(), 
-            10000  # Number of iterations
-        )
-        return salt + hashlib.sha256(hashed).hexdigest()
-    except Exception as e:
-        print(f"Error hashing password: {e}")
-        # Fallback to simple hash if something goes wrong
-        return hashlib.sha256(password.encode()).hexdigest()
+    def is_elevated(self):
+        return os.geteuid() == 0
+
+PLATFORM_BACKENDS = {
+    "Windows": WindowsBackend,
+    "Linux": LinuxBackend,
+    "Darwin": MacBackend,
+}
+_platform_backend = None
+
+def get_platform():
+    """Return the backend for the current OS, creating it on first use."""
+    global _platform_backend
+    if _platform_backend is None:
+        _platform_backend = PLATFORM_BACKENDS.get(SYSTEM, PlatformBackend)()
+    return _platform_backend
+
+def setup_autostart(enable=True):
+    """Set up or remove autostart for the application."""
+    return get_platform().setup_autostart(enable)
+
+# Target time for a single password verification on this machine (seconds)
+PASSWORD_HASH_TARGET = 0.25
+
+def _b64encode(data):
+    import base64
+    return base64.b64encode(data).decode().rstrip("=")
+
+def _b64decode(text):
+    import base64
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+class PasswordHasher:
+    """Base class for password hashing algorithms.
+
+    Hashes are stored as ``$<id>$<params>$<salt>$<hash>`` so the algorithm
+    and its cost travel with each hash and can be changed later.
+    """
+    id = None
+    salt_size = 16
+
+    def available(self):
+        return True
+
+    def default_params(self):
+        raise NotImplementedError
+
+    def derive(self, password, salt, params):
+        raise NotImplementedError
+
+    def calibrate(self, target):
+        """Return params that make one hash take roughly target seconds here."""
+        raise NotImplementedError
+
+    def format_params(self, params):
+        return ",".join(f"{key}={value}" for key, value in params.items())
+
+    def parse_params(self, text):
+        return {key: int(value) for key, value in (item.split("=") for item in text.split(","))}
+
+    def hash(self, password, params):
+        salt = os.urandom(self.salt_size)
+        digest = self.derive(password, salt, params)
+        return f"${self.id}${self.format_params(params)}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password, stored_hash):
+        import hmac
+        _, _, params, salt, digest = stored_hash.split("$")
+        computed = self.derive(password, _b64decode(salt), self.parse_params(params))
+        return hmac.compare_digest(computed, _b64decode(digest))
+
+    def params_of(self, stored_hash):
+        return self.parse_params(stored_hash.split("$")[2])
+
+    def weaker_than(self, params, current):
+        """Check whether stored params are clearly cheaper than the current calibration.
+
+        Calibration times a single run, so a stored cost counts as weaker only
+        below half the calibrated one; closer values are noise.
+        """
+        return any(params.get(key, 0) * 2 < value for key, value in current.items())
+
+    def _time(self, params):
+        start = time.perf_counter()
+        self.derive("calibration", b"\0" * self.salt_size, params)
+        return time.perf_counter() - start
+
+class PBKDF2Hasher(PasswordHasher):
+    id = "pbkdf2-sha256"
+    min_iterations = 100000
+
+    def default_params(self):
+        return {"i": 600000}
+
+    def derive(self, password, salt, params):
+        return hashlib.pbkdf2_hmac('sha256', password.encode(), salt, params["i"])
+
+    def calibrate(self, target):
+        probe = {"i": 20000}
+        elapsed = max(self._time(probe), 1e-6)
+        iterations = int(probe["i"] * target / elapsed)
+        return {"i": max(self.min_iterations, iterations)}
+
+    def weaker_than(self, params, current):
+        return params.get("i", 0) < self.min_iterations or super().weaker_than(params, current)
+
+class ScryptHasher(PasswordHasher):
+    id = "scrypt"
+    max_log_n = 20  # n = 2**20 with r=8 uses 1 GiB, far more than we want
+
+    def available(self):
+        return hasattr(hashlib, "scrypt")
+
+    def default_params(self):
+        return {"ln": 15, "r": 8, "p": 1}
+
+    def derive(self, password, salt, params):
+        n = 1 << params["ln"]
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=params["r"], p=params["p"],
+                              maxmem=256 * n * params["r"], dklen=32)
+
+    def calibrate(self, target):
+        params = {"ln": 14, "r": 8, "p": 1}
+        # Each step doubles the cost, so stop once we are past half the target
+        while params["ln"] < self.max_log_n and self._time(params) < target / 2:
+            params["ln"] += 1
+        return params
+
+    def weaker_than(self, params, current):
+        # ln is a power of two, so allow one step of calibration noise
+        if params.get("ln", 0) < current["ln"] - 1:
+            return True
+        return any(params.get(key, 0) < current[key] for key in ("r", "p"))
+
+class Argon2Hasher(PasswordHasher):
+    """Argon2id via the optional argon2-cffi package, which has its own format."""
+    id = "argon2id"
+
+    def available(self):
+        try:
+            import argon2
+            return True
+        except ImportError:
+            return False
+
+    def default_params(self):
+        return {"t": 3, "m": 65536, "p": 4}
+
+    def _hasher(self, params):
+        import argon2
+        return argon2.PasswordHasher(time_cost=params["t"], memory_cost=params["m"],
+                                     parallelism=params["p"])
+
+    def derive(self, password, salt, params):
+        import argon2
+        return argon2.low_level.hash_secret_raw(
+            password.encode(), salt, time_cost=params["t"], memory_cost=params["m"],
+            parallelism=params["p"], hash_len=32, type=argon2.low_level.Type.ID)
+
+    def calibrate(self, target):
+        params = self.default_params()
+        params["t"] = 1
+        elapsed = max(self._time(params), 1e-6)
+        params["t"] = max(1, int(target / elapsed))
+        return params
+
+    def hash(self, password, params):
+        return self._hasher(params).hash(password)
+
+    def verify(self, password, stored_hash):
+        import argon2
+        try:
+            return argon2.PasswordHasher().verify(stored_hash, password)
+        except argon2.exceptions.VerificationError:
+            return False
+
+    def params_of(self, stored_hash):
+        # $argon2id$v=19$m=65536,t=3,p=4$salt$hash
+        return self.parse_params(stored_hash.split("$")[3])
+
+# Password hashing algorithms in order of preference
+PASSWORD_HASHERS = {
+    hasher.id: hasher for hasher in (Argon2Hasher(), ScryptHasher(), PBKDF2Hasher())
+}
+_hash_calibration = {}
+
+def default_hash_algorithm():
+    """Return the id of the strongest available password hashing algorithm."""
+    for algorithm, hasher in PASSWORD_HASHERS.items():
+        if hasher.available():
+            return algorithm
+
+def calibrate_password_hash(algorithm=None, target=PASSWORD_HASH_TARGET):
+    """Return cost params that make one verification take about target seconds.
+
+    Calibration runs once per algorithm and target for the life of the process.
+    """
+    algorithm = algorithm or default_hash_algorithm()
+    key = (algorithm, target)
+    if key not in _hash_calibration:
+        try:
+            _hash_calibration[key] = PASSWORD_HASHERS[algorithm].calibrate(target)
+        except Exception as e:
+            print(f"Error calibrating password hash: {e}")
+            _hash_calibration[key] = PASSWORD_HASHERS[algorithm].default_params()
+    return _hash_calibration[key]
+
+def _hasher_for(stored_hash):
+    """Return the hasher for a stored hash, or None for a legacy hash."""
+    if not stored_hash.startswith("$"):
+        return None
+    return PASSWORD_HASHERS.get(stored_hash.split("$")[1])
+
+def hash_password(password, algorithm=None, params=None):
+    """Hash the password with a random per-hash salt and a calibrated cost."""
+    algorithm = algorithm or default_hash_algorithm()
+    params = params or calibrate_password_hash(algorithm)
+    return PASSWORD_HASHERS[algorithm].hash(password, params)
 
 def verify_password(password, stored_hash):
     """Verify a password against its stored hash."""
     try:
-        if len(stored_hash) > 16:  # We expect at least 16 chars of salt
+        hasher = _hasher_for(stored_hash)
+        if hasher is not None:
+            return hasher.verify(password, stored_hash)
+        if stored_hash.startswith("$"):
+            print("Unknown password hash algorithm.")
+            return False
+
+        import hmac
+        if len(stored_hash) == 80:  # Legacy: 16 chars of username salt + 10k PBKDF2
             salt = stored_hash[:16]
             hashed = hashlib.pbkdf2_hmac(
                 'sha256', 
@@ -388,36 +1564,130 @@ def verify_password(password, stored_hash):
                 10000
             )
             computed_hash = salt + hashlib.sha256(hashed).hexdigest()
-            return computed_hash == stored_hash
+            return hmac.compare_digest(computed_hash, stored_hash)
         else:
             # Legacy verification (simple hash)
-            return hashlib.sha256(password.encode()).hexdigest() == stored_hash
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored_hash)
     except Exception as e:
         print(f"Error verifying password: {e}")
         return False
 
-def encrypt_data(data, key):
-    """Encrypt sensitive data."""
+def password_needs_rehash(stored_hash):
+    """Check whether a stored hash uses a legacy format or a weaker cost than today's."""
+    hasher = _hasher_for(stored_hash)
+    if hasher is None or hasher.id != default_hash_algorithm():
+        return True
     try:
+        return hasher.weaker_than(hasher.params_of(stored_hash), calibrate_password_hash(hasher.id))
+    except Exception:
+        return True
+
+KEYRING_SALT_FILE = os.path.join(os.path.dirname(__file__), ".keyring_salt")
+LEGACY_ENCRYPTION_SALT = b'screen_locker_salt'  # Fixed salt used before per-install salts
+ENCRYPTION_PREFIX = "v2$"
+
+class Keyring:
+    """Derives encryption keys once per (secret, salt) and keeps them in a bounded cache.
+
+    Ciphertexts carry the salt they were encrypted with as
+    ``v2$<salt>$<fernet token>``. New data uses a random per-install salt, so
+    encrypting many fields with the same secret costs a single key derivation.
+    The cache should be wiped when the screen locks and on exit; this drops
+    our references to the keys, which is as far as Python lets us go.
+    """
+    def __init__(self, max_keys=4, iterations=100000, salt_file=KEYRING_SALT_FILE):
+        self.max_keys = max_keys
+        self.iterations = iterations
+        self.salt_file = salt_file
+        self._salt = None
+        self._keys = OrderedDict()  # (secret digest, salt) -> Fernet
+        self.derivations = 0
+
+    def install_salt(self):
+        """Return the random per-install salt, creating it on first use."""
+        if self._salt is None:
+            try:
+                with open(self.salt_file, 'rb') as f:
+                    self._salt = f.read()
+            except OSError:
+                self._salt = b""
+            if len(self._salt) != 16:
+                self._salt = os.urandom(16)
+                try:
+                    with open(self.salt_file, 'wb') as f:
+                        f.write(self._salt)
+                except OSError as e:
+                    # Still usable: the salt is stored with every ciphertext
+                    print(f"Failed to store keyring salt: {e}")
+        return self._salt
+
+    def fernet(self, secret, salt):
+        """Return a Fernet instance for secret and salt, deriving the key only on a miss."""
         from cryptography.fernet import Fernet
         from cryptography.hazmat.primitives import hashes
         from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
         import base64
-        
-        # Generate a key from the password
-        salt = b'screen_locker_salt'  # A fixed salt
+
+        cache_key = (hashlib.sha256(secret.encode()).digest(), salt)
+        fernet = self._keys.get(cache_key)
+        if fernet is not None:
+            self._keys.move_to_end(cache_key)
+            return fernet
+
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
-            iterations=100000,
+            iterations=self.iterations,
         )
-        derived_key = base64.urlsafe_b64encode(kdf.derive(key.encode()))
-        
-        # Encrypt the data
-        f = Fernet(derived_key)
-        encrypted_data = f.encrypt(data.encode())
-        return base64.urlsafe_b64encode(encrypted_data).decode()
+        fernet = Fernet(base64.urlsafe_b64encode(kdf.derive(secret.encode())))
+        self.derivations += 1
+
+        self._keys[cache_key] = fernet
+        while len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        return fernet
+
+    def encrypt(self, data, secret):
+        """Encrypt a string; the result records the salt it was encrypted with."""
+        import base64
+        salt = self.install_salt()
+        token = self.fernet(secret, salt).encrypt(data.encode()).decode()
+        return f"{ENCRYPTION_PREFIX}{base64.urlsafe_b64encode(salt).decode()}${token}"
+
+    def decrypt(self, encrypted_data, secret):
+        """Decrypt a string produced by encrypt() or by the legacy encrypt_data."""
+        import base64
+        if encrypted_data.startswith(ENCRYPTION_PREFIX):
+            salt, token = encrypted_data[len(ENCRYPTION_PREFIX):].split("$", 1)
+            return self.fernet(secret, base64.urlsafe_b64decode(salt)).decrypt(token.encode()).decode()
+        # Legacy format: base64 of a Fernet token made with the fixed salt
+        token = base64.urlsafe_b64decode(encrypted_data)
+        return self.fernet(secret, LEGACY_ENCRYPTION_SALT).decrypt(token).decode()
+
+    def encrypt_many(self, fields, secret):
+        """Encrypt every value of a dict (or items of a list) with one key derivation."""
+        if isinstance(fields, dict):
+            return {name: self.encrypt(value, secret) for name, value in fields.items()}
+        return [self.encrypt(value, secret) for value in fields]
+
+    def decrypt_many(self, fields, secret):
+        """Decrypt every value of a dict (or items of a list)."""
+        if isinstance(fields, dict):
+            return {name: self.decrypt(value, secret) for name, value in fields.items()}
+        return [self.decrypt(value, secret) for value in fields]
+
+    def wipe(self):
+        """Forget all derived keys."""
+        self._keys.clear()
+
+# Shared keyring used by encrypt_data/decrypt_data
+keyring = Keyring()
+
+def encrypt_data(data, key):
+    """Encrypt sensitive data."""
+    try:
+        return keyring.encrypt(data, key)
     except ImportError:
         print("Cryptography module not available. Data not encrypted.")
         return data
@@ -428,25 +1698,7 @@ def encrypt_data(data, key):
 def decrypt_data(encrypted_data, key):
     """Decrypt sensitive data."""
     try:
-        from cryptography.fernet import Fernet
-        from cryptography.hazmat.primitives import hashes
-        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-        import base64
-        
-        # Generate the same key from the password
-        salt = b'screen_locker_salt'
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        derived_key = base64.urlsafe_b64encode(kdf.derive(key.encode()))
-        
-        # Decrypt the data
-        f = Fernet(derived_key)
-        decrypted_data = f.decrypt(base64.urlsafe_b64decode(encrypted_data))
-        return decrypted_data.decode()
+        return keyring.decrypt(encrypted_data, key)
     except ImportError:
         print("Cryptography module not available. Data not decrypted.")
         return encrypted_data
@@ -454,15 +1706,32 @@ def decrypt_data(encrypted_data, key):
         print(f"Error decrypting data: {e}")
         return ""
 
+def encrypt_fields(fields, key):
+    """Encrypt many fields at once, deriving the key only once."""
+    try:
+        return keyring.encrypt_many(fields, key)
+    except ImportError:
+        print("Cryptography module not available. Data not encrypted.")
+        return fields
+    except Exception as e:
+        print(f"Error encrypting data: {e}")
+        return fields
+
+def decrypt_fields(fields, key):
+    """Decrypt many fields at once."""
+    try:
+        return keyring.decrypt_many(fields, key)
+    except ImportError:
+        print("Cryptography module not available. Data not decrypted.")
+        return fields
+    except Exception as e:
+        print(f"Error decrypting data: {e}")
+        return {name: "" for name in fields} if isinstance(fields, dict) else ["" for _ in fields]
+
 def is_elevated():
     """Check if the application is running with elevated privileges."""
     try:
-        if is_windows():
-            import ctypes
-            return ctypes.windll.shell32.IsUserAnAdmin() != 0
-        elif is_linux() or is_mac():
-            return os.geteuid() == 0
-        return False
+        return get_platform().is_elevated()
     except Exception as e:
         print(f"Error checking for elevated privileges: {e}")
         return False
@@ -530,16 +1799,8 @@ def set_as_default_lock_screen(enable=True):
 
 def request_admin_privileges():
     """Request administrator privileges by relaunching the app."""
-    if is_windows():
-        try:
-            import ctypes, sys
-            if not is_elevated():
-                ctypes.windll.shell32.ShellExecuteW(
-                    None, "runas", sys.executable, " ".join(sys.argv), None, 1
-                )
-                sys.exit(0)
-            return True
-        except Exception as e:
-            print(f"Failed to request admin privileges: {e}")
-            return False
-    return False
\ No newline at end of file
+    try:
+        return get_platform().request_elevation()
+    except Exception as e:
+        print(f"Failed to request admin privileges: {e}")
+        return False
\ No newline at end of file